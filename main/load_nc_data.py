@@ -1,6 +1,7 @@
+import os
 import sys
-sys.path.append( '../modules' )
-from data_converter import DataConverter
+sys.path.append( os.path.join(os.path.dirname(os.path.abspath(__file__)), '..') )
+from modules.data_converter import DataConverter
 import argparse
 
 """
@@ -0,0 +1,121 @@
+import os
+import sys
+sys.path.append( os.path.join(os.path.dirname(os.path.abspath(__file__)), '..') )
+from modules.batch_converter import BatchConverter, read_manifest, glob_jobs
+from modules.zarr_encoding import PROFILES, COMPRESSORS
+from modules.precision import parse_precision
+import argparse
+
+"""
+********************
+*** Description ***
+********************
+
+Convert many netCDF & GRIB files to Zarr across a bounded pool of processes.
+
+********************
+* User Arguments. *
+********************
+
+manifest (str): JSON-lines file listing one file to convert per line, w/ its own refactor variables or GRIB keys. For example,
+                {"filename": "sfcf024.tile6.nc", "filename2save": "sfcf024.tile6", "refactor_variables": ["grid_xt", "grid_yt"]}
+                {"filename": "GFSFLX.GrbF00", "grb_dict": {"typeOfLevel": "surface"}}
+                {"filename": "GFSPRS.GrbF24", "all_hypercubes": true}
+                "filename2save" defaults to the filename w/o its extension.
+
+pattern (str): Glob pattern of the files to convert under the location of the raw (unprocessed) files (default: "../raw_data").
+               Used in place of a manifest. Each Zarr is saved as the filename w/o its extension.
+
+refactor_variables (list): Pattern only. netCDF variables in need of refactoring, shared by all files.
+
+grb_key (str) & grb_val (str): Pattern only. GRIB key-value pairs to filter by, shared by all files.
+
+all_hypercubes (bool): Pattern only. Convert every hypercube of each GRIB file.
+
+workers (int): Number of files converted concurrently. Default: 4
+
+profile (str), target_chunk_mb (float), compressor (str), clevel (int): Zarr's chunking & compression
+                                                                        (see main_nc2zarr_converter.py).
+
+stream (bool): netCDF only. Stream each conversion chunk by chunk (see main_nc2zarr_converter.py).
+
+memory_budget (float): netCDF only. Streaming memory budget (in MB) per file. Default: 1024
+
+mmap (bool): netCDF only. Memory-map each classic netCDF file (see main_nc2zarr_converter.py).
+
+precision (list): Precision options per variable, shared by all files (see main_nc2zarr_converter.py).
+
+run_manifest (str): Path of the JSON-lines run manifest. A record (input & output path, status, error, bytes in & out 
+                & timing) is appended per conversion. Regardless, the script exits w/ a nonzero exit code if a 
+                conversion fails.
+
+cache_dir (str): Location of the conversion cache. If set, a file which is unchanged since its conversion w/ the same options
+                 is not converted again -- its existing Zarr is kept (see main_evict_conversions.py). Default: None (always convert)
+
+cache_quota_gb (float): Disk quota (in GB) of the Zarr stores recorded by the conversion cache. Once exceeded, the least
+                        recently used Zarr stores are deleted. Default: None (no quota)
+
+********************************
+*** BASH COMMAND TO EXECUTE: ***
+********************************
+
+python main_batch_converter.py -m <manifest> -n <workers>
+
+python main_batch_converter.py -g <pattern> -d <refactor_variables_if_applicable> -k <GRIB_KEY_1 ... GRIB_KEY_N_(if_applicable)> -v <GRIB_VALUE_1 ... GRIB_VALUE_N_(if_applicable)> -n <workers>
+
+******************************
+*** BASH COMMAND EXAMPLES: ***
+******************************
+
+python main_batch_converter.py -g "gfs_data.tile*.nc" -n 6
+
+python main_batch_converter.py -g "sfcf024.tile*.nc" -d grid_xt grid_yt -n 6
+
+python main_batch_converter.py -g "GFSPRS.GrbF*" -a -n 3
+
+python main_batch_converter.py -m ../raw_data/manifest.jsonl -n 8 -p spatial-map
+
+"""
+
+# Guard required by the worker processes, which re-import this script on platforms w/o fork.
+if __name__ == "__main__":
+
+    # User arguments.
+    argParser = argparse.ArgumentParser()
+    argParser.add_argument("-m", "--manifest", type=str, help="JSON-lines file listing one file to convert per line.")
+    argParser.add_argument("-g", "--pattern", type=str, help="Glob pattern of the files to convert under ../raw_data (e.g. 'gfs_data.tile*.nc').")
+    argParser.add_argument("-d", "--refactorvars", type=str, nargs='+', help="Pattern only. netCDF variables in need of refactoring, shared by all files.")
+    argParser.add_argument("-k", "--grb_key", type=str, nargs='+', help="Pattern only. GRIB keys to filter by, shared by all files.")
+    argParser.add_argument("-v", "--grb_val", type=str, nargs='+', help="Pattern only. GRIB values corresponding to the GRIB keys.")
+    argParser.add_argument("-a", "--all_hypercubes", action="store_true", help="Pattern only. Convert every hypercube of each GRIB file.")
+    argParser.add_argument("-n", "--workers", type=int, default=4, help="Number of files converted concurrently. Default: 4")
+    argParser.add_argument("-p", "--profile", type=str, choices=list(PROFILES), help="Chunking & compression profile of the Zarr.")
+    argParser.add_argument("-t", "--target_chunk_mb", type=float, help="Target uncompressed chunk size (in MB).")
+    argParser.add_argument("-c", "--compressor", type=str, choices=COMPRESSORS, help="Compressor of the Zarr.")
+    argParser.add_argument("-l", "--clevel", type=int, help="Compression level.")
+    argParser.add_argument("-s", "--stream", action="store_true", help="netCDF only. Stream each conversion chunk by chunk.")
+    argParser.add_argument("--memory_budget", type=float, default=1024, help="netCDF only. Streaming memory budget (in MB) per file. Default: 1024")
+    argParser.add_argument("--mmap", action="store_true", help="netCDF only. Memory-map each classic netCDF file & write it chunk by chunk.")
+    argParser.add_argument("--precision", type=str, nargs='+', help="Precision options per variable, e.g. --precision '*=bits:10' t=pack:16. Lossy.")
+    argParser.add_argument("--run_manifest", type=str, help="Path of the JSON-lines run manifest. A record is appended per conversion.")
+    argParser.add_argument("--cache_dir", type=str, help="Location of the conversion cache. If set, unchanged files are not converted again w/ the same options.")
+    argParser.add_argument("--cache_quota_gb", type=float, help="Disk quota (in GB) of the Zarr stores recorded by the conversion cache. Default: No quota")
+    args = argParser.parse_args()
+
+    # Collect the files of interest
+    if args.manifest:
+        jobs = read_manifest(args.manifest)
+    else:
+        grb_dict = dict(zip(args.grb_key, args.grb_val)) if args.grb_key and args.grb_val else {}
+        jobs = glob_jobs(args.pattern, refactor_variables=args.refactorvars, grb_dict=grb_dict, all_hypercubes=args.all_hypercubes)
+    print(f"\nConverting {len(jobs)} file(s) across {args.workers} worker(s) ...\n")
+
+    # Convert the files & save to default location of the zarr files. Default: "../zarr_data"
+    converter_kwargs = {"profile": args.profile, "target_chunk_mb": args.target_chunk_mb,
+                        "compressor": args.compressor, "clevel": args.clevel, "manifest_path": args.run_manifest,
+                        "cache_dir": args.cache_dir, "cache_quota_gb": args.cache_quota_gb, "precision": parse_precision(args.precision)}
+    nc2zarr_kwargs = {"stream": args.stream, "memory_budget_mb": args.memory_budget, "mmap": args.mmap}
+    batch_wrapper = BatchConverter(jobs, args.workers, converter_kwargs, nc2zarr_kwargs)
+    results = batch_wrapper.run()
+    batch_wrapper.print_report(results)
+    sys.exit(1 if any(r["status"] != "success" for r in results) else 0)
@@ -0,0 +1,125 @@
+import os
+import sys
+sys.path.append( os.path.join(os.path.dirname(os.path.abspath(__file__)), '..') )
+from modules.benchmark import CASES, synthesize, run_suite, compare
+import argparse
+import json
+import time
+
+"""
+********************
+*** Description ***
+********************
+
+Benchmark the conversion throughput & memory of the netCDF (.nc), nc4, GRIB & Zarr paths on synthetic inputs,
+so regressions are caught & chunking/compression choices are compared. The inputs (a cubed-sphere tile, an nc4 aerosol
+file & a multi-hypercube GRIB file) are synthesized locally under ../benchmark_data/raw_data. Each case runs in its own
+process & its wall time, peak RSS, MB/s & output size are saved as JSON.
+
+********************
+* User Arguments. *
+********************
+
+output (str): Path of the JSON file to save the benchmark's results as.
+
+cases (list): Benchmark cases to run. Options: nc2zarr-tile, nc2zarr-nc4, nc2zarr-classic, nc2zarr-classic-mmap,
+              nc2zarr-s3-classic-mmap, grb2zarr-isobaricInhPa, grb2zarr-surface, load-zarr-cold, load-zarr-warm, zarr2nc, cli-startup. Default: All cases.
+              The load-zarr & zarr2nc cases read the Zarr of the nc2zarr-tile case. The nc2zarr-classic & nc2zarr-classic-mmap
+              cases convert the same classic netCDF file w/o & w/ memory mapping, to compare their peak RSS & wall time. The nc2zarr-s3-classic-mmap case
+              streams the classic netCDF file from a local S3 stand-in (requires moto) via S3StreamConverter w/ memory mapping
+              requested, which cloud objects ignore. The cli-startup case fails if a subcommand of data_converter_cli.py takes
+              longer than the startup budget to print its --help, or imports a heavy module (e.g. xarray) while doing so.
+
+repeat (int): Number of runs per case. The fastest run is kept. Default: 1
+
+res (int), levels (int): Resolution (e.g. 96 for C96) & number of vertical levels of the synthetic tile. Default: 96 & 64
+
+nc4_mb (float): Uncompressed size (in MB) of the synthetic nc4 aerosol file. Default: 64
+
+grb_nlat (int): Number of latitudes of the synthetic GRIB file's global grid. Default: 181
+
+regenerate (bool): Regenerate the synthetic inputs (e.g. after changing their size).
+
+workers (int): Number of chunks read & written concurrently. Default: 4
+
+profile (str), compressor (str), clevel (int): Zarr's chunking & compression (see main_nc2zarr_converter.py).
+
+compare (list): Compare two benchmark runs (baseline & current JSON files) rather than running the benchmark.
+                The script exits w/ a nonzero exit code if a case regressed.
+
+threshold (float): Compare only. Relative increase in wall time or peak RSS flagged as a regression. Default: 0.1
+
+********************************
+*** BASH COMMAND TO EXECUTE: ***
+********************************
+
+python main_benchmark.py -o <output_json> --cases <case_1 ... case_N_if_applicable> -r <repeat> -p <profile_if_applicable> -c <compressor_if_applicable>
+
+python main_benchmark.py --compare <baseline_json> <current_json> --threshold <threshold>
+
+******************************
+*** BASH COMMAND EXAMPLES: ***
+******************************
+
+python main_benchmark.py -o ../benchmark_data/baseline.json -r 3
+
+python main_benchmark.py -o ../benchmark_data/zstd.json -r 3 -p auto -c blosc-zstd -l 5
+
+python main_benchmark.py --compare ../benchmark_data/baseline.json ../benchmark_data/zstd.json
+
+python main_benchmark.py -o ../benchmark_data/c384.json --cases nc2zarr-tile zarr2nc --res 384 --levels 127 --regenerate
+
+python main_benchmark.py --cases cli-startup
+
+"""
+
+# User arguments.
+argParser = argparse.ArgumentParser()
+argParser.add_argument("-o", "--output", type=str, help="Path of the JSON file to save the benchmark's results as.")
+argParser.add_argument("--cases", type=str, nargs='+', choices=CASES, default=list(CASES), help="Benchmark cases to run. Default: All cases")
+argParser.add_argument("-r", "--repeat", type=int, default=1, help="Number of runs per case. The fastest run is kept. Default: 1")
+argParser.add_argument("--res", type=int, default=96, help="Resolution of the synthetic tile (e.g. 96 for C96). Default: 96")
+argParser.add_argument("--levels", type=int, default=64, help="Number of vertical levels of the synthetic tile. Default: 64")
+argParser.add_argument("--nc4_mb", type=float, default=64, help="Uncompressed size (in MB) of the synthetic nc4 file. Default: 64")
+argParser.add_argument("--grb_nlat", type=int, default=181, help="Number of latitudes of the synthetic GRIB file. Default: 181")
+argParser.add_argument("--regenerate", action="store_true", help="Regenerate the synthetic inputs.")
+argParser.add_argument("-w", "--workers", type=int, default=4, help="Number of chunks read & written concurrently. Default: 4")
+argParser.add_argument("-p", "--profile", type=str, help="Chunking & compression profile of the Zarr.")
+argParser.add_argument("-c", "--compressor", type=str, help="Compressor of the Zarr.")
+argParser.add_argument("-l", "--clevel", type=int, help="Compression level.")
+argParser.add_argument("--compare", type=str, nargs=2, metavar=("BASELINE", "CURRENT"), help="Compare two benchmark runs' JSON files.")
+argParser.add_argument("--threshold", type=float, default=0.1, help="Relative increase flagged as a regression. Default: 0.1")
+args = argParser.parse_args()
+
+# Compare two benchmark runs
+if args.compare:
+    with open(args.compare[0]) as f:
+        baseline = json.load(f)
+    with open(args.compare[1]) as f:
+        current = json.load(f)
+    rows = compare(baseline, current, args.threshold)
+    print(f"\n{'case':24s} {'wall (s)':>21s} {'ratio':>6s} {'peak RSS (MB)':>21s} {'ratio':>6s} {'output (MB)':>21s}")
+    for row in rows:
+        print(f"{row['case']:24s} {row['baseline_wall_s']:9.3f} -> {row['wall_s']:8.3f} {row['wall_ratio']:6.2f} "
+              f"{row['baseline_peak_rss_mb']:9.1f} -> {row['peak_rss_mb']:8.1f} {row['rss_ratio']:6.2f} "
+              f"{row['baseline_output_mb']:9.1f} -> {row['output_mb']:8.1f}" + ("  REGRESSED" if row['regressed'] else ""))
+    sys.exit(1 if any(row['regressed'] for row in rows) else 0)
+
+# Synthesize the inputs (unless only the CLI's startup is benchmarked) & run the benchmark
+start_t = time.time()
+if set(args.cases) - {'cli-startup'}:
+    synthesize(res=args.res, levels=args.levels, nc4_mb=args.nc4_mb, grb_nlat=args.grb_nlat, regenerate=args.regenerate)
+    print()
+benchmark = run_suite(args.cases, repeat=args.repeat, profile=args.profile, compressor=args.compressor,
+                      clevel=args.clevel, num_workers=args.workers)
+benchmark['meta'].update({"res": args.res, "levels": args.levels, "nc4_mb": args.nc4_mb, "grb_nlat": args.grb_nlat})
+
+if args.output:
+    with open(args.output, 'w') as f:
+        json.dump(benchmark, f, indent=2)
+    print(f"\nThe benchmark's results have been saved under {args.output}")
+
+# Calculalate processing time.
+delta_t = (time.time()-start_t)/60
+print(f"\nProcessing time: {delta_t} min.")
+sys.exit(1 if any(result['status'] != "success" for result in benchmark['results']) else 0)
@@ -0,0 +1,83 @@
+import os
+import sys
+sys.path.append( os.path.join(os.path.dirname(os.path.abspath(__file__)), '..') )
+from modules.zarr_metadata import consolidate, is_consolidated
+import argparse
+import glob
+import time
+
+"""
+********************
+*** Description ***
+********************
+
+Consolidate the metadata of existing Zarr stores in place (e.g. stores written prior to consolidated metadata).
+A consolidated store is opened w/ a single metadata read, rather than one .zarray/.zattrs read per variable --
+so the time to open a store w/ hundreds of variables (e.g. phy_data restarts, GFSPRS hypercubes) no longer
+grows w/ its number of variables. The data is not re-written.
+
+********************
+* User Arguments. *
+********************
+
+zarr_stores (list): Names of the Zarr stores under the location of the zarr files (default: "../zarr_data").
+                    Exclude .zarr extension.
+
+pattern (str): Glob pattern of the Zarr stores under ../zarr_data (e.g. "GFSPRS*"). Used in place of the store names.
+
+force (bool): Re-consolidate stores which already carry consolidated metadata (e.g. after their metadata was edited).
+
+********************************
+*** BASH COMMAND TO EXECUTE: ***
+********************************
+
+python main_consolidate_zarr.py -z <zarr_store_1 ... zarr_store_N>
+
+python main_consolidate_zarr.py -g <pattern>
+
+******************************
+*** BASH COMMAND EXAMPLES: ***
+******************************
+
+python main_consolidate_zarr.py -z 20210323.060000.phy_data.tile6
+
+python main_consolidate_zarr.py -g "GFSPRS*"
+
+python main_consolidate_zarr.py -g "*" -f
+
+"""
+
+# User arguments.
+argParser = argparse.ArgumentParser()
+argParser.add_argument("-z", "--zarr_stores", type=str, nargs='+', help="Zarr names (exclude .zarr extension).")
+argParser.add_argument("-g", "--pattern", type=str, help="Glob pattern of the Zarr stores under ../zarr_data (e.g. 'GFSPRS*').")
+argParser.add_argument("-f", "--force", action="store_true", help="Re-consolidate stores which already carry consolidated metadata.")
+args = argParser.parse_args()
+
+# Collect the Zarr stores of interest
+if args.zarr_stores:
+    stores = [f'../zarr_data/{zarr_store}.zarr' for zarr_store in args.zarr_stores]
+else:
+    stores = sorted(glob.glob(f'../zarr_data/{args.pattern}.zarr'))
+
+if not stores:
+    sys.exit("\nNo Zarr stores found under ../zarr_data.\n")
+
+# Consolidate each store's metadata in place. A failed store does not prevent the remaining stores from being consolidated.
+failed = []
+for store in stores:
+    start_t = time.time()
+    if is_consolidated(store) and not args.force:
+        print(f"\n{store} already carries consolidated metadata ... Skipped.")
+        continue
+    try:
+        if not os.path.isdir(store):
+            raise FileNotFoundError(f"{store} does not exist.")
+        num_objects = consolidate(store)
+        print(f"\n{store} Consolidated ({num_objects} metadata objects) ... Completed.")
+        print(f"Processing time: {(time.time()-start_t)/60} min.")
+    except Exception as e:
+        failed.append(store)
+        print(f"\n{store} Not Consolidated. REASON: {type(e).__name__}: {e}")
+
+sys.exit(1 if failed else 0)
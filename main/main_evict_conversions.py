@@ -0,0 +1,60 @@
+import os
+import sys
+sys.path.append( os.path.join(os.path.dirname(os.path.abspath(__file__)), '..') )
+from modules.conversion_cache import ConversionCache
+import argparse
+
+"""
+********************
+*** Description ***
+********************
+
+Evict the Zarr stores recorded by the conversion cache, least recently used (converted or re-requested) first,
+until the recorded Zarr stores are within the disk quota. Records of Zarr stores which were removed or modified
+since their conversion (e.g. appended to) are dropped -- those Zarr stores are left untouched.
+
+********************
+* User Arguments. *
+********************
+
+cache_dir (str): Location of the conversion cache (see --cache_dir of main_nc2zarr_converter.py). Default: "../conversion_cache"
+
+quota_gb (float): Disk quota (in GB) of the recorded Zarr stores. Default: 0 (evict every recorded Zarr store)
+
+dry_run (bool): List the Zarr stores which would be evicted w/o deleting them.
+
+********************************
+*** BASH COMMAND TO EXECUTE: ***
+********************************
+
+python main_evict_conversions.py -d <cache_dir> -q <quota_gb> --dry_run
+
+******************************
+*** BASH COMMAND EXAMPLES: ***
+******************************
+
+python main_evict_conversions.py -q 500 --dry_run
+
+python main_evict_conversions.py -d ../conversion_cache -q 500
+
+"""
+
+# User arguments.
+argParser = argparse.ArgumentParser()
+argParser.add_argument("-d", "--cache_dir", type=str, default="../conversion_cache", help="Location of the conversion cache. Default: '../conversion_cache'")
+argParser.add_argument("-q", "--quota_gb", type=float, default=0, help="Disk quota (in GB) of the recorded Zarr stores. Default: 0")
+argParser.add_argument("--dry_run", action="store_true", help="List the Zarr stores which would be evicted w/o deleting them.")
+args = argParser.parse_args()
+
+if not os.path.isdir(args.cache_dir):
+    sys.exit(f"\nThe conversion cache does not exist: {args.cache_dir}\n")
+
+# Evict the least recently used Zarr stores beyond the quota
+cache = ConversionCache(args.cache_dir)
+evicted = cache.evict(quota_gb=args.quota_gb, dry_run=args.dry_run)
+for record in evicted:
+    print(f"{'Would Evict' if args.dry_run else 'Evicted'}: {record['output']} ({record['bytes']/1024**3:.2f} GB)")
+
+records = cache.records()
+print(f"\n{len(evicted)} Zarr store(s) {'would be ' if args.dry_run else ''}evicted ({sum(r['bytes'] for r in evicted)/1024**3:.2f} GB). "
+      f"{len(records) - (len(evicted) if args.dry_run else 0)} Zarr store(s) remain recorded.")
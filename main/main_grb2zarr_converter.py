@@ -1,7 +1,7 @@
+import os
 import sys
-sys.path.append( '../modules' )
-from data_converter import DataConverter
-import argparse
+sys.path.append( os.path.join(os.path.dirname(os.path.abspath(__file__)), '..') )
+from modules.data_converter_cli import main
 
 """
 ********************
@@ -27,11 +27,84 @@ grb_val (str): Unique GRIB's Xarray value to the GRB key of interest. In some ca
                multiple values of a unique key per variable. This will require the user to filter
                the GRIB's Xarray by its unique key-to-value pair because Xarray package retricts representing a
                GRIB file that contains more than one hypercube of the same variable.                                                                                    
+
+profile (str): Chunking & compression profile of the Zarr. Options: "auto" (chunks sized to the target chunk size),
+               "time-series" (chunks spanning the full time axis), "spatial-map" (chunks spanning the full horizontal grid),
+               "archive-max-compression" (large chunks w/ the highest Zstd compression level). Default: Chosen by Zarr.
+
+target_chunk_mb (float): Target uncompressed chunk size (in MB). Overrides the profile's target chunk size.
+
+compressor (str): Compressor of the Zarr. Overrides the profile's compressor.
+                  Options: "blosc-zstd", "blosc-lz4", "blosc-lz4hc", "blosc-zlib", "zstd", "lz4", "none"
+
+clevel (int): Compression level. Overrides the profile's compression level.
+
+all_hypercubes (bool): Convert every hypercube of the GRIB file in a single run. The GRIB's messages are scanned once
+                       & each distinct hypercube (e.g. typeOfLevel) is saved to Zarr, rather than executing the script 
+                       once per GRIB key-value pair. The -k & -v flags are ignored.
+
+layout (str): Layout of the Zarr(s) when converting every hypercube. Options: "stores" (one Zarr per hypercube named 
+              <filename2save>_<GRIB_KEY><GRIB_VALUE>.zarr) or "groups" (one Zarr named <filename2save>.zarr w/ 
+              one group per hypercube). Default: "stores"
+
+index_dir (str): Location of the GRIB index cache. If set, the GRIB's index is cached under this directory & reused by 
+                 repeat conversions of the unchanged GRIB file, rather than re-scanning the GRIB file's messages. 
+                 Recommended for read-only raw data directories.
+
+index_max_mb (float): Size limit (in MB) of the GRIB index cache. Default: 1024
+
+append_dim (str): Dimension along which to append to an existing Zarr (e.g. "step"). Used to build a single Zarr from 
+                  forecast-hour files (e.g. GFSPRS.GrbF00/12/24) -- only the new forecast hour's chunks are written & 
+                  the file's schema must match the Zarr's. A scalar coordinate (e.g. "step") is promoted to a dimension. 
+                  If the Zarr does not exist, it is created. Ignored when converting every hypercube.
+
+manifest (str): Path of the JSON-lines run manifest. A record (input & output path, status, error, bytes in & out 
+                & timing) is appended per conversion. Regardless, the script exits w/ a nonzero exit code if a 
+                conversion fails.
+
+variables (list): GRIB shortNames of the variables to convert (e.g. 2t, soilw). Only their GRIB messages are decoded.
+                  When converting every hypercube, only the hypercubes featuring them are saved.
+
+drop_variables (list): Variables to exclude from the conversion.
+
+isel (list): Index range per dimension to convert in the format of <DIM>=<START>:<STOP> (or <DIM>=<INDEX>), e.g. latitude=0:100.
+
+bbox (list): Latitude & longitude bounding box to convert in the format of <LAT_MIN> <LAT_MAX> <LON_MIN> <LON_MAX>.
+             Only the rows & columns spanning the bounding box are read.
+
+metrics (str): Path of the metrics file. If set, each stage of the conversion (open, rename/merge, decode, encode, 
+               compress & store-write) is timed & its bytes are counted -- appended as a JSON line for a ".json" 
+               extension & written as OpenMetrics-style text otherwise (e.g. ".prom").
+
+cprofile (bool): Capture & print a cProfile profile of the conversion.
+
+trace_memory (bool): Capture the peak memory allocated by Python via tracemalloc.
+
+scheduler (str): Dask scheduler compressing & writing the Zarr's chunks concurrently w/ the number of workers (-w).
+                 Options: "threads", "processes", "distributed" (a local Dask distributed cluster). Recommended for
+                 large files on many-core nodes. Default: Loaded data is written by a single thread.
+
+progress (bool): Print the progress of the Zarr's chunk writes.
+
+cache_dir (str): Location of the conversion cache. If set, a file which is unchanged since its conversion w/ the same options
+                 to the same Zarr is not converted again -- the existing Zarr is kept (see main_evict_conversions.py).
+                 Default: None (always convert)
+
+cache_quota_gb (float): Disk quota (in GB) of the Zarr stores recorded by the conversion cache. Once exceeded, the least
+                        recently used Zarr stores are deleted. Default: None (no quota)
+
+precision (list): Precision options per variable, applied prior to compression, in the format of <VARIABLE>=<OPTION>[,<OPTION>],
+                  where "*" stands for every float data variable. Options: "float32" or "float16" (downcast), "bits:<N>" (keep N
+                  mantissa bits), "pack:<8|16|32>" (pack into 8, 16 or 32-bit integers via a scale factor & offset, alike GRIB's
+                  packing). Lossy. The size reduction & the largest error per variable are reported once written.
+
+workers (int): Scheduler only. Number of chunks compressed & written concurrently. Default: 1
+
 ********************************                  
 *** BASH COMMAND TO EXECUTE: ***
 ********************************
 
-python main_grb2zarr_converter.py -f <filename> -z <filename2save> -k <GRIB_KEY_1 GRIB_VALUE_2 ... GRIB_KEY_N_(if_applicable)> -v <GRIB_VALUE_1 GRIB_VALUE_2 ... GRIB_VALUE_N_(if_applicable)>
+python main_grb2zarr_converter.py -f <filename> -z <filename2save> -k <GRIB_KEY_1 GRIB_VALUE_2 ... GRIB_KEY_N_(if_applicable)> -v <GRIB_VALUE_1 GRIB_VALUE_2 ... GRIB_VALUE_N_(if_applicable)> -p <profile_if_applicable> -t <target_chunk_mb_if_applicable> -c <compressor_if_applicable> -l <clevel_if_applicable> --append_dim <append_dim_if_applicable> --variables <variables_if_applicable> --isel <isel_if_applicable> --bbox <bbox_if_applicable>
 
 ******************************
 *** BASH COMMAND EXAMPLES: ***
@@ -70,26 +143,58 @@ python main_grb2zarr_converter.py -f GFSPRS.GrbF00 -z GFSPRS.GrbF00 -k typeOfLev
 python main_grb2zarr_converter.py -f GFSPRS.GrbF00 -z GFSPRS.GrbF00 -k typeOfLevel -v potentialVorticity
 python main_grb2zarr_converter.py -f GFSPRS.GrbF00 -z GFSPRS.GrbF00 -k typeOfLevel -v surface
 
+- For .GrbF## (Every Hypercube in a Single Run),
+
+python main_grb2zarr_converter.py -f GFSPRS.GrbF24 -z GFSPRS.GrbF24 -a
+
+python main_grb2zarr_converter.py -f GFSFLX.GrbF00 -z GFSFLX.GrbF00 -a --layout groups
+
+- For .GrbF## (Cached GRIB Index),
+
+python main_grb2zarr_converter.py -f GFSPRS.GrbF24 -z GFSPRS.GrbF24 -k typeOfLevel -v sigmaLayer --index_dir ../grib_index_cache
+python main_grb2zarr_converter.py -f GFSPRS.GrbF24 -z GFSPRS.GrbF24 -k typeOfLevel -v maxWind --index_dir ../grib_index_cache
+
+- For .GrbF## (Chunking & Compression Profiles),
+
+python main_grb2zarr_converter.py -f GFSPRS.GrbF24 -z GFSPRS.GrbF24 -k typeOfLevel -v sigmaLayer -p spatial-map
+
+python main_grb2zarr_converter.py -f GFSFLX.GrbF00 -z GFSFLX.GrbF00 -k typeOfLevel -v surface -p archive-max-compression
+
+- For .GrbF## (Chunks Compressed & Written Concurrently),
+
+python main_grb2zarr_converter.py -f GFSPRS.GrbF24 -z GFSPRS.GrbF24 -k typeOfLevel -v isobaricInhPa -p auto --scheduler threads -w 16 --progress
+
+- For .GrbF## (Single Zarr, Appended One Forecast Hour at a Time),
+
+python main_grb2zarr_converter.py -f GFSPRS.GrbF00 -z GFSPRS -k typeOfLevel -v maxWind --append_dim step
+python main_grb2zarr_converter.py -f GFSPRS.GrbF12 -z GFSPRS -k typeOfLevel -v maxWind --append_dim step
+python main_grb2zarr_converter.py -f GFSPRS.GrbF24 -z GFSPRS -k typeOfLevel -v maxWind --append_dim step
+
+- For .GrbF## (Variable & Region Subset),
+
+python main_grb2zarr_converter.py -f GFSFLX.GrbF00 -z GFSFLX.GrbF00_soilw -k typeOfLevel -v depthBelowLandLayer --variables soilw
+
+python main_grb2zarr_converter.py -f GFSPRS.GrbF00 -z GFSPRS.GrbF00_conus -k typeOfLevel -v surface --variables t sp --bbox 20 55 -130 -60
+
 References:
 - https://github.com/ecmwf/cfgrib/issues/2
 - https://github.com/ecmwf/cfgrib/issues/263
 - https://github.com/ecmwf/cfgrib/issues/285
 
-"""
+- Conversion Cache (Re-running the Conversion of an Unchanged File Returns the Existing Zarr),
+
+python main_grb2zarr_converter.py -f GFSPRS.GrbF24 -z GFSPRS.GrbF24 -k typeOfLevel -v surface --cache_dir ../conversion_cache
+
+- Reduced Precision (Bit-Rounded, Downcast or Packed Prior to Compression),
 
-# User arguments.
-argParser = argparse.ArgumentParser()
-argParser.add_argument("-f", "--filename", type=str, help="GRIB file of interest to convert to Zarr (include file's extension).")
-argParser.add_argument("-k", "--grb_key", type=str, nargs='+', help="Unique GRIB key of interest.")
-argParser.add_argument("-v", "--grb_val", type=str, nargs='+', help="GRIB value corresponding to unique GRIB key of interest.")
-argParser.add_argument("-z", "--filename2save", type=str, help="Save as Zarr name.")
-args = argParser.parse_args()
+python main_grb2zarr_converter.py -f GFSPRS.GrbF24 -z GFSPRS.GrbF24 -k typeOfLevel -v isobaricInhPa -p auto --precision '*=bits:12'
 
-# Convert single .GrbF## file of interest & save to default location (../zarr_data).
-dc_wrapper = DataConverter(args.filename, None)
+python main_grb2zarr_converter.py -f GFSPRS.GrbF24 -z GFSPRS.GrbF24 -k typeOfLevel -v surface -p auto --precision '*=pack:16' orog=float32
+
+"""
 
-if args.grb_key!=None and args.grb_val!=None:
-    data_zarr = dc_wrapper.convert_grb2zarr(args.filename2save, dict(zip(args.grb_key, args.grb_val)))
-else:
-    data_zarr = dc_wrapper.convert_grb2zarr(args.filename2save, dict())
+# Guard required by the processes & distributed schedulers' workers, which re-import this script on platforms w/o fork.
+if __name__ == "__main__":
 
+    # Parse the user arguments & run via the CLI (see data_converter_cli.py), which imports the dependencies after parsing.
+    sys.exit(main(['grb2zarr'] + sys.argv[1:]))
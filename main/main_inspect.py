@@ -0,0 +1,55 @@
+import os
+import sys
+sys.path.append( os.path.join(os.path.dirname(os.path.abspath(__file__)), '..') )
+from modules.data_converter_cli import main
+
+"""
+********************
+*** Description ***
+********************
+
+Reports the structure of a netCDF or GRIB file (or a Zarr) from its metadata only -- the netCDF header, the
+GRIB messages' section metadata or the Zarr's metadata objects. No data is read or decoded, so large files
+are inspected in well under a second.
+
+The report lists the dimensions, variables, data types & estimated uncompressed sizes. For GRIB files, it
+lists the distinct hypercubes (the combinations of typeOfLevel & stepType) w/ the -k & -v flags which select
+each of them for main_grb2zarr_converter.py. For netCDF files, it lists the variables to refactor (-d flag of
+main_nc2zarr_converter.py).
+
+********************
+* User Arguments. *
+********************
+
+filename (str): netCDF or GRIB file under the location of the raw data files (default: "../raw_data")
+                to inspect. Include the file's extension.
+
+zarr_store (str): Zarr under the location of the zarr files (default: "../zarr_data") to inspect.
+                  Exclude the .zarr extension.
+
+json (bool): Print the report as JSON.
+
+index_dir (str): GRIB only. Location of the GRIB index cache. If set, the messages' headers are cached &
+                 reused by repeat inspections & conversions of the unchanged GRIB file. Default: No cache
+
+********************************
+*** BASH COMMAND TO EXECUTE: ***
+********************************
+
+python main_inspect.py -f <filename> --json
+python main_inspect.py -z <zarr_store> --json
+
+******************************
+*** BASH COMMAND EXAMPLES: ***
+******************************
+
+python main_inspect.py -f sfcf024.nc
+
+python main_inspect.py -f GFSPRS.GrbF24 --index_dir ../grib_index_cache
+
+python main_inspect.py -z sfcf024 --json
+
+"""
+
+# Parse the user arguments & run via the CLI (see data_converter_cli.py), which imports the dependencies after parsing.
+sys.exit(main(['inspect'] + sys.argv[1:]))
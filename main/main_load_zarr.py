@@ -1,45 +1,54 @@
+import os
 import sys
-sys.path.append( '../modules' )
-from load_zarr_data import LoadZarrData
-import argparse
-import time
+sys.path.append( os.path.join(os.path.dirname(os.path.abspath(__file__)), '..') )
+from modules.data_converter_cli import main
 
 """
 ********************
 *** Description ***
 ********************
 
-Loads Zarr as Dask Array.
+Loads Zarr as Dask Array -- or loads several of the Zarr's variables into memory, selected by label and/or index.
+The decompressed chunks are cached in-process, so repeat reads of the same region are served from memory.
 
 ********************
 * User Arguments. *
 ********************
 
-zarr_store (str): Name of the Zarr under the location of the 
-                  zarr files (default: "../zarr_data"). 
+zarr_store (str): Name of the Zarr under the location of the
+                  zarr files (default: "../zarr_data").
 
-variable (str): Variable of interest within Zarr.
-                   
-********************************                  
+variable (list): Variable(s) of interest within Zarr.
+
+sel (list): Label range per dimension to load in the format of <DIM>=<START>:<STOP> (or <DIM>=<LABEL>), e.g. latitude=55:20.
+
+isel (list): Index range per dimension to load in the format of <DIM>=<START>:<STOP> (or <DIM>=<INDEX>), e.g. time=0.
+
+method (str): Method for inexact matches of single labels (e.g. "nearest"). Default: Exact matches.
+
+cache_mb (float): Byte budget (in MB) of the decompressed chunks cached in-process. Default: 256
+
+repeat (int): Number of times to load the selection. Repeat loads are served from the chunk cache. Default: 1
+
+If neither sel nor isel are set, the (first) variable is loaded as a lazy Dask Array.
+
+********************************
 *** BASH COMMAND TO EXECUTE: ***
 ********************************
 
-python main_load_zarr.py -z <zarr_store> -v <variable> 
+python main_load_zarr.py -z <zarr_store> -v <variable_1 ... variable_N> --sel <sel_if_applicable> --isel <isel_if_applicable> -r <repeat_if_applicable>
+
+******************************
+*** BASH COMMAND EXAMPLES: ***
+******************************
+
+python main_load_zarr.py -z sfcf024 -v tmp2m
+
+python main_load_zarr.py -z sfcf024 -v tmp2m spfh2m --sel lat=55:20 lon=230:300 --isel time=0 -r 3
+
+python main_load_zarr.py -z GFSPRS.GrbF24_typeOfLevelsigmaLayer -v t --sel latitude=40 longitude=255 --method nearest
 
 """
 
-# User arguments.
-argParser = argparse.ArgumentParser()
-argParser.add_argument("-z",  "--zarr_store", type=str, help="Zarr name (exclude .zarr extension).")
-argParser.add_argument("-v", "--variable", type=str, help="Zarr's variable of interest.")
-args = argParser.parse_args()
-
-# Loads Zarr as Dask Array.
-start_t = time.time()
-load_wrapper = LoadZarrData(args.zarr_store, args.variable)
-dask_array = load_wrapper.as_dask_array()
-print(dask_array)
-
-# Calculalate processing time.
-delta_t = (time.time()-start_t)/60
-print(f"\nProcessing time: {delta_t} min.")
\ No newline at end of file
+# Parse the user arguments & run via the CLI (see data_converter_cli.py), which imports the dependencies after parsing.
+sys.exit(main(['load'] + sys.argv[1:]))
@@ -1,7 +1,7 @@
+import os
 import sys
-sys.path.append( '../modules' )
-from data_converter import DataConverter
-import argparse
+sys.path.append( os.path.join(os.path.dirname(os.path.abspath(__file__)), '..') )
+from modules.data_converter_cli import main
 
 """
 ********************
@@ -27,12 +27,78 @@ refactor_variables (list): List of multidimensional variables for which will req
                            restriction. As a result, some netCDF files will require variable names
                            to be refactored. If a file does not feature duplication in variables, then set argument
                            to None. Default: None.
+
+stream (bool): Stream the conversion chunk by chunk instead of loading the entire netCDF file into memory.
+               Recommended for large files (e.g. C384_L127 gfs_data.tile#.nc & phy_data restart files).
+
+memory_budget (float): Streaming only. Upper bound (in MB) on the memory used by the chunks in flight. Default: 1024
+
+workers (int): Streaming or scheduler only. Number of chunks read & written concurrently. Default: 1
+
+mmap (bool): Memory-map a classic netCDF file (classic or 64-bit offset format, e.g. gfs_ctrl.nc & some oro_data files)
+             & write it chunk by chunk w/in the memory budget. Each chunk is copied once, straight from the mapped file
+             into the buffer compressed into Zarr, rather than the entire file being read into memory. HDF5-based
+             netCDF-4 files are converted as usual.
+
+profile (str): Chunking & compression profile of the Zarr. Options: "auto" (chunks sized to the target chunk size),
+               "time-series" (chunks spanning the full time axis), "spatial-map" (chunks spanning the full horizontal grid),
+               "archive-max-compression" (large chunks w/ the highest Zstd compression level). Default: Chosen by Zarr.
+
+target_chunk_mb (float): Target uncompressed chunk size (in MB). Overrides the profile's target chunk size.
+
+compressor (str): Compressor of the Zarr. Overrides the profile's compressor.
+                  Options: "blosc-zstd", "blosc-lz4", "blosc-lz4hc", "blosc-zlib", "zstd", "lz4", "none"
+
+clevel (int): Compression level. Overrides the profile's compression level.
+
+append_dim (str): Dimension along which to append to an existing Zarr (e.g. "time"). Used to build a time-series Zarr
+                  from forecast-hour files (e.g. sfcf000.nc, sfcf009.nc, sfcf024.nc) -- only the new forecast hour's 
+                  chunks are written & the file's schema must match the Zarr's. If the Zarr does not exist, it is created.
+
+manifest (str): Path of the JSON-lines run manifest. A record (input & output path, status, error, bytes in & out 
+                & timing) is appended per conversion. Regardless, the script exits w/ a nonzero exit code if a 
+                conversion fails.
+
+variables (list): Data variables to convert. Only the variables of interest (& the latitude & longitude) are read.
+
+drop_variables (list): Variables to exclude from the conversion. They are never read.
+
+isel (list): Index range per dimension to convert in the format of <DIM>=<START>:<STOP> (or <DIM>=<INDEX>), e.g. pfull=0:10.
+
+bbox (list): Latitude & longitude bounding box to convert in the format of <LAT_MIN> <LAT_MAX> <LON_MIN> <LON_MAX>.
+             Only the rows & columns spanning the bounding box are read.
+
+metrics (str): Path of the metrics file. If set, each stage of the conversion (open, rename/merge, decode, encode, 
+               compress & store-write) is timed & its bytes are counted -- appended as a JSON line for a ".json" 
+               extension & written as OpenMetrics-style text otherwise (e.g. ".prom").
+
+cprofile (bool): Capture & print a cProfile profile of the conversion.
+
+trace_memory (bool): Capture the peak memory allocated by Python via tracemalloc.
+
+scheduler (str): Dask scheduler compressing & writing the Zarr's chunks concurrently w/ the number of workers (-w).
+                 Options: "threads", "processes", "distributed" (a local Dask distributed cluster). Recommended for
+                 large files on many-core nodes. Default: Loaded data is written by a single thread.
+
+progress (bool): Print the progress of the Zarr's chunk writes.
+
+cache_dir (str): Location of the conversion cache. If set, a file which is unchanged since its conversion w/ the same options
+                 to the same Zarr is not converted again -- the existing Zarr is kept (see main_evict_conversions.py).
+                 Default: None (always convert)
+
+cache_quota_gb (float): Disk quota (in GB) of the Zarr stores recorded by the conversion cache. Once exceeded, the least
+                        recently used Zarr stores are deleted. Default: None (no quota)
+
+precision (list): Precision options per variable, applied prior to compression, in the format of <VARIABLE>=<OPTION>[,<OPTION>],
+                  where "*" stands for every float data variable. Options: "float32" or "float16" (downcast), "bits:<N>" (keep N
+                  mantissa bits), "pack:<8|16|32>" (pack into 8, 16 or 32-bit integers via a scale factor & offset, alike GRIB's
+                  packing). Lossy. The size reduction & the largest error per variable are reported once written.
                                              
 ********************************                  
 *** BASH COMMAND TO EXECUTE: ***
 ********************************
 
-python main_nc2zarr_converter.py -f <filename> -z <filename2save> -d <refactor_variables_if_applicable>
+python main_nc2zarr_converter.py -f <filename> -z <filename2save> -d <refactor_variables_if_applicable> -s --mmap -m <memory_budget_if_applicable> -w <workers_if_applicable> -p <profile_if_applicable> -t <target_chunk_mb_if_applicable> -c <compressor_if_applicable> -l <clevel_if_applicable> --append_dim <append_dim_if_applicable> --variables <variables_if_applicable> --isel <isel_if_applicable> --bbox <bbox_if_applicable>
 
 ******************************
 *** BASH COMMAND EXAMPLES: ***
@@ -70,15 +136,58 @@ python main_nc2zarr_converter.py -f sfcf024.tile6.nc -z sfcf024.tile6 -d grid_xt
 
 python main_nc2zarr_converter.py -f atmf024.tile4.nc -z atmf024.tile4 -d grid_xt grid_yt
 
+- For large .nc (Streamed Chunk by Chunk w/ a Bounded Memory Budget),
+
+python main_nc2zarr_converter.py -f gfs_data.tile1.nc -z gfs_data.tile1 -s -m 512 -w 4
+
+- For classic .nc (Memory-Mapped & Written Chunk by Chunk),
+
+python main_nc2zarr_converter.py -f gfs_ctrl.nc -z gfs_ctrl --mmap
+
+python main_nc2zarr_converter.py -f C96_oro_data.tile7.halo4.nc -z C96_oro_data.tile7.halo4 --mmap -m 512 -w 4
+
+- For large .nc (Chunks Compressed & Written Concurrently on Many-Core Nodes),
+
+python main_nc2zarr_converter.py -f 20210323.060000.phy_data.tile6.nc -z 20210323.060000.phy_data.tile6 -p auto --scheduler threads -w 32 --progress
+
+python main_nc2zarr_converter.py -f gfs_data.tile1.nc -z gfs_data.tile1 -s -m 4096 --scheduler distributed -w 16 --progress
+
+- For .nc (Chunking & Compression Profiles),
+
+python main_nc2zarr_converter.py -f sfcf024.nc -z sfcf024 -p spatial-map
+
+python main_nc2zarr_converter.py -f 20210323.060000.phy_data.tile6.nc -z 20210323.060000.phy_data.tile6 -p archive-max-compression
+
+python main_nc2zarr_converter.py -f gfs_data.tile6.nc -z gfs_data.tile6 -p auto -t 8 -c blosc-zstd -l 3
+
+- For .nc (Time-Series Zarr, Appended One Forecast Hour at a Time),
+
+python main_nc2zarr_converter.py -f sfcf000.nc -z sfcf --append_dim time
+python main_nc2zarr_converter.py -f sfcf009.nc -z sfcf --append_dim time
+python main_nc2zarr_converter.py -f sfcf024.nc -z sfcf --append_dim time
+
+- For .nc (Variable & Region Subset),
+
+python main_nc2zarr_converter.py -f sfcf024.nc -z sfcf024_tmp2m --variables tmp2m spfh2m
+
+python main_nc2zarr_converter.py -f atmf024.nc -z atmf024_conus --variables tmp ugrd vgrd --isel pfull=100:127 --bbox 20 55 -130 -60
+
+python main_nc2zarr_converter.py -f gfs_data.tile6.nc -z gfs_data.tile6 --drop_variables o3mr liq_wat
+
+- Conversion Cache (Re-running the Conversion of an Unchanged File Returns the Existing Zarr),
+
+python main_nc2zarr_converter.py -f sfcf024.nc -z sfcf024 -p auto --cache_dir ../conversion_cache
+
+- Reduced Precision (Bit-Rounded, Downcast or Packed Prior to Compression),
+
+python main_nc2zarr_converter.py -f sfcf024.nc -z sfcf024 -p auto --precision '*=bits:10' tmp2m=bits:14
+
+python main_nc2zarr_converter.py -f gfs_data.tile6.nc -z gfs_data.tile6 -p auto --precision '*=float32,bits:12' o3mr=pack:16
+
 """
 
-# User arguments.
-argParser = argparse.ArgumentParser()
-argParser.add_argument("-f", "--filename", type=str, help="netCDF file to convert to Zarr. Include file extension (e.g. .nc, .nc4).")
-argParser.add_argument("-z", "--filename2save", type=str, help="Save as Zarr name.")
-argParser.add_argument("-d", "--refactorvars", type=str, nargs='+', help="Multi-dimension variables in need of refactoring due to its duplication in variable. Reason: Xarray will not allow for duplicated variables and will result in conflicts to its restriction. For example, -d Disallowed Variable 1 Disallowed Variable 2 ... Disallowed Variable N")
-args = argParser.parse_args()
+# Guard required by the processes & distributed schedulers' workers, which re-import this script on platforms w/o fork.
+if __name__ == "__main__":
 
-# Convert single netCDF file of interest & save to default location of the zarr files. Default: "../zarr_data"
-dc_wrapper = DataConverter(args.filename, args.refactorvars)
-data_zarr = dc_wrapper.convert_nc2zarr(args.filename2save)
+    # Parse the user arguments & run via the CLI (see data_converter_cli.py), which imports the dependencies after parsing.
+    sys.exit(main(['nc2zarr'] + sys.argv[1:]))
@@ -0,0 +1,107 @@
+import os
+import sys
+sys.path.append( os.path.join(os.path.dirname(os.path.abspath(__file__)), '..') )
+from modules.download_data import BulkDownloadData
+import argparse
+
+"""
+********************
+*** Description ***
+********************
+
+Download many objects from S3 cloud storage concurrently, w/ a single pooled client.
+
+********************
+* User Arguments. *
+********************
+
+bucket (str): Cloud bucket's Amazon Resource Name (ARN).
+              Options: 'noaa-ufs-regtests-pds', 'noaa-ufs-land-da-pds',
+              'noaa-ufs-srw-pds'
+
+prefix (str): Prefix of the objects' keys to download (e.g. a regression test's output directory).
+              Each object is saved under its key's path relative to the prefix.
+
+keys (list): Keys of the objects to download. Used in place of a prefix. Each object is saved under its key's filename,
+            unless several keys share a filename -- those objects are saved under their keys' paths.
+
+workers (int): Number of objects downloaded concurrently. Default: 8
+
+chunk_mb (float): Part size (in MB) of multipart downloads. Default: 8
+
+concurrency (int): Number of parts downloaded concurrently per object. Default: 10
+
+endpoint_url (str): URL of the storage endpoint (e.g. a local S3 stand-in such as moto). Default: AWS S3
+
+cache_dir (str): Location of the download cache. If set, objects are only downloaded when the cache does not hold their
+                 current version (validated by size & ETag), & interrupted downloads are resumed. Default: None (always download)
+
+cache_quota_gb (float): Disk quota (in GB) of the download cache. Default: 50
+
+async_io (bool): Download via asyncio (see async_download.py) w/ the number of requests in flight (-n). Each object is
+                 streamed to disk in blocks of chunk_mb via a bounded queue, so a slow disk slows the stream rather than
+                 buffering the object in memory. The download cache & the concurrency are not used.
+
+queue_blocks (int): Async I/O only. Number of blocks queued per object for the disk writer. Default: 4
+
+progress (bool): Async I/O only. Print the progress of each object.
+
+The script exits w/ a nonzero exit code if an object failed to download.
+
+********************************
+*** BASH COMMAND TO EXECUTE: ***
+********************************
+
+python main_s3_bulk_download.py -b <bucket_arn> -p <prefix> -n <workers> --chunk_mb <chunk_mb> --concurrency <concurrency>
+
+python main_s3_bulk_download.py -b <bucket_arn> -k <key_1 key_2 ... key_N> -n <workers>
+
+python main_s3_bulk_download.py -b <bucket_arn> -p <prefix> -n <requests_in_flight> --async_io --chunk_mb <chunk_mb> --queue_blocks <queue_blocks> --progress
+
+******************************
+*** BASH COMMAND EXAMPLES: ***
+******************************
+
+python main_s3_bulk_download.py -b noaa-ufs-regtests-pds -p develop-20230222/INTEL/atmaero_control_p8_rad/ -n 16
+
+python main_s3_bulk_download.py -b noaa-ufs-regtests-pds -p develop-20230222/INTEL/atmaero_control_p8_rad/ -n 16 --cache_dir ../download_cache --cache_quota_gb 200
+
+python main_s3_bulk_download.py -b noaa-ufs-regtests-pds -k BM_IC-20220207/2012010100/gfs_p7/C384_L127/INPUT/gfs_data.tile1.nc BM_IC-20220207/2012010100/gfs_p7/C384_L127/INPUT/gfs_data.tile6.nc --chunk_mb 64 --concurrency 16
+
+python main_s3_bulk_download.py -b noaa-ufs-regtests-pds -p develop-20230222/INTEL/atmaero_control_p8_rad/ -n 32 --async_io --progress
+
+python main_s3_bulk_download.py -b test-bucket -p INPUT/ -n 4 --async_io --endpoint_url http://127.0.0.1:5000
+
+"""
+
+# User arguments.
+argParser = argparse.ArgumentParser()
+argParser.add_argument("-b", "--bucket", type=str, help="Bucket's Amazon Resource Name (ARN). Options: 'noaa-ufs-regtests-pds', 'noaa-ufs-land-da-pds', 'noaa-ufs-srw-pds', etc.")
+argParser.add_argument("-p", "--prefix", type=str, help="Prefix of the objects' keys to download.")
+argParser.add_argument("-k", "--keys", type=str, nargs='+', help="Keys of the objects to download.")
+argParser.add_argument("-n", "--workers", type=int, default=8, help="Number of objects downloaded concurrently. Default: 8")
+argParser.add_argument("--chunk_mb", type=float, default=8, help="Part size (in MB) of multipart downloads. Default: 8")
+argParser.add_argument("--concurrency", type=int, default=10, help="Number of parts downloaded concurrently per object. Default: 10")
+argParser.add_argument("--endpoint_url", type=str, help="URL of the storage endpoint (e.g. a local S3 stand-in).")
+argParser.add_argument("--cache_dir", type=str, help="Location of the download cache. If set, unchanged objects are not downloaded again.")
+argParser.add_argument("--cache_quota_gb", type=float, default=50, help="Disk quota (in GB) of the download cache. Default: 50")
+argParser.add_argument("--async_io", action="store_true", help="Download via asyncio w/ the number of requests in flight (-n).")
+argParser.add_argument("--queue_blocks", type=int, default=4, help="Async I/O only. Number of blocks queued per object for the disk writer. Default: 4")
+argParser.add_argument("--progress", action="store_true", help="Async I/O only. Print the progress of each object.")
+args = argParser.parse_args()
+
+# Download via asyncio & save to default location of the raw files. Default: "../raw_data"
+if args.async_io:
+    from modules.async_download import AsyncDownloadData, progress_printer
+    dl_wrapper = AsyncDownloadData(args.bucket, csp_storage='s3', max_in_flight=args.workers, chunk_mb=args.chunk_mb,
+                                   queue_blocks=args.queue_blocks, endpoint_url=args.endpoint_url,
+                                   progress=progress_printer() if args.progress else None)
+    results = dl_wrapper.run(keys=args.keys, prefix=args.prefix)
+    sys.exit(1 if any(r["status"] != "success" for r in results) else 0)
+
+# Download & save to default location of the raw files. Default: "../raw_data"
+dl_wrapper = BulkDownloadData(args.bucket, csp_storage='s3', max_workers=args.workers, multipart_chunksize_mb=args.chunk_mb,
+                              max_concurrency=args.concurrency, endpoint_url=args.endpoint_url,
+                              cache_dir=args.cache_dir, cache_quota_gb=args.cache_quota_gb)
+results = dl_wrapper.download(keys=args.keys, prefix=args.prefix)
+sys.exit(1 if any(r["status"] != "success" for r in results) else 0)
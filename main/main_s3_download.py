@@ -1,7 +1,7 @@
+import os
 import sys
-sys.path.append( '../modules' )
-from download_data import DownloadData
-import argparse
+sys.path.append( os.path.join(os.path.dirname(os.path.abspath(__file__)), '..') )
+from modules.data_converter_cli import main
 
 """
 ********************
@@ -21,12 +21,19 @@ bucket (str): Cloud bucket's Amazon Resource Name (ARN).
 key (str): Key of the object in cloud.
 
 save_as_fn (str): Name to save object as file.
+
+cache_dir (str): Location of the download cache. If set, objects are only downloaded when the cache does not hold their
+                 current version (validated by size & ETag), & interrupted downloads are resumed. Default: None (always download)
+
+cache_quota_gb (float): Disk quota (in GB) of the download cache. Default: 50
+
+metrics (str): Path of the metrics file. If set, the download's time & bytes are saved (see main_nc2zarr_converter.py).
                    
 ********************************                  
 *** BASH COMMAND TO EXECUTE: ***
 ********************************
 
-python main_s3_download.py -b <bucket_arn> -k <key> -z <save_as_fn> 
+python main_s3_download.py -b <bucket_arn> -k <key> -z <save_as_fn> --cache_dir <cache_dir_if_applicable>
 
 ******************************
 *** BASH COMMAND EXAMPLES: ***
@@ -89,12 +96,5 @@ python main_s3_download.py -b noaa-ufs-regtests-pds -k develop-20230222/INTEL/ra
 
 """
 
-# User arguments.
-argParser = argparse.ArgumentParser()
-argParser.add_argument("-b", "--bucket", type=str, help="Bucket's Amazon Resource Name (ARN). Options: 'noaa-ufs-regtests-pds', 'noaa-ufs-land-da-pds', 'noaa-ufs-srw-pds', etc.")
-argParser.add_argument("-k", "--key", type=str, help="Key of the object in cloud to download.")
-argParser.add_argument("-z", "--save_as_fn", type=str, help="Save as filename of downloaded cloud object.")
-args = argParser.parse_args()
-
-# Download & save to default location of the raw files. Default: "../raw_data"
-dl_wrapper = DownloadData(args.bucket, args.key, args.save_as_fn, csp_storage='s3')
+# Parse the user arguments & run via the CLI (see data_converter_cli.py), which imports the dependencies after parsing.
+sys.exit(main(['download'] + sys.argv[1:]))
@@ -0,0 +1,106 @@
+import os
+import sys
+sys.path.append( os.path.join(os.path.dirname(os.path.abspath(__file__)), '..') )
+from modules.s3_stream_converter import S3StreamConverter
+from modules.batch_converter import is_grib
+from modules.zarr_encoding import PROFILES, COMPRESSORS
+import argparse
+
+"""
+********************
+*** Description ***
+********************
+
+Convert a netCDF or GRIB object in S3 cloud storage straight to Zarr, w/o staging the raw file on local disk.
+netCDF4 objects are read chunk by chunk via ranged reads while the Zarr is written, so the download & the
+conversion overlap. GRIB objects are streamed into memory prior to the conversion.
+
+********************
+* User Arguments. *
+********************
+
+bucket (str): Cloud bucket's Amazon Resource Name (ARN).
+              Options: 'noaa-ufs-regtests-pds', 'noaa-ufs-land-da-pds',
+              'noaa-ufs-srw-pds'
+
+key (str): Key of the object in cloud.
+
+filename2save (str): Name to save Zarr as under ../zarr_data.
+
+refactor_variables (list): netCDF only. Variables in need of refactoring (see main_nc2zarr_converter.py).
+
+grb_key (str) & grb_val (str): GRIB only. GRIB key-value pairs to filter by (see main_grb2zarr_converter.py).
+
+all_hypercubes (bool): GRIB only. Convert every hypercube of the GRIB object in a single run.
+
+workers (int): netCDF only. Number of chunks fetched, compressed & written concurrently. Default: 4
+
+memory_budget (float): netCDF only. Upper bound (in MB) on the memory used by the chunks in flight. Default: 1024
+
+block_size_mb (float): Size (in MB) of each ranged read. Default: 8
+
+endpoint_url (str): URL of the storage endpoint (e.g. a local S3 stand-in such as moto). Default: AWS S3
+
+anon (bool): Access the bucket anonymously (e.g. public NOAA Open Data buckets).
+
+profile (str), target_chunk_mb (float), compressor (str), clevel (int): Zarr's chunking & compression
+                                                                        (see main_nc2zarr_converter.py).
+
+manifest (str): Path of the JSON-lines run manifest. A record (input & output path, status, error, bytes in & out 
+                & timing) is appended per conversion. Regardless, the script exits w/ a nonzero exit code if a 
+                conversion fails.
+
+********************************
+*** BASH COMMAND TO EXECUTE: ***
+********************************
+
+python main_s3_stream_converter.py -b <bucket_arn> -k <key> -z <filename2save> -d <refactor_variables_if_applicable> -w <workers>
+
+python main_s3_stream_converter.py -b <bucket_arn> -k <key> -z <filename2save> --grb_key <GRIB_KEY_1 ... GRIB_KEY_N> --grb_val <GRIB_VALUE_1 ... GRIB_VALUE_N>
+
+******************************
+*** BASH COMMAND EXAMPLES: ***
+******************************
+
+python main_s3_stream_converter.py -b noaa-ufs-regtests-pds -k BM_IC-20220207/2012010100/gfs_p7/C384_L127/INPUT/gfs_data.tile1.nc -z gfs_data.tile1 -w 8 --anon
+
+python main_s3_stream_converter.py -b noaa-ufs-regtests-pds -k develop-20230222/INTEL/control_CubedSphereGrid/sfcf024.tile6.nc -z sfcf024.tile6 -d grid_xt grid_yt --anon
+
+python main_s3_stream_converter.py -b noaa-ufs-regtests-pds -k develop-20230222/INTEL/atmaero_control_p8_rad/GFSPRS.GrbF24 -z GFSPRS.GrbF24 -a --anon
+
+"""
+
+# User arguments.
+argParser = argparse.ArgumentParser()
+argParser.add_argument("-b", "--bucket", type=str, help="Bucket's Amazon Resource Name (ARN). Options: 'noaa-ufs-regtests-pds', 'noaa-ufs-land-da-pds', 'noaa-ufs-srw-pds', etc.")
+argParser.add_argument("-k", "--key", type=str, help="Key of the object in cloud to convert.")
+argParser.add_argument("-z", "--filename2save", type=str, help="Save as Zarr name.")
+argParser.add_argument("-d", "--refactorvars", type=str, nargs='+', help="netCDF only. Variables in need of refactoring.")
+argParser.add_argument("--grb_key", type=str, nargs='+', help="GRIB only. GRIB keys to filter by.")
+argParser.add_argument("--grb_val", type=str, nargs='+', help="GRIB only. GRIB values corresponding to the GRIB keys.")
+argParser.add_argument("-a", "--all_hypercubes", action="store_true", help="GRIB only. Convert every hypercube of the GRIB object in a single run.")
+argParser.add_argument("-w", "--workers", type=int, default=4, help="netCDF only. Number of chunks fetched, compressed & written concurrently. Default: 4")
+argParser.add_argument("-m", "--memory_budget", type=float, default=1024, help="netCDF only. Upper bound (in MB) on the memory used by the chunks in flight. Default: 1024")
+argParser.add_argument("--block_size_mb", type=float, default=8, help="Size (in MB) of each ranged read. Default: 8")
+argParser.add_argument("--endpoint_url", type=str, help="URL of the storage endpoint (e.g. a local S3 stand-in).")
+argParser.add_argument("--anon", action="store_true", help="Access the bucket anonymously.")
+argParser.add_argument("-p", "--profile", type=str, choices=list(PROFILES), help="Chunking & compression profile of the Zarr.")
+argParser.add_argument("-t", "--target_chunk_mb", type=float, help="Target uncompressed chunk size (in MB).")
+argParser.add_argument("-c", "--compressor", type=str, choices=COMPRESSORS, help="Compressor of the Zarr.")
+argParser.add_argument("-l", "--clevel", type=int, help="Compression level.")
+argParser.add_argument("--manifest", type=str, help="Path of the JSON-lines run manifest. A record is appended per conversion.")
+args = argParser.parse_args()
+
+# Convert the cloud object & save to default location of the zarr files. Default: "../zarr_data"
+stream_wrapper = S3StreamConverter(args.bucket, args.key, args.refactorvars, endpoint_url=args.endpoint_url, anon=args.anon,
+                                   block_size_mb=args.block_size_mb, profile=args.profile, target_chunk_mb=args.target_chunk_mb,
+                                   compressor=args.compressor, clevel=args.clevel, manifest_path=args.manifest)
+
+if is_grib(args.key) and args.all_hypercubes:
+    data_zarr = stream_wrapper.convert_grb2zarr_all(args.filename2save)
+elif is_grib(args.key):
+    grb_dict = dict(zip(args.grb_key, args.grb_val)) if args.grb_key and args.grb_val else dict()
+    data_zarr = stream_wrapper.convert_grb2zarr(args.filename2save, grb_dict)
+else:
+    data_zarr = stream_wrapper.convert_nc2zarr(args.filename2save, stream=True, memory_budget_mb=args.memory_budget, num_workers=args.workers)
+sys.exit(stream_wrapper.run_manifest.exit_code())
@@ -0,0 +1,98 @@
+import os
+import sys
+sys.path.append( os.path.join(os.path.dirname(os.path.abspath(__file__)), '..') )
+from modules.tile_mosaic import TileMosaicConverter
+from modules.zarr_encoding import PROFILES, COMPRESSORS, SCHEDULERS
+import argparse
+import glob
+
+"""
+********************
+*** Description ***
+********************
+
+Combine the tile files of a cubed-sphere grid (e.g. gfs_data.tile1.nc - gfs_data.tile6.nc) into a single Zarr
+w/ a "tile" dimension. The tiles are opened lazily & each chunk spans a single tile, so each tile remains
+independently readable while a global field is read from a single Zarr.
+
+********************
+* User Arguments. *
+********************
+
+filenames (list): Names of the tile files of interest located under the location of the raw (unprocessed) files
+                  (default: "../raw_data"). Include file extension (e.g. .nc, .nc4).
+
+pattern (str): Glob pattern of the tile files under ../raw_data (e.g. "gfs_data.tile*.nc"). Used in place of the filenames.
+
+filename2save (str): Name to save Zarr as under ../zarr_data.
+
+refactor_variables (list): Variables in need of refactoring, shared by all tiles (see main_nc2zarr_converter.py).
+
+workers (int): Number of chunks read & written concurrently. Default: 4
+
+memory_budget (float): Upper bound (in MB) on the memory used by the chunks in flight. Default: 1024
+
+profile (str), target_chunk_mb (float), compressor (str), clevel (int): Zarr's chunking & compression
+                                                                        (see main_nc2zarr_converter.py).
+
+scheduler (str): Dask scheduler compressing & writing the Zarr's chunks concurrently w/ the number of workers (-w).
+                 Options: "threads" (default), "processes", "distributed" (a local Dask distributed cluster).
+
+progress (bool): Print the progress of the Zarr's chunk writes.
+
+manifest (str): Path of the JSON-lines run manifest. A record (input & output path, status, error, bytes in & out 
+                & timing) is appended per conversion. Regardless, the script exits w/ a nonzero exit code if a 
+                conversion fails.
+
+********************************
+*** BASH COMMAND TO EXECUTE: ***
+********************************
+
+python main_tiles2zarr_converter.py -f <filename_1 filename_2 ... filename_N> -z <filename2save> -d <refactor_variables_if_applicable> -w <workers>
+
+python main_tiles2zarr_converter.py -g <pattern> -z <filename2save> -d <refactor_variables_if_applicable> -w <workers>
+
+******************************
+*** BASH COMMAND EXAMPLES: ***
+******************************
+
+python main_tiles2zarr_converter.py -g "gfs_data.tile*.nc" -z gfs_data -w 8
+
+python main_tiles2zarr_converter.py -g "sfcf024.tile*.nc" -z sfcf024 -d grid_xt grid_yt -w 8
+
+python main_tiles2zarr_converter.py -f 20210323.060000.fv_core.res.tile1.nc 20210323.060000.fv_core.res.tile2.nc 20210323.060000.fv_core.res.tile3.nc 20210323.060000.fv_core.res.tile4.nc 20210323.060000.fv_core.res.tile5.nc 20210323.060000.fv_core.res.tile6.nc -z 20210323.060000.fv_core.res -p spatial-map
+
+"""
+
+# Guard required by the processes & distributed schedulers' workers, which re-import this script on platforms w/o fork.
+if __name__ == "__main__":
+
+    # User arguments.
+    argParser = argparse.ArgumentParser()
+    argParser.add_argument("-f", "--filenames", type=str, nargs='+', help="Tile files to combine into a single Zarr. Include file extension (e.g. .nc, .nc4).")
+    argParser.add_argument("-g", "--pattern", type=str, help="Glob pattern of the tile files under ../raw_data (e.g. 'gfs_data.tile*.nc').")
+    argParser.add_argument("-z", "--filename2save", type=str, help="Save as Zarr name.")
+    argParser.add_argument("-d", "--refactorvars", type=str, nargs='+', help="Variables in need of refactoring, shared by all tiles.")
+    argParser.add_argument("-w", "--workers", type=int, default=4, help="Number of chunks read & written concurrently. Default: 4")
+    argParser.add_argument("-m", "--memory_budget", type=float, default=1024, help="Upper bound (in MB) on the memory used by the chunks in flight. Default: 1024")
+    argParser.add_argument("-p", "--profile", type=str, choices=list(PROFILES), help="Chunking & compression profile of the Zarr.")
+    argParser.add_argument("-t", "--target_chunk_mb", type=float, help="Target uncompressed chunk size (in MB).")
+    argParser.add_argument("-c", "--compressor", type=str, choices=COMPRESSORS, help="Compressor of the Zarr.")
+    argParser.add_argument("-l", "--clevel", type=int, help="Compression level.")
+    argParser.add_argument("--scheduler", type=str, choices=SCHEDULERS, help="Dask scheduler compressing & writing the Zarr's chunks concurrently w/ the number of workers (-w).")
+    argParser.add_argument("--progress", action="store_true", help="Print the progress of the Zarr's chunk writes.")
+    argParser.add_argument("--manifest", type=str, help="Path of the JSON-lines run manifest. A record is appended per conversion.")
+    args = argParser.parse_args()
+
+    # Collect the tile files of interest
+    filenames = args.filenames or [os.path.basename(path) for path in glob.glob(f'../raw_data/{args.pattern}')]
+
+    if not filenames:
+        sys.exit("\nNo tile files found under ../raw_data.\n")
+
+    # Combine the tiles & save to default location of the zarr files. Default: "../zarr_data"
+    mosaic_wrapper = TileMosaicConverter(filenames, args.refactorvars, profile=args.profile,
+                                         target_chunk_mb=args.target_chunk_mb, compressor=args.compressor, clevel=args.clevel,
+                                         manifest_path=args.manifest, scheduler=args.scheduler, progress=args.progress)
+    data_zarr = mosaic_wrapper.convert_tiles2zarr(args.filename2save, memory_budget_mb=args.memory_budget, num_workers=args.workers)
+    sys.exit(mosaic_wrapper.run_manifest.exit_code())
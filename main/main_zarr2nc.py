@@ -1,8 +1,7 @@
+import os
 import sys
-sys.path.append( '../modules' )
-from zarr2nc import Zarr2NC
-import argparse
-import time
+sys.path.append( os.path.join(os.path.dirname(os.path.abspath(__file__)), '..') )
+from modules.data_converter_cli import main
 
 """
 ********************
@@ -17,33 +16,53 @@ Convert Zarr to netCDF.
 
 zarr_store (str): Name of the Zarr store.
 
-combine_by (str): Method to combine all data within Zarr. 
-                  Some options: "nested" or "by_coords"
+combine_by (str): Unused. The Zarr is opened directly. Retained for compatibility.
 
 zarr_data_dir (str):  Directory path of the Zarr. Default: "../zarr_data"
 
 nc_data_dir (str): Directory path for the newly converted netCDF file. Default: "../nc_data"
+
+group (str): Group within the Zarr to convert (e.g. a GRIB hypercube saved via --layout groups). Default: Root of the Zarr
+
+complevel (int): zlib compression level of the netCDF variables. If 0, the variables are not compressed. Default: 4
+
+no_shuffle (bool): Do not apply the byte shuffle filter prior to compression.
+
+split_by (str): Split the netCDF into one file per data variable ("variable") or per time step ("time").
+                Default: A single netCDF file.
+
+split_dim (str): Time split only. Dimension to split along. Default: The Zarr's time dimension.
+
+workers (int): Number of Zarr chunks read & decompressed concurrently per netCDF file. Default: 4
+
+max_workers (int): Split only. Number of netCDF files written concurrently. Default: 4
+
+manifest (str): Path of the JSON-lines run manifest. A record (input & output path, status, error, bytes in & out 
+                & timing) is appended per conversion. Regardless, the script exits w/ a nonzero exit code if a 
+                conversion fails.
                    
 ********************************                  
 *** BASH COMMAND TO EXECUTE: ***
 ********************************
 
-python main_zarr2nc.py -z <zarr_store> -c <combine_by> 
+python main_zarr2nc.py -z <zarr_store> -l <complevel_if_applicable> -s <split_by_if_applicable> -w <workers> -n <max_workers>
 
-"""
+******************************
+*** BASH COMMAND EXAMPLES: ***
+******************************
+
+python main_zarr2nc.py -z sfcf024
 
-# User arguments.
-argParser = argparse.ArgumentParser()
-argParser.add_argument("-z", "--zarr_store",  type=str, help="Zarr name (exclude .zarr extension).")
-argParser.add_argument("-c", "--combine_by",  type=str, help="Way to combine the Zarr. Options: 'nested' or 'by_coords' to combine all data within Zarr.")
-args = argParser.parse_args()
+python main_zarr2nc.py -z gfs_data.tile1 -l 1 -w 8
 
-# Convert Zarr to netCDF & save to default location of the netCDF files. Default: "../nc_data"
-start_t = time.time()
-zarr2nc_wrapper = Zarr2NC()
-zarr2nc_wrapper.convert_zarr2nc(args.zarr_store, args.combine_by)
+python main_zarr2nc.py -z 20210323.060000.phy_data.tile6 -s variable -n 8
+
+python main_zarr2nc.py -z sfcf -s time -n 4
+
+"""
 
+# Guard required by the worker processes, which re-import this script on platforms w/o fork.
+if __name__ == "__main__":
 
-# Calculalate processing time.
-delta_t = (time.time()-start_t)/60
-print(f"\nProcessing time: {delta_t} min.\n")
\ No newline at end of file
+    # Parse the user arguments & run via the CLI (see data_converter_cli.py), which imports the dependencies after parsing.
+    sys.exit(main(['zarr2nc'] + sys.argv[1:]))
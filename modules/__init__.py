@@ -0,0 +1,7 @@
+"""
+Converting & loading multidimensional data as Xarray, Zarr & Dask Array.
+
+The modules import each other relative to this package. Within the repository, the main/ scripts import them
+as the "modules" package (e.g. modules.data_converter). Once installed, they are the data_converter package
+(e.g. data_converter.data_converter).
+"""
@@ -0,0 +1,354 @@
+import os
+import time
+import asyncio
+import contextlib
+from aiobotocore.config import AioConfig
+from aiobotocore.session import get_session
+from .download_data import save_as_names
+
+
+def progress_printer(step=0.25):
+    """
+    Create a progress callback printing each object's progress every step of its size.
+
+    Args:
+        step (float): Fraction of an object's size between printouts. Default: 0.25
+
+    Return (function): Progress callback (see AsyncDownloadData).
+
+    """
+    printed = {}
+
+    def progress(obj_key, nbytes, size):
+        fraction = nbytes/size if size else 1.0
+        if fraction >= printed.get(obj_key, 0.0) + step or fraction >= 1.0 > printed.get(obj_key, 0.0):
+            printed[obj_key] = fraction
+            print(f"  {obj_key} ... {fraction*100:.0f}% ({nbytes/1024**2:.1f} of {size/1024**2:.1f} MB)")
+
+    return progress
+
+
+class AsyncDownloadData():
+    """
+
+    Downloads objects from S3 cloud storage via asyncio, w/ a bounded number of requests in flight.
+
+    Each object is streamed to disk block by block. The blocks are queued to a writer, which writes them to
+    disk off the event loop. The queue is bounded, so a slow disk stalls the object's stream (backpressure)
+    rather than buffering the object in memory. The downloads are coroutines, so they may be awaited
+    alongside other work (e.g. conversions run via an executor) in a single event loop, e.g.
+
+        async with AsyncDownloadData(bucket_arn) as downloader:
+            async for result in downloader.as_completed(keys):
+                conversions.append(loop.run_in_executor(executor, convert, result["filename"]))
+        await asyncio.gather(*conversions)
+
+    """
+    def __init__(self, bucket_arn, raw_data_dir="../raw_data", csp_storage='s3', max_in_flight=8, chunk_mb=8,
+                 queue_blocks=4, endpoint_url=None, client=None, progress=None):
+        """
+        Args:
+            bucket_arn (str): Cloud bucket's Amazon Resource Name (ARN).
+                              Options: 'noaa-ufs-regtests-pds', 'noaa-ufs-land-da-pds',
+                              'noaa-ufs-srw-pds'
+
+            raw_data_dir (str): Directory to save downloaded files.
+                                Default: "../raw_data"
+
+            csp_storage (str): Cloud service providers storage name.
+                               Default is 's3'
+
+            max_in_flight (int): Number of requests in flight (i.e. objects streamed concurrently). Default: 8
+
+            chunk_mb (float): Size (in MB) of the blocks read from each object's stream. Default: 8
+
+            queue_blocks (int): Number of blocks queued per object for the writer. Once full, the object's stream
+                                waits for the writer. Default: 4
+
+            endpoint_url (str): URL of the storage endpoint (e.g. a local S3 stand-in such as moto).
+                                Default: None (the cloud service provider's endpoint)
+
+            client (object): Existing aiobotocore client to reuse (e.g. shared across downloaders). Default: None
+                             (a pooled client is created upon entering the downloader's context)
+
+            progress (function): Progress callback, called w/ the object's key, the bytes downloaded so far & the
+                                 object's size after each block (see progress_printer()). It is called from the event
+                                 loop, so it must not block. Default: None
+
+        """
+        self.bucket_arn = bucket_arn
+        self.raw_data_dir = raw_data_dir
+        self.csp_storage = csp_storage
+        self.max_in_flight = max_in_flight
+        self.chunk_size = int(chunk_mb*1024**2)
+        self.queue_blocks = queue_blocks
+        self.endpoint_url = endpoint_url
+        self.client = client
+        self.progress = progress
+        self.exit_stack = None
+        self.semaphore = None
+
+        # Create directory for storing raw files
+        try:
+            os.makedirs(self.raw_data_dir)
+        except FileExistsError:
+            pass
+
+    async def __aenter__(self):
+        """
+        Create the pooled client (unless given) & the bound on the requests in flight.
+
+        Args:
+            None
+
+        Return (AsyncDownloadData): Downloader.
+
+        """
+        if self.client is None:
+            self.exit_stack = contextlib.AsyncExitStack()
+            config = AioConfig(max_pool_connections=max(self.max_in_flight, 10))
+            self.client = await self.exit_stack.enter_async_context(
+                get_session().create_client(self.csp_storage, endpoint_url=self.endpoint_url, config=config))
+        self.semaphore = asyncio.Semaphore(self.max_in_flight)
+
+        return self
+
+    async def __aexit__(self, *exc_info):
+        """
+        Close the pooled client (unless given).
+
+        Args:
+            exc_info (tuple): Exception raised within the downloader's context (if any).
+
+        Return: None
+
+        """
+        if self.exit_stack:
+            await self.exit_stack.aclose()
+            self.exit_stack, self.client = None, None
+
+        return
+
+    async def list_keys(self, prefix):
+        """
+        List the keys of the objects under a prefix.
+
+        Args:
+            prefix (str): Prefix of the objects' keys (e.g. "develop-20230222/INTEL/atmaero_control_p8_rad/").
+
+        Return (list): Keys of the objects.
+
+        """
+        keys = []
+        paginator = self.client.get_paginator('list_objects_v2')
+        async for page in paginator.paginate(Bucket=self.bucket_arn, Prefix=prefix):
+            keys.extend(obj['Key'] for obj in page.get('Contents', []) if not obj['Key'].endswith('/'))
+
+        return keys
+
+    async def name_objects(self, keys=None, prefix=None):
+        """
+        Name the file of each object to download.
+
+        Args:
+            keys (list): Keys of the objects. Each object is saved under its key's filename (see
+                         download_data.save_as_names()). Default: None
+
+            prefix (str): Prefix of the objects' keys. Each object is saved under its key's path relative
+                          to the prefix. Used when keys are not given. Default: None
+
+        Return (dict): Name (or relative path) to save each object as under the raw files' directory, per key.
+
+        """
+        if keys:
+            return save_as_names(keys)
+
+        return save_as_names(await self.list_keys(prefix), prefix)
+
+    async def write_blocks(self, queue, path):
+        """
+        Write the queued blocks of an object to disk off the event loop, until a None block is queued.
+        Once a write fails, the remaining blocks are drained & discarded until the None block. If the file cannot
+        be opened, the writer stops w/o draining the queue -- the object's stream stops waiting on the full queue
+        once the writer stops (see put_block()).
+
+        Args:
+            queue (Queue): Bounded queue of the object's blocks.
+
+            path (str): Path to write the object to.
+
+        Return: None
+
+        """
+        loop = asyncio.get_running_loop()
+        error = None
+        with open(path, 'wb') as f:
+            while True:
+                block = await queue.get()
+                if block is None:
+                    break
+                if error is None:
+                    try:
+                        await loop.run_in_executor(None, f.write, block)
+                    except Exception as e:
+                        error = e
+        if error:
+            raise error
+
+        return
+
+    async def put_block(self, queue, block, writer):
+        """
+        Queue a block for the writer, waiting while the queue is full. If the writer stops before the block is
+        queued (e.g. its file cannot be opened), the writer's exception is raised rather than waiting on the queue.
+
+        Args:
+            queue (Queue): Bounded queue of the object's blocks.
+
+            block (bytes): Block of the object (or None, once the object is streamed in full).
+
+            writer (Task): Writer of the queued blocks (see write_blocks()).
+
+        Return: None
+
+        """
+        put = asyncio.ensure_future(queue.put(block))
+        await asyncio.wait({put, writer}, return_when=asyncio.FIRST_COMPLETED)
+        if not put.done():
+            put.cancel()
+            writer.result()
+            raise IOError("The writer stopped before the object was written in full.")
+
+        return
+
+    async def download_object(self, obj_key, save_as_fn):
+        """
+        Stream a single object to disk. The object is written to a partial file, which replaces the file
+        once the object is downloaded in full.
+
+        Args:
+            obj_key (str): Key of the object in cloud storage.
+
+            save_as_fn (str): Name (or relative path) to save downloaded file as under the raw files' directory.
+
+        Return (dict): Result of the download holding its "key", "filename", "status" ("success" or "failed"),
+        "fetch" ("downloaded"), "error", "bytes" & "seconds" (as per BulkDownloadData.download_object()).
+
+        """
+        filename = f"{self.raw_data_dir}/{save_as_fn}"
+        part_path = f"{filename}.part"
+        result = {"key": obj_key, "filename": filename, "status": "failed", "fetch": None, "error": None, "bytes": 0, "seconds": 0.0}
+        start_t = time.time()
+        try:
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+            async with self.semaphore:
+                response = await self.client.get_object(Bucket=self.bucket_arn, Key=obj_key)
+                size = response['ContentLength']
+
+                # Stream the blocks to the writer. Each put waits while the queue is full, unless the writer stops.
+                queue = asyncio.Queue(maxsize=self.queue_blocks)
+                writer = asyncio.create_task(self.write_blocks(queue, part_path))
+                nbytes = 0
+                try:
+                    while True:
+                        block = await response['Body'].read(self.chunk_size)
+                        if not block:
+                            break
+                        await self.put_block(queue, block, writer)
+                        nbytes += len(block)
+                        if self.progress:
+                            self.progress(obj_key, nbytes, size)
+                finally:
+                    response['Body'].close()
+                    if not writer.done():
+                        await self.put_block(queue, None, writer)
+                    await writer
+
+            # Validate the download
+            if nbytes != size:
+                raise IOError(f"Downloaded size of {obj_key} ({nbytes} bytes) does not match its size ({size} bytes).")
+            os.replace(part_path, filename)
+            result.update({"status": "success", "fetch": "downloaded", "bytes": nbytes})
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+            if os.path.isfile(part_path):
+                os.remove(part_path)
+
+        # Downloads cancelled by the orchestrator leave no partial file behind
+        except asyncio.CancelledError:
+            if os.path.isfile(part_path):
+                os.remove(part_path)
+            raise
+        result["seconds"] = time.time()-start_t
+
+        return result
+
+    async def as_completed(self, keys=None, prefix=None):
+        """
+        Download the objects of interest concurrently & yield the result of each object once downloaded,
+        so its conversion may start while the remaining objects download.
+
+        Args:
+            keys (list): Keys of the objects (see name_objects()). Default: None
+
+            prefix (str): Prefix of the objects' keys (see name_objects()). Default: None
+
+        Return (AsyncGenerator): Result per object (see download_object()), in order of completion.
+
+        """
+        save_as = await self.name_objects(keys, prefix)
+        tasks = [asyncio.create_task(self.download_object(key, fn)) for key, fn in save_as.items()]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def download(self, keys=None, prefix=None):
+        """
+        Download the objects of interest concurrently.
+
+        Args:
+            keys (list): Keys of the objects (see name_objects()). Default: None
+
+            prefix (str): Prefix of the objects' keys (see name_objects()). Default: None
+
+        Return (list): Result per object (see download_object()).
+
+        """
+        start_t = time.time()
+        results = []
+        async for result in self.as_completed(keys, prefix):
+            if result["status"] == "success":
+                print(f"- {result['key']} ... {result['fetch'].capitalize()} ({result['bytes']/1024**2:.1f} MB, {result['seconds']:.1f} s).")
+            else:
+                print(f"- {result['key']} ... FAILED. REASON: {result['error']}")
+            results.append(result)
+
+        # Calculate aggregate bandwidth
+        delta_t = time.time()-start_t
+        total_mb = sum(r["bytes"] for r in results)/1024**2
+        n_failed = sum(r["status"] != "success" for r in results)
+        print(f"\n{len(results)-n_failed} of {len(results)} object(s) downloaded to {self.raw_data_dir} ({total_mb:.1f} MB).")
+        print(f"Processing time: {delta_t/60} min. Bandwidth: {total_mb/max(delta_t, 1e-9):.2f} MB/s\n")
+
+        return results
+
+    def run(self, keys=None, prefix=None):
+        """
+        Download the objects of interest concurrently w/in a new event loop (e.g. from a script).
+
+        Args:
+            keys (list): Keys of the objects (see name_objects()). Default: None
+
+            prefix (str): Prefix of the objects' keys (see name_objects()). Default: None
+
+        Return (list): Result per object (see download_object()).
+
+        """
+        async def run_downloads():
+            async with self:
+                return await self.download(keys, prefix)
+
+        return asyncio.run(run_downloads())
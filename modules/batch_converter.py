@@ -0,0 +1,237 @@
+import io
+import os
+import glob
+import json
+import time
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from .data_converter import DataConverter
+from .run_manifest import ConversionResult, RunManifest
+
+# File extensions of GRIB files (in addition to .GrbF##)
+GRIB_EXTENSIONS = ('.grb', '.grib', '.grb2', '.grib2')
+
+
+def is_grib(filename):
+    """
+    Determine whether a file is GRIB based on its file extension (e.g. .grb, .GrbF##).
+
+    Args:
+        filename (str): Name of the file.
+
+    Return (bool): True if the file is GRIB.
+
+    """
+    ext = os.path.splitext(filename)[1].lower()
+
+    return ext in GRIB_EXTENSIONS or ext.startswith('.grbf')
+
+
+def read_manifest(manifest_path):
+    """
+    Read a batch manifest.
+
+    Args:
+        manifest_path (str): Path of the manifest. A JSON-lines file w/ one job per line, for example:
+                             {"filename": "sfcf024.tile6.nc", "filename2save": "sfcf024.tile6", "refactor_variables": ["grid_xt", "grid_yt"]}
+                             {"filename": "GFSFLX.GrbF00", "grb_dict": {"typeOfLevel": "surface"}}
+                             {"filename": "GFSPRS.GrbF24", "all_hypercubes": true}
+                             "filename2save" defaults to the filename w/o its extension.
+
+    Return (list): Job per file.
+
+    """
+    jobs = []
+    with open(manifest_path) as f:
+        for line in f:
+            if line.strip():
+                jobs.append(json.loads(line))
+
+    return jobs
+
+
+def glob_jobs(pattern, raw_data_dir="../raw_data", refactor_variables=None, grb_dict=None, all_hypercubes=False):
+    """
+    Create a job per file matching a glob pattern.
+
+    Args:
+        pattern (str): Glob pattern of the files of interest under the location of the raw (unprocessed)
+                       files (e.g. "gfs_data.tile*.nc").
+
+        raw_data_dir (str): Location of the raw (unprocessed) files. Default: "../raw_data"
+
+        refactor_variables (list): netCDF only. Variables in need of refactoring, shared by all files. Default: None
+
+        grb_dict (dict): GRIB only. GRIB key-value pairs to filter by, shared by all files. Default: None
+
+        all_hypercubes (bool): GRIB only. Convert every hypercube of each GRIB file. Default: False
+
+    Return (list): Job per file.
+
+    """
+    jobs = []
+    for path in sorted(glob.glob(f'{raw_data_dir}/{pattern}')):
+        jobs.append({"filename": os.path.basename(path),
+                     "refactor_variables": refactor_variables,
+                     "grb_dict": grb_dict or {},
+                     "all_hypercubes": all_hypercubes})
+
+    return jobs
+
+
+def convert_file(job, converter_kwargs={}, nc2zarr_kwargs={}):
+    """
+    Convert a single file of a batch to Zarr. Executed within a worker process.
+
+    Args:
+        job (dict): Job of the file (see read_manifest()).
+
+        converter_kwargs (dict): Keyword arguments to DataConverter (e.g. raw_data_dir, zarr_data_dir, profile,
+                                 manifest_path).
+
+        nc2zarr_kwargs (dict): netCDF only. Keyword arguments to DataConverter.convert_nc2zarr() (e.g. stream).
+
+    Return (dict): Result of the file's conversion holding its "filename", "status" ("success" or "failed"),
+    "error", "seconds", "bytes_in" & "log" (the conversion's printed output).
+
+    """
+    filename = job["filename"]
+    filename2save = job.get("filename2save") or os.path.splitext(filename)[0]
+    raw_data_dir = converter_kwargs.get("raw_data_dir", "../raw_data")
+
+    result = {"filename": filename, "status": "failed", "error": None, "seconds": 0.0, "bytes_in": 0, "log": ""}
+    start_t = time.time()
+    log = io.StringIO()
+    try:
+        result["bytes_in"] = os.path.getsize(f'{raw_data_dir}/{filename}')
+
+        # Capture the conversion's printed output, so the workers' outputs do not interleave
+        with contextlib.redirect_stdout(log):
+            dc_wrapper = DataConverter(filename, job.get("refactor_variables"), **converter_kwargs)
+            if is_grib(filename) and job.get("all_hypercubes"):
+                dc_wrapper.convert_grb2zarr_all(filename2save)
+            elif is_grib(filename):
+                dc_wrapper.convert_grb2zarr(filename2save, job.get("grb_dict") or {})
+            else:
+                dc_wrapper.convert_nc2zarr(filename2save, **nc2zarr_kwargs)
+
+        # The converters record the result of each conversion (rather than raise) in the run manifest.
+        # Streamed & memory-mapped conversions return None, so the status is taken from the records.
+        failed = dc_wrapper.run_manifest.failed()
+        if dc_wrapper.run_manifest.results and not failed:
+            result["status"] = "success"
+        elif failed:
+            result["error"] = "; ".join(f"{r.error_type or 'Error'}: {r.error}" for r in failed)
+        elif dc_wrapper.error is not None:
+            error = dc_wrapper.error
+            result["error"] = f"{type(error).__name__}: {error}" if isinstance(error, Exception) else str(error)
+        else:
+            result["error"] = "Conversion to Zarr did not complete. Refer to the conversion's log."
+
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    result["seconds"] = time.time()-start_t
+    result["log"] = log.getvalue()
+
+    return result
+
+
+class BatchConverter():
+    """
+
+    Converts many netCDF & GRIB files to Zarr across a bounded pool of processes.
+
+    """
+    def __init__(self, jobs, max_workers=4, converter_kwargs={}, nc2zarr_kwargs={}):
+        """
+        Args:
+            jobs (list): Job per file (see read_manifest() & glob_jobs()).
+
+            max_workers (int): Number of files converted concurrently. Default: 4
+
+            converter_kwargs (dict): Keyword arguments to DataConverter (e.g. raw_data_dir, zarr_data_dir, profile).
+                                     Default: {}
+
+            nc2zarr_kwargs (dict): netCDF only. Keyword arguments to DataConverter.convert_nc2zarr() (e.g. stream).
+                                   Default: {}
+
+        """
+        self.jobs = jobs
+        self.max_workers = max_workers
+        self.converter_kwargs = converter_kwargs
+        self.nc2zarr_kwargs = nc2zarr_kwargs
+        self.wall_seconds = 0.0
+
+    def run(self):
+        """
+        Convert every file of the batch. A failed file does not prevent the remaining files
+        from being converted.
+
+        Args:
+            None
+
+        Return (list): Result per file (see convert_file()).
+
+        """
+        start_t = time.time()
+        results = []
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(convert_file, job, self.converter_kwargs, self.nc2zarr_kwargs): job
+                       for job in self.jobs}
+
+            for future in as_completed(futures):
+                job = futures[future]
+
+                # A worker process which crashed is reported as a failed file & recorded in the run manifest
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {"filename": job["filename"], "status": "failed", "error": f"{type(e).__name__}: {e}",
+                              "seconds": 0.0, "bytes_in": 0, "log": ""}
+                    raw_data_dir = self.converter_kwargs.get("raw_data_dir", "../raw_data")
+                    RunManifest(self.converter_kwargs.get("manifest_path")).record(
+                        ConversionResult(f'{raw_data_dir}/{job["filename"]}', None, start_t, e))
+
+                if result["status"] == "success":
+                    print(f"- {result['filename']} ... Completed ({result['seconds']:.1f} s).")
+                else:
+                    print(f"- {result['filename']} ... FAILED. REASON: {result['error']}\n{result['log']}")
+                results.append(result)
+
+        self.wall_seconds = time.time()-start_t
+
+        return results
+
+    def print_report(self, results, n_slowest=5):
+        """
+        Print the batch's aggregate throughput.
+
+        Args:
+            results (list): Result per file (see run()).
+
+            n_slowest (int): Number of slowest files to list. Default: 5
+
+        Return: None
+
+        """
+        succeeded = [r for r in results if r["status"] == "success"]
+        failed = [r for r in results if r["status"] != "success"]
+        mb_in = sum(r["bytes_in"] for r in succeeded)/1024**2
+        wall_seconds = max(self.wall_seconds, 1e-9)
+
+        print("\n== Batch Conversion Report ==\n")
+        print(f"Files: {len(results)} ({len(succeeded)} succeeded, {len(failed)} failed)")
+        print(f"Wall Time: {wall_seconds/60} min.")
+        print(f"Throughput: {len(succeeded)/wall_seconds:.3f} files/s, {mb_in/wall_seconds:.2f} MB/s")
+
+        print("\n== Slowest File(s) ==\n")
+        for r in sorted(results, key=lambda r: r["seconds"], reverse=True)[:n_slowest]:
+            print(f"- {r['filename']}  {r['seconds']:.1f} s  {r['bytes_in']/1024**2:.1f} MB  {r['status']}")
+
+        if failed:
+            print("\n== Failed File(s) ==\n")
+            for r in failed:
+                print(f"- {r['filename']}  {r['error']}")
+
+        return
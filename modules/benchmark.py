@@ -0,0 +1,452 @@
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import resource
+import contextlib
+import subprocess
+import numpy as np
+from .run_manifest import path_size
+
+# Benchmark cases. Each case runs in its own process, so its peak RSS is measured in isolation.
+# - "nc2zarr-tile": Cubed-sphere tile (e.g. gfs_data.tile1.nc) to Zarr, streamed chunk by chunk.
+# - "nc2zarr-nc4": nc4 aerosol file (e.g. gocart.inst_aod.nc4) to Zarr.
+# - "nc2zarr-classic" & "nc2zarr-classic-mmap": Classic (64-bit offset) netCDF file (e.g. gfs_ctrl.nc) to Zarr, loaded into
+#   memory via the netCDF4 library & memory-mapped, respectively.
+# - "nc2zarr-s3-classic-mmap": Classic netCDF file streamed from a local S3 stand-in (moto) to Zarr via S3StreamConverter
+#   w/ memory mapping requested, which does not apply to cloud objects -- the object is streamed as usual.
+# - "grb2zarr-<typeOfLevel>": Hypercube of a multi-hypercube GRIB file (e.g. GFSPRS.GrbF##) to Zarr.
+# - "load-zarr-cold" & "load-zarr-warm": Region of several variables loaded via LoadZarrData, w/ an empty & a warm chunk cache.
+# - "zarr2nc": Tile's Zarr back to netCDF.
+# - "cli-startup": Startup of each CLI subcommand (its "--help"), which fails if it exceeds the startup budget or imports a heavy module.
+CASES = ('nc2zarr-tile', 'nc2zarr-nc4', 'nc2zarr-classic', 'nc2zarr-classic-mmap', 'nc2zarr-s3-classic-mmap', 'grb2zarr-isobaricInhPa', 'grb2zarr-surface', 'load-zarr-cold', 'load-zarr-warm', 'zarr2nc', 'cli-startup')
+
+# Names of the synthetic inputs
+TILE_FILENAME = 'bench_gfs_data.tile1.nc'
+NC4_FILENAME = 'bench_gocart.inst_aod.nc4'
+CLASSIC_FILENAME = 'bench_gfs_ctrl.nc'
+GRB_FILENAME = 'bench_GFSPRS.GrbF00'
+
+
+def smooth_field(rng, shape):
+    """
+    Synthesize a smooth field w/ small scale noise, which compresses alike model output
+    (rather than white noise, which does not compress).
+
+    Args:
+        rng (Generator): NumPy random generator.
+
+        shape (tuple): Shape of the field. The last two axes are the horizontal grid.
+
+    Return (ndarray): Float32 field.
+
+    """
+    ny, nx = shape[-2:]
+    y, x = np.meshgrid(np.linspace(0, np.pi, ny, dtype=np.float32), np.linspace(0, 2*np.pi, nx, dtype=np.float32), indexing='ij')
+    base = np.sin(y)*np.cos(3*x)
+    field = base + np.float32(0.01)*rng.standard_normal(shape, dtype=np.float32)
+
+    return field.astype(np.float32)
+
+
+def make_tile(raw_data_dir, res=96, levels=64):
+    """
+    Synthesize a cubed-sphere tile file resembling an FV3 cold start file (e.g. gfs_data.tile1.nc).
+
+    Args:
+        raw_data_dir (str): Location to save the file under.
+
+        res (int): Number of grid points along each side of the tile (e.g. 96 for C96). Default: 96
+
+        levels (int): Number of vertical levels. Default: 64
+
+    Return (str): Name of the file.
+
+    """
+    import xarray as xr
+    rng = np.random.default_rng(0)
+    data_vars = {'geolon': (('lat', 'lon'), 360*smooth_field(rng, (res, res))),
+                 'geolat': (('lat', 'lon'), 90*smooth_field(rng, (res, res))),
+                 'ps': (('lat', 'lon'), 1e5+1e3*smooth_field(rng, (res, res)))}
+    for name in ('t', 'sphum', 'o3mr', 'u_w', 'v_s'):
+        data_vars[name] = (('lev', 'lat', 'lon'), smooth_field(rng, (levels, res, res)))
+    xr.Dataset(data_vars).to_netcdf(f'{raw_data_dir}/{TILE_FILENAME}', format='NETCDF4')
+
+    return TILE_FILENAME
+
+
+def make_classic(raw_data_dir, res=96, levels=64):
+    """
+    Synthesize a classic (64-bit offset) netCDF file of the same variables as the cubed-sphere tile file
+    (see make_tile()), alike the classic inputs (e.g. gfs_ctrl.nc & some oro_data files).
+
+    Args:
+        raw_data_dir (str): Location to save the file under.
+
+        res (int), levels (int): Tile's resolution & number of vertical levels (see make_tile()).
+
+    Return (str): Name of the file.
+
+    """
+    import xarray as xr
+    make_tile(raw_data_dir, res, levels)
+    with xr.open_dataset(f'{raw_data_dir}/{TILE_FILENAME}') as tile_xr:
+        tile_xr.to_netcdf(f'{raw_data_dir}/{CLASSIC_FILENAME}', format='NETCDF3_64BIT')
+
+    return CLASSIC_FILENAME
+
+
+def make_nc4(raw_data_dir, size_mb=64):
+    """
+    Synthesize an nc4 aerosol file resembling a GOCART file (e.g. gocart.inst_aod.20210323_0600z.nc4).
+
+    Args:
+        raw_data_dir (str): Location to save the file under.
+
+        size_mb (float): Uncompressed size (in MB) of the file's data. Default: 64
+
+    Return (str): Name of the file.
+
+    """
+    import xarray as xr
+    rng = np.random.default_rng(1)
+    names, levels = ('DU', 'SS', 'SU', 'OC', 'BC'), 72
+
+    # Size the global lat-lon grid (w/ twice as many longitudes as latitudes) to the size of interest
+    nlat = max(2, int((size_mb*1024**2/(len(names)*levels*4*2))**0.5))
+    coords = {'time': [0], 'lev': np.arange(1, levels+1), 'lat': np.linspace(-90, 90, nlat),
+              'lon': np.linspace(-180, 180, 2*nlat, endpoint=False)}
+    data_vars = {name: (('time', 'lev', 'lat', 'lon'), np.abs(smooth_field(rng, (1, levels, nlat, 2*nlat)))) for name in names}
+    data_xr = xr.Dataset(data_vars, coords=coords)
+    data_xr['time'].attrs['units'] = 'minutes since 2021-03-23 06:00:00'
+    data_xr.to_netcdf(f'{raw_data_dir}/{NC4_FILENAME}', format='NETCDF4',
+                      encoding={name: {'zlib': True, 'complevel': 1} for name in names})
+
+    return NC4_FILENAME
+
+
+def make_grib(raw_data_dir, nlat=181, levels=31):
+    """
+    Synthesize a GRIB file featuring multiple hypercubes (i.e. an isobaricInhPa & a surface hypercube), alike
+    GFSPRS.GrbF##. Requires ecCodes.
+
+    Args:
+        raw_data_dir (str): Location to save the file under.
+
+        nlat (int): Number of latitudes of the global lat-lon grid (w/ twice as many longitudes). Default: 181
+
+        levels (int): Number of pressure levels. Default: 31
+
+    Return (str): Name of the file.
+
+    """
+    import xarray as xr
+    from cfgrib.xarray_to_grib import to_grib
+    rng = np.random.default_rng(2)
+    coords = {'latitude': np.linspace(90, -90, nlat), 'longitude': np.linspace(0, 360, 2*nlat, endpoint=False)}
+
+    # Isobaric hypercube
+    isobaric_xr = xr.Dataset({name: (('isobaricInhPa', 'latitude', 'longitude'), smooth_field(rng, (levels, nlat, 2*nlat)),
+                                     {'GRIB_shortName': name})
+                              for name in ('t', 'u', 'v', 'gh')},
+                             coords={'isobaricInhPa': np.linspace(1000, 100, levels), **coords})
+    to_grib(isobaric_xr, f'{raw_data_dir}/{GRB_FILENAME}', mode='wb', no_warn=True,
+            grib_keys={'typeOfLevel': 'isobaricInhPa', 'gridType': 'regular_ll'})
+
+    # Surface hypercube, appended to the same file
+    surface_xr = xr.Dataset({name: (('latitude', 'longitude'), smooth_field(rng, (nlat, 2*nlat)), {'GRIB_shortName': name})
+                             for name in ('sp', 't', 'orog')}, coords=coords)
+    to_grib(surface_xr, f'{raw_data_dir}/{GRB_FILENAME}', mode='ab', no_warn=True,
+            grib_keys={'typeOfLevel': 'surface', 'gridType': 'regular_ll'})
+
+    return GRB_FILENAME
+
+
+@contextlib.contextmanager
+def moto_bucket(path, bucket_arn='bench-bucket'):
+    """
+    Serve a file as an object of a bucket on a local S3 stand-in (moto server) for the duration of the context.
+
+    Args:
+        path (str): Path of the file to upload.
+
+        bucket_arn (str): Name of the bucket. Default: 'bench-bucket'
+
+    Return (tuple): Bucket's name, object's key & the stand-in's endpoint URL.
+
+    """
+    import socket
+    import boto3
+    from moto.server import ThreadedMotoServer
+
+    # Credentials of the stand-in, so the clients never reach the cloud service provider
+    for key, value in (('AWS_ACCESS_KEY_ID', 'testing'), ('AWS_SECRET_ACCESS_KEY', 'testing'), ('AWS_DEFAULT_REGION', 'us-east-1')):
+        os.environ.setdefault(key, value)
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    server = ThreadedMotoServer(ip_address='127.0.0.1', port=port, verbose=False)
+    server.start()
+    try:
+        endpoint_url = f'http://127.0.0.1:{port}'
+        client = boto3.client('s3', endpoint_url=endpoint_url)
+        client.create_bucket(Bucket=bucket_arn)
+        client.upload_file(path, bucket_arn, os.path.basename(path))
+        yield bucket_arn, os.path.basename(path), endpoint_url
+    finally:
+        server.stop()
+
+
+def synthesize(work_dir="../benchmark_data", res=96, levels=64, nc4_mb=64, grb_nlat=181, regenerate=False):
+    """
+    Synthesize the benchmark's inputs under <work_dir>/raw_data. Existing inputs are reused, unless regenerated.
+
+    Args:
+        work_dir (str): Location of the benchmark's inputs & outputs. Default: "../benchmark_data"
+
+        res (int), levels (int): Tile's resolution & number of vertical levels (see make_tile()).
+
+        nc4_mb (float): Uncompressed size (in MB) of the nc4 aerosol file (see make_nc4()). Default: 64
+
+        grb_nlat (int): Number of latitudes of the GRIB's grid (see make_grib()). Default: 181
+
+        regenerate (bool): Regenerate existing inputs (e.g. after changing their size). Default: False
+
+    Return (dict): Error per input which could not be synthesized (e.g. GRIB w/o ecCodes).
+
+    """
+    raw_data_dir = f'{work_dir}/raw_data'
+    try:
+        os.makedirs(raw_data_dir)
+    except FileExistsError:
+        pass
+
+    errors = {}
+    for filename, make in ((TILE_FILENAME, lambda: make_tile(raw_data_dir, res, levels)),
+                           (NC4_FILENAME, lambda: make_nc4(raw_data_dir, nc4_mb)),
+                           (CLASSIC_FILENAME, lambda: make_classic(raw_data_dir, res, levels)),
+                           (GRB_FILENAME, lambda: make_grib(raw_data_dir, grb_nlat))):
+        if os.path.exists(f'{raw_data_dir}/{filename}') and not regenerate:
+            continue
+        try:
+            make()
+            print(f"\nSynthesized {filename} ({path_size(f'{raw_data_dir}/{filename}')/1024**2:.1f} MB).")
+        except Exception as e:
+            errors[filename] = f"{type(e).__name__}: {e}"
+            print(f"\n{filename} Not Synthesized. REASON: {type(e).__name__}: {e}")
+
+    return errors
+
+
+def run_case(case, work_dir="../benchmark_data", profile=None, compressor=None, clevel=None, num_workers=4):
+    """
+    Run a benchmark case within the current process. Called by run_isolated() within a fresh process.
+
+    Args:
+        case (str): Benchmark case (see CASES).
+
+        work_dir (str): Location of the benchmark's inputs & outputs. Default: "../benchmark_data"
+
+        profile (str), compressor (str), clevel (int): Zarr's chunking & compression (see DataConverter).
+
+        num_workers (int): Number of chunks read & written concurrently. Default: 4
+
+    Return (dict): Case's "input_mb" & "output_mb" (the data read & written; for loads, the data loaded), "wall_s", "peak_rss_mb", "status" & "error".
+
+    """
+    if case == 'cli-startup':
+        return run_startup()
+
+    from .data_converter import DataConverter
+    from .load_zarr_data import LoadZarrData
+    from .zarr2nc import Zarr2NC
+
+    raw_data_dir, zarr_data_dir, nc_data_dir = f'{work_dir}/raw_data', f'{work_dir}/zarr_data', f'{work_dir}/nc_data'
+    zarr_kwargs = {'profile': profile, 'compressor': compressor, 'clevel': clevel}
+    tile_store = os.path.splitext(TILE_FILENAME)[0]
+
+    # Inputs & outputs of the case. Outputs of a previous run are removed, so each run writes from scratch.
+    if case == 'nc2zarr-tile':
+        input_path, output_path = f'{raw_data_dir}/{TILE_FILENAME}', f'{zarr_data_dir}/{tile_store}.zarr'
+    elif case == 'nc2zarr-nc4':
+        input_path, output_path = f'{raw_data_dir}/{NC4_FILENAME}', f'{zarr_data_dir}/{os.path.splitext(NC4_FILENAME)[0]}.zarr'
+    elif case.startswith('nc2zarr-classic') or case == 'nc2zarr-s3-classic-mmap':
+        input_path, output_path = f'{raw_data_dir}/{CLASSIC_FILENAME}', f'{zarr_data_dir}/{os.path.splitext(CLASSIC_FILENAME)[0]}.zarr'
+    elif case.startswith('grb2zarr-'):
+        input_path, output_path = f'{raw_data_dir}/{GRB_FILENAME}', f'{zarr_data_dir}/{GRB_FILENAME}_typeOfLevel{case[9:]}.zarr'
+    elif case.startswith('load-zarr-'):
+        input_path, output_path = f'{zarr_data_dir}/{tile_store}.zarr', None
+    elif case == 'zarr2nc':
+        input_path, output_path = f'{zarr_data_dir}/{tile_store}.zarr', f'{nc_data_dir}/{tile_store}.nc'
+    else:
+        raise ValueError(f"Unknown benchmark case: {case}. Options: {CASES}")
+    if output_path and os.path.isdir(output_path):
+        shutil.rmtree(output_path)
+    elif output_path and os.path.exists(output_path):
+        os.remove(output_path)
+
+    # Run the case w/ the converters' notifications silenced
+    converter, error, input_mb = None, None, None
+    start_t = time.time()
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            if case.startswith('nc2zarr-classic'):
+                converter = DataConverter(CLASSIC_FILENAME, None, raw_data_dir, zarr_data_dir, **zarr_kwargs)
+                converter.convert_nc2zarr(os.path.basename(output_path)[:-5], num_workers=num_workers, mmap=case.endswith('-mmap'))
+            elif case == 'nc2zarr-s3-classic-mmap':
+                from .s3_stream_converter import S3StreamConverter
+                with moto_bucket(input_path) as (bucket_arn, obj_key, endpoint_url):
+                    converter = S3StreamConverter(bucket_arn, obj_key, zarr_data_dir=zarr_data_dir, endpoint_url=endpoint_url, **zarr_kwargs)
+                    converter.convert_nc2zarr(os.path.basename(output_path)[:-5], stream=True, num_workers=num_workers, mmap=True)
+            elif case.startswith('nc2zarr-'):
+                converter = DataConverter(os.path.basename(input_path), None, raw_data_dir, zarr_data_dir, **zarr_kwargs)
+                converter.convert_nc2zarr(os.path.basename(output_path)[:-5], stream=True, num_workers=num_workers)
+            elif case.startswith('grb2zarr-'):
+                converter = DataConverter(GRB_FILENAME, None, raw_data_dir, zarr_data_dir, **zarr_kwargs)
+                converter.convert_grb2zarr(GRB_FILENAME, {'typeOfLevel': case[9:]})
+            elif case.startswith('load-zarr-'):
+                loader = LoadZarrData(tile_store, zarr_dir=zarr_data_dir)
+                variables, region = ['t', 'sphum', 'ps'], {'lev': slice(0, 8)}
+                if case == 'load-zarr-warm':
+                    loader.load(variables, isel=region)
+                    start_t = time.time()
+                input_mb = loader.load(variables, isel=region).nbytes/1024**2
+            else:
+                converter = Zarr2NC(zarr_data_dir, nc_data_dir)
+                converter.convert_zarr2nc(tile_store, num_workers=num_workers)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+    wall_s = time.time()-start_t
+
+    # The converters report their failures via the run manifest
+    if converter is not None and converter.run_manifest.failed():
+        error = converter.run_manifest.failed()[0].error
+    if input_mb is None:
+        input_mb = path_size(input_path)/1024**2
+
+    # Peak resident set size of the process (ru_maxrss is in KB on Linux & in bytes on macOS)
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_rss_mb = peak_rss/1024**2 if sys.platform == 'darwin' else peak_rss/1024
+
+    return {"case": case, "input_mb": input_mb, "output_mb": path_size(output_path)/1024**2 if output_path and error is None else 0,
+            "wall_s": wall_s, "mb_per_s": input_mb/wall_s if wall_s > 0 and error is None else 0,
+            "peak_rss_mb": peak_rss_mb, "status": "failed" if error else "success", "error": str(error) if error else None}
+
+
+def run_startup(budget_s=None):
+    """
+    Run the "cli-startup" case: measure the startup of each CLI subcommand in a fresh process (see measure_startup()).
+
+    Args:
+        budget_s (float): Startup budget (in seconds) per subcommand. Default: None (STARTUP_BUDGET_S)
+
+    Return (dict): Case's result (see run_case()). "wall_s" is the slowest subcommand's startup & "peak_rss_mb" the
+    largest peak RSS of the subcommands' processes. The case fails if a subcommand exceeds the budget or imports a heavy module.
+
+    """
+    from .data_converter_cli import SUBCOMMANDS, STARTUP_BUDGET_S, measure_startup
+
+    budget_s = STARTUP_BUDGET_S if budget_s is None else budget_s
+    startups = [measure_startup(subcommand) for subcommand in SUBCOMMANDS]
+    errors = [f"{startup['subcommand']} imports {', '.join(startup['heavy_modules'])}" for startup in startups if startup['heavy_modules']]
+    errors += [f"{startup['subcommand']} starts in {startup['wall_s']:.3f} s (budget: {budget_s} s)" for startup in startups if startup['wall_s'] > budget_s]
+
+    # Peak resident set size of the largest child process (ru_maxrss is in KB on Linux & in bytes on macOS)
+    peak_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    peak_rss_mb = peak_rss/1024**2 if sys.platform == 'darwin' else peak_rss/1024
+
+    return {"case": "cli-startup", "input_mb": 0, "output_mb": 0, "wall_s": max(startup['wall_s'] for startup in startups),
+            "mb_per_s": 0, "peak_rss_mb": peak_rss_mb, "status": "failed" if errors else "success",
+            "error": "; ".join(errors) if errors else None}
+
+
+def run_isolated(case, work_dir="../benchmark_data", profile=None, compressor=None, clevel=None, num_workers=4):
+    """
+    Run a benchmark case within a fresh Python process, so its peak RSS & imports are measured in isolation.
+
+    Args:
+        case (str): Benchmark case (see CASES).
+
+        work_dir (str), profile (str), compressor (str), clevel (int), num_workers (int): See run_case().
+
+    Return (dict): Case's result (see run_case()).
+
+    """
+    kwargs = {'work_dir': os.path.abspath(work_dir), 'profile': profile, 'compressor': compressor,
+              'clevel': clevel, 'num_workers': num_workers}
+    code = f"import json, {__package__}.benchmark as benchmark; print(json.dumps(benchmark.run_case({case!r}, **json.loads({json.dumps(kwargs)!r}))))"
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join([os.path.dirname(os.path.dirname(os.path.abspath(__file__))), os.environ.get('PYTHONPATH', '')])}
+    proc = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, env=env)
+
+    # The result is the last line printed by the process
+    try:
+        return json.loads(proc.stdout.strip().splitlines()[-1])
+    except (IndexError, ValueError):
+        return {"case": case, "input_mb": 0, "output_mb": 0, "wall_s": 0, "mb_per_s": 0, "peak_rss_mb": 0,
+                "status": "failed", "error": proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"Exit code {proc.returncode}"}
+
+
+def run_suite(cases=CASES, work_dir="../benchmark_data", repeat=1, profile=None, compressor=None, clevel=None, num_workers=4):
+    """
+    Run the benchmark cases in order (e.g. the Zarr cases after the tile's conversion to Zarr).
+
+    Args:
+        cases (tuple): Benchmark cases to run (see CASES). Default: All cases
+
+        work_dir (str): Location of the benchmark's inputs & outputs. Default: "../benchmark_data"
+
+        repeat (int): Number of runs per case. The fastest run is kept. Default: 1
+
+        profile (str), compressor (str), clevel (int), num_workers (int): See run_case().
+
+    Return (dict): Benchmark's "meta" (host, versions & parameters) & "results" per case.
+
+    """
+    results = []
+    for case in cases:
+        runs = [run_isolated(case, work_dir, profile, compressor, clevel, num_workers) for _ in range(repeat)]
+        succeeded = [run for run in runs if run['status'] == "success"]
+        result = min(succeeded, key=lambda run: run['wall_s']) if succeeded else runs[-1]
+        results.append(result)
+        print(f"{case:24s} {result['status']:8s} {result['wall_s']:9.3f} s {result['mb_per_s']:9.1f} MB/s "
+              f"{result['peak_rss_mb']:9.1f} MB RSS {result['output_mb']:9.1f} MB out" + (f"  ({result['error']})" if result['error'] else ""))
+
+    meta = {"started": time.time(), "host": platform.node(), "platform": platform.platform(), "python": platform.python_version(),
+            "cpu_count": os.cpu_count(), "repeat": repeat, "profile": profile, "compressor": compressor, "clevel": clevel,
+            "num_workers": num_workers}
+
+    return {"meta": meta, "results": results}
+
+
+def compare(baseline, current, threshold=0.1):
+    """
+    Compare the results of two benchmark runs (e.g. before & after a change, or two compression choices).
+
+    Args:
+        baseline (dict): Baseline benchmark run (see run_suite()).
+
+        current (dict): Current benchmark run.
+
+        threshold (float): Relative increase in wall time or peak RSS flagged as a regression. Default: 0.1 (10%)
+
+    Return (list): Comparison per case shared by both runs: "case", "wall_s" & "peak_rss_mb" of both runs,
+    their ratios (current/baseline), "output_mb" of both runs & whether the case "regressed".
+
+    """
+    baseline_results = {result['case']: result for result in baseline['results']}
+    rows = []
+    for result in current['results']:
+        base = baseline_results.get(result['case'])
+        if base is None or base['status'] != "success" or result['status'] != "success":
+            continue
+        wall_ratio = result['wall_s']/base['wall_s'] if base['wall_s'] else float('inf')
+        rss_ratio = result['peak_rss_mb']/base['peak_rss_mb'] if base['peak_rss_mb'] else float('inf')
+        rows.append({"case": result['case'], "baseline_wall_s": base['wall_s'], "wall_s": result['wall_s'], "wall_ratio": wall_ratio,
+                     "baseline_peak_rss_mb": base['peak_rss_mb'], "peak_rss_mb": result['peak_rss_mb'], "rss_ratio": rss_ratio,
+                     "baseline_output_mb": base['output_mb'], "output_mb": result['output_mb'],
+                     "regressed": wall_ratio > 1+threshold or rss_ratio > 1+threshold})
+
+    return rows
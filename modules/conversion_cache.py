@@ -0,0 +1,274 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+from .run_manifest import path_size
+
+class ConversionCache():
+    """
+
+    Content-addressed cache of conversions, keyed by a fingerprint of the input file (size, modification time
+    & a hash of its header & sample blocks), the conversion's parameters (e.g. refactored variables, GRIB filter
+    keys, chunking & compression) & the output's path.
+
+    A conversion whose key matches a recorded output is not run again -- the existing Zarr store is returned as is,
+    as long as it has not been modified since. The recorded outputs are evicted least recently used first once they
+    exceed the cache's disk quota.
+
+    """
+    def __init__(self, cache_dir="../conversion_cache", quota_gb=None, header_mb=1, sample_blocks=16, block_kb=64):
+        """
+        Args:
+            cache_dir (str): Location of the cache's records. Default: "../conversion_cache"
+
+            quota_gb (float): Disk quota (in GB) of the recorded outputs. Once exceeded, the least recently used
+                              outputs are deleted (see evict()). Default: None (no quota)
+
+            header_mb (float): Size (in MB) of the input file's header hashed by its fingerprint. Default: 1
+
+            sample_blocks (int): Number of blocks sampled evenly across the input file by its fingerprint. Default: 16
+
+            block_kb (float): Size (in KB) of each sampled block. Default: 64
+
+        """
+        self.cache_dir = cache_dir
+        self.quota_gb = quota_gb
+        self.header_size = int(header_mb*1024**2)
+        self.sample_blocks = sample_blocks
+        self.block_size = int(block_kb*1024)
+
+        # Create directory for storing the cache's records
+        try:
+            os.makedirs(self.cache_dir)
+        except FileExistsError:
+            pass
+
+    def fingerprint(self, path):
+        """
+        Fingerprint of a file, which changes w/ its content w/o reading the entire file.
+
+        Args:
+            path (str): Path of the file.
+
+        Return (dict): File's "size", "mtime_ns" & "sample_hash" (BLAKE2 of its header & sample blocks).
+
+        """
+        stat = os.stat(path)
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as f:
+            digest.update(f.read(self.header_size))
+
+            # Sample blocks evenly spaced from the header's end to the file's end (incl. the last block)
+            start, stop = min(self.header_size, stat.st_size), max(stat.st_size-self.block_size, 0)
+            if stop > start:
+                for i in range(self.sample_blocks):
+                    f.seek(start + (stop-start)*i//max(self.sample_blocks-1, 1))
+                    digest.update(f.read(self.block_size))
+
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sample_hash": digest.hexdigest()}
+
+    def key(self, input_path, output_path, params):
+        """
+        Key of a conversion.
+
+        Args:
+            input_path (str): Path of the input file.
+
+            output_path (str): Path of the output (e.g. Zarr store).
+
+            params (dict): Parameters of the conversion which determine its output.
+
+        Return (str): Hexadecimal key.
+
+        """
+        content = {"input": self.fingerprint(input_path), "output": os.path.abspath(output_path), "params": params}
+
+        return hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()[:32]
+
+    def record_path(self, key):
+        """
+        Path of a conversion's record.
+
+        Args:
+            key (str): Key of the conversion.
+
+        Return (str): Path of the JSON record.
+
+        """
+        return f'{self.cache_dir}/{key}.json'
+
+    def read_record(self, path):
+        """
+        Read a conversion's record.
+
+        Args:
+            path (str): Path of the JSON record.
+
+        Return (dict): Record, or an empty dictionary if the record does not exist.
+
+        """
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def output_mtime(self, output_path):
+        """
+        Modification time of an output. For a Zarr store, its consolidated metadata is re-written by every
+        modification (e.g. an append).
+
+        Args:
+            output_path (str): Path of the output (e.g. Zarr store).
+
+        Return (int): Modification time (in ns), or None if the output does not exist.
+
+        """
+        for path in (f'{output_path}/.zmetadata', output_path):
+            if os.path.exists(path):
+                return os.stat(path).st_mtime_ns
+
+        return None
+
+    def lookup(self, key, output_path):
+        """
+        Check whether a conversion's output is recorded & unmodified since.
+
+        Args:
+            key (str): Key of the conversion.
+
+            output_path (str): Path of the output (e.g. Zarr store).
+
+        Return (bool): True if the output may be reused. The record is then marked as recently used.
+
+        """
+        path = self.record_path(key)
+        record = self.read_record(path)
+        if not record or record.get("output_mtime") != self.output_mtime(output_path):
+            return False
+
+        # Mark record as recently used
+        os.utime(path)
+
+        return True
+
+    def record(self, key, input_path, output_path, params):
+        """
+        Record a conversion's output, then evict the least recently used outputs beyond the quota (if any).
+
+        Args:
+            key (str): Key of the conversion.
+
+            input_path (str): Path of the input file.
+
+            output_path (str): Path of the output (e.g. Zarr store).
+
+            params (dict): Parameters of the conversion.
+
+        Return: None
+
+        """
+        record = {"key": key, "input": os.path.abspath(input_path), "output": os.path.abspath(output_path),
+                  "params": params, "bytes": path_size(output_path), "output_mtime": self.output_mtime(output_path),
+                  "recorded": time.time()}
+        path = self.record_path(key)
+        with open(f'{path}.tmp', 'w') as f:
+            json.dump(record, f, default=str)
+        os.replace(f'{path}.tmp', path)
+
+        if self.quota_gb is not None:
+            self.evict(keep=key)
+
+        return
+
+    def records(self):
+        """
+        Records of the cache, least recently used first.
+
+        Args:
+            None
+
+        Return (list): Records, each w/ its "last_used" time (seconds since the epoch).
+
+        """
+        records = []
+        for fn in os.listdir(self.cache_dir):
+            if not fn.endswith('.json'):
+                continue
+            path = f'{self.cache_dir}/{fn}'
+            record = self.read_record(path)
+            if record:
+                try:
+                    record["last_used"] = os.path.getmtime(path)
+                except FileNotFoundError:
+                    continue
+                records.append(record)
+
+        return sorted(records, key=lambda record: record["last_used"])
+
+    def evict(self, quota_gb=None, keep=None, dry_run=False):
+        """
+        Drop the records of outputs which were removed or modified since (their outputs are left untouched),
+        then delete the least recently used outputs until the recorded outputs are within the quota.
+
+        Args:
+            quota_gb (float): Disk quota (in GB). Default: None (the cache's quota, if any)
+
+            keep (str): Key of a conversion whose output must not be evicted. Default: None
+
+            dry_run (bool): Only list the outputs which would be evicted. Default: False
+
+        Return (list): Evicted records.
+
+        """
+        quota_gb = self.quota_gb if quota_gb is None else quota_gb
+
+        # Drop the stale records
+        records = []
+        for record in self.records():
+            if record.get("output_mtime") == self.output_mtime(record["output"]):
+                records.append(record)
+            elif not dry_run:
+                self.remove(record, output=False)
+        if quota_gb is None:
+            return []
+
+        # Evict the least recently used outputs
+        total = sum(record["bytes"] for record in records)
+        evicted = []
+        for record in records:
+            if total <= quota_gb*1024**3:
+                break
+            if record["key"] == keep:
+                continue
+            total -= record["bytes"]
+            if not dry_run:
+                self.remove(record)
+            evicted.append(record)
+
+        return evicted
+
+    def remove(self, record, output=True):
+        """
+        Remove a conversion's record & its output. Records & outputs already removed (e.g. by a concurrent
+        eviction) are skipped.
+
+        Args:
+            record (dict): Record of the conversion.
+
+            output (bool): Delete the conversion's output (e.g. Zarr store). Default: True
+
+        Return: None
+
+        """
+        if output and os.path.isdir(record["output"]):
+            shutil.rmtree(record["output"], ignore_errors=True)
+        elif output and os.path.exists(record["output"]):
+            os.remove(record["output"])
+        try:
+            os.remove(self.record_path(record["key"]))
+        except FileNotFoundError:
+            pass
+
+        return
@@ -1,7 +1,25 @@
 import os
 import time
+import tempfile
+import contextlib
+import cfgrib
 import xarray as xr
-from netCDF4 import Dataset
+from dask.diagnostics import ProgressBar
+from .zarr_encoding import build_encoding, chunk_dataset, SCHEDULERS
+from .grib_index_cache import GribIndexCache
+from .run_manifest import ConversionResult, RunManifest, path_size
+from .subset import subset_dataset
+from .zarr_metadata import open_zarr, open_group, consolidate
+from .conversion_cache import ConversionCache
+from .file_inspector import is_classic_netcdf
+from .precision import precision_encoding, copy_bit_rounded, precision_report, format_precision_report
+from .instrumentation import Instrumentation, TimedStore
+
+# Scalar coordinates which vary along an append dimension (e.g. a GRIB's valid_time = time + step)
+APPEND_DEPENDENT_COORDS = {'step': ('valid_time',), 'time': ('valid_time',)}
+
+# CF encoding of an existing Zarr's variables which the appended data is encoded w/ (e.g. the time's units)
+APPEND_ENCODING_KEYS = ('units', 'calendar', 'dtype', '_FillValue', 'missing_value', 'scale_factor', 'add_offset')
 
 class DataConverter():
     """
@@ -9,7 +27,11 @@ class DataConverter():
     Converts netCDF & GRIB to Xarray & Zarr.
     
     """
-    def __init__(self, filename, refactor_variables=None, raw_data_dir="../raw_data", zarr_data_dir="../zarr_data"):
+    def __init__(self, filename, refactor_variables=None, raw_data_dir="../raw_data", zarr_data_dir="../zarr_data",
+                 profile=None, target_chunk_mb=None, compressor=None, clevel=None, grb_index_dir=None, grb_index_max_mb=1024,
+                 manifest_path=None, variables=None, drop_variables=None, isel=None, bbox=None, metrics_path=None,
+                 cprofile=False, trace_memory=False, scheduler=None, progress=False, cache_dir=None, cache_quota_gb=None,
+                 precision=None):
         """
         Args:
             filename(str): Name of the file of interest located under ../raw_data. 
@@ -27,12 +49,95 @@ class DataConverter():
             raw_data_dir (str): Location of the raw (unprocessed) files. Default: "../raw_data"
             
             zarr_data_dir (str): Location of the zarr files. Default: "../zarr_data"
+            
+            profile (str): Chunking & compression profile of the Zarr. Options: "auto", "time-series",
+                           "spatial-map", "archive-max-compression". If None, the chunks & compressor 
+                           are chosen by Zarr. Default: None
+                           
+            target_chunk_mb (float): Target uncompressed chunk size (in MB). Overrides the profile's 
+                                     target chunk size. Default: None
+                                     
+            compressor (str): Compressor of the Zarr. Overrides the profile's compressor. 
+                              Options: "blosc-zstd", "blosc-lz4", "blosc-lz4hc", "blosc-zlib", "zstd", 
+                              "lz4", "none". Default: None
+                              
+            clevel (int): Compression level. Overrides the profile's compression level. W/o a compressor, the level
+                          applies to Zarr's default compressor (Blosc w/ LZ4). Default: None
+            
+            grb_index_dir (str): Location of the GRIB index cache. If set, the GRIB's cfgrib index is cached under this 
+                                 directory (rather than next to the GRIB file) & reused by repeat conversions of the 
+                                 unchanged GRIB file. Recommended for read-only raw data directories. Default: None
+                                 
+            grb_index_max_mb (float): Size limit (in MB) of the GRIB index cache. Default: 1024
+            
+            manifest_path (str): Path of the JSON-lines run manifest. A record (input & output path, status, 
+                                 error, bytes in & out & timing) is appended per conversion. Default: None 
+                                 (the results are only held in memory via run_manifest)
+                                 
+            variables (list): Variables to convert. For netCDF, the data variables' names. For GRIB, the variables' 
+                              GRIB shortNames (e.g. "2t", "soilw") -- only their GRIB messages are decoded. The 
+                              latitude & longitude are retained. Default: None (all variables)
+                              
+            drop_variables (list): Variables to exclude from the conversion. They are never read. Default: None
+            
+            isel (dict): Index range per dimension to convert, e.g. {"pfull": slice(0, 10)}. Default: None (entire domain)
+            
+            bbox (tuple): Latitude & longitude bounding box to convert in the format of (lat_min, lat_max, lon_min, lon_max).
+                          Only the rows & columns spanning the bounding box are read. Default: None (entire domain)
+                          
+            metrics_path (str): Path of the metrics file. If set, each stage of the conversion (e.g. open, decode, 
+                                compress & store-write) is timed & the bytes per stage are counted (see Instrumentation). 
+                                JSON lines for a ".json" extension & OpenMetrics-style text otherwise. Default: None
+                                
+            cprofile (bool): Capture a cProfile profile of the conversion. Default: False
+            
+            trace_memory (bool): Capture the peak memory allocated by Python via tracemalloc. Default: False
+            
+            scheduler (str): Dask scheduler compressing & writing the Zarr's chunks concurrently, w/ the number of workers
+                             of the conversion (num_workers). Options: "threads" (a thread pool; Blosc & Zstd release the GIL), 
+                             "processes" (a process pool) or "distributed" (a local Dask distributed cluster of single-threaded 
+                             worker processes). If None, only streamed conversions are written concurrently (via threads) & 
+                             loaded data is written by a single thread. The compress & store-write spans are only recorded 
+                             via threads. Default: None
+                             
+            progress (bool): Print the progress of the Zarr's chunk writes. Default: False
+            
+            cache_dir (str): Location of the conversion cache. If set, each conversion is recorded by a fingerprint of the
+                             file of interest & its options, & a conversion of the unchanged file w/ the same options to 
+                             the same Zarr returns the existing Zarr rather than converting again (see ConversionCache). 
+                             Default: None (always convert)
+                             
+            cache_quota_gb (float): Disk quota (in GB) of the Zarr stores recorded by the conversion cache. Once exceeded, 
+                                    the least recently used Zarr stores are deleted. Default: None (no quota)
+                                    
+            precision (dict): Precision options per variable name, applied prior to compression (see parse_precision()), 
+                              e.g. {"*": {"keep_bits": 10}, "t": {"pack_bits": 16}}. Float variables may be downcast 
+                              (e.g. float64 to float32), bit-rounded (N mantissa bits kept) or packed into N-bit integers 
+                              via a scale factor & offset. Lossy. The size reduction & the largest error per variable are 
+                              reported once written. Default: None (the decoded precision is kept)
                                    
         """
         self.filename = filename
         self.refactor_variables = refactor_variables
         self.raw_data_dir = raw_data_dir
         self.zarr_data_dir = zarr_data_dir
+        self.profile = profile
+        self.target_chunk_mb = target_chunk_mb
+        self.compressor = compressor
+        self.clevel = clevel
+        self.grb_index_cache = GribIndexCache(grb_index_dir, grb_index_max_mb) if grb_index_dir else None
+        self.run_manifest = RunManifest(manifest_path)
+        self.variables = variables
+        self.drop_variables = drop_variables
+        self.isel = isel
+        self.bbox = bbox
+        self.metrics_path = metrics_path
+        self.instrumentation = Instrumentation(metrics_path is not None, cprofile, trace_memory)
+        self.scheduler = scheduler
+        self.progress = progress
+        self.conversion_cache = ConversionCache(cache_dir, cache_quota_gb) if cache_dir else None
+        self.precision = precision
+        self.error = None
         
         # Create directory for storing zarr
         try:
@@ -40,7 +145,7 @@ class DataConverter():
         except FileExistsError:
             pass
         
-    def convert_nc2xarray(self, coord_suffix="coord", dim_suffix="node", print_feats=False):
+    def convert_nc2xarray(self, coord_suffix="coord", dim_suffix="node", print_feats=False, lazy=False, mmap=False):
         """
         Converts netCDF to Xarray.
         
@@ -52,6 +157,14 @@ class DataConverter():
                                Default: "node"
                                
             print_feats (bool): Print raw (unprocessed) data's details to prompted screen.
+            
+            lazy (bool): Open the netCDF file lazily rather than loading every variable into memory.
+                         The variables are read from disk only when accessed. Default: False
+                         
+            mmap (bool): Memory-map a classic netCDF file (see use_mmap()) rather than reading it via the netCDF4
+                         library. The file is opened lazily. Unless refactored, the variables are neither masked nor 
+                         scaled -- their _FillValue, scale_factor & add_offset attributes are written to Zarr as is, 
+                         so the Zarr's readers decode them alike. Default: False
 
         Return (object): NetCDF file's Xarray object. The object is a dataset resembling an in-memory representation of the
         netCDF file. It consists of the data's variables, coordinates, & attributes to form a self-describing dataset.
@@ -67,36 +180,33 @@ class DataConverter():
             # For index refactoring cases, preprocessing is required
             if self.refactor_variables:
                 
-                # load raw (unprocessed) data as Xarray Dataset via Xarray package
-                # & drop duplicated variable names in need of refactoring.
-                data_xr = xr.open_dataset(f'{self.raw_data_dir}/{self.filename}', drop_variables=self.refactor_variables, decode_times=False)
-
-                # load raw (unprocessed) data as nc Dataset via netCDF4 package
-                nc = Dataset(f'{self.raw_data_dir}/{self.filename}')
-
-                # Extract the "problematic" coordinate variables in need of refactoring.
-                coords = {name:nc[name] for name in self.refactor_variables}
-
-                # Load the "problematic" coordinate variables & create function to
-                # extract the "problematic" coordinate variables' attributes from "Dataset"
-                get_attrs = lambda name: {attr:coords[name].getncattr(attr) for attr in coords[name].ncattrs()}
-
-                # Create function to convert from nc Dataset() to Xarray DataArray w/ the 
-                # coordinate & dimension variables refactored.
-                nc2xr = lambda name: xr.DataArray(coords[name], attrs=get_attrs(name), name=f'{name}_{coord_suffix}', dims=(name, dim_suffix))
-
-                # Merge coordinate & dimension variables-refactored Xarray objects
-                coords = xr.merge([nc2xr(name) for name in coords.keys()])
-
-                # Re-assign the refactored coordinate & dimension variables to the
-                # raw data's Xarray Dataset
-                data_xr = data_xr.assign_coords(coords)  
+                # Open raw (unprocessed) data once via the netCDF4 backend & refactor 
+                # the duplicated variable names lazily.
+                with self.instrumentation.span('open'):
+                    if mmap:
+                        store = xr.backends.ScipyDataStore(f'{self.raw_data_dir}/{self.filename}', mmap=True)
+                    else:
+                        store = xr.backends.NetCDF4DataStore.open(f'{self.raw_data_dir}/{self.filename}')
+                data_xr = self.open_refactored(store, coord_suffix, dim_suffix)
                 
             # For non-index refactoring cases
             if not self.refactor_variables:
 
-                # Convert netCDF to Xarray
-                data_xr = xr.load_dataset(f'{self.raw_data_dir}/{self.filename}')
+                # Convert netCDF to Xarray. For lazy cases, the data is only read
+                # when accessed (e.g. chunk by chunk during the Zarr write).
+                with self.instrumentation.span('open'):
+                    if mmap:
+                        data_xr = xr.open_dataset(f'{self.raw_data_dir}/{self.filename}', engine='scipy', mmap=True,
+                                                  mask_and_scale=False, drop_variables=self.drop_variables, cache=False)
+                    else:
+                        data_xr = xr.open_dataset(f'{self.raw_data_dir}/{self.filename}', drop_variables=self.drop_variables, cache=not lazy)
+            
+            # Subset the variables & region of interest prior to reading the data
+            data_xr = subset_dataset(data_xr, self.variables, self.isel, self.bbox)
+            if not lazy and not mmap and not self.refactor_variables:
+                with self.instrumentation.span('decode'):
+                    data_xr = data_xr.load()
+                self.instrumentation.add_bytes('decode', data_xr.nbytes)
             
             # Calculate processing time
             print("\nData Converted to Xarray ... Completed.")
@@ -111,18 +221,86 @@ class DataConverter():
         # If the netCDF file requires data refactoring & the user does not declare
         # the variables in need of refactoring, then a notification will be sent
         except Exception as e:
+            self.error = e
             error_mssg = f"\n* XARRAY NOTIFICATION:\n{e}\n\n* Note: Variables with the same name as its dimensions are disallowed by Xarray because they conflict with the coordinates used to label dimensions.\n*TO RESOLVE: Re-execute script with the following flag appended: -d <DISALLOWED_VAR_1 DISALLOWED_VAR_2 ... DISALLOWED_VAR_N>\n"
             print(error_mssg)
             
         return data_xr
 
-    def convert_nc2zarr(self, filename):
+    def open_refactored(self, store, coord_suffix="coord", dim_suffix="node"):
+        """
+        Open a netCDF backend store as Xarray w/ the variables in need of refactoring renamed.
+        
+        The store is opened once. The duplicated variable names are dropped from the Xarray Dataset
+        & re-assigned as coordinate variables named <VARIABLE>_<coord_suffix> w/ dimensions
+        (<VARIABLE>, <dim_suffix>). The refactored variables remain lazy -- they are read from the 
+        store only when accessed (e.g. during the Zarr write). Closing the Xarray Dataset closes the store.
+        
+        Args:
+            store (object): Xarray backend store of the netCDF file (e.g. NetCDF4DataStore, H5NetCDFStore).
+            
+            coord_suffix (str): Suffix name for the refactored coordinate variable(s).
+                                Default: "coord"
+                                
+            dim_suffix (str):  Suffix name for the refactored dimension variable(s).
+                               Default: "node"
+                               
+        Return (object): Xarray Dataset.
+        
+        References: 
+        - https://github.com/pydata/xarray/issues/4456
+        
+        """
+        
+        # Extract the "problematic" coordinate variables in need of refactoring as lazy variables
+        with self.instrumentation.span('open'):
+            raw_vars = store.get_variables()
+        
+            # load raw (unprocessed) data as Xarray Dataset from the same store 
+            # & drop duplicated variable names in need of refactoring.
+            data_xr = xr.open_dataset(store, drop_variables=self.refactor_variables+(self.drop_variables or []), decode_times=False)
+        
+        # Refactor the coordinate & dimension variables. The store's lazy array is wrapped as is (its .data
+        # would read it from disk) & the masking & scaling is decoded lazily.
+        with self.instrumentation.span('rename'):
+            coords = {}
+            for name in self.refactor_variables:
+                var = xr.Variable((name, dim_suffix), raw_vars[name]._data, attrs=raw_vars[name].attrs)
+                coords[f'{name}_{coord_suffix}'] = xr.conventions.decode_cf_variable(name, var, decode_times=False)
+        
+            # Re-assign the refactored coordinate & dimension variables to the
+            # raw data's Xarray Dataset. The re-assigned Dataset closes the store.
+            data_xr = data_xr.assign_coords(coords)
+            data_xr.set_close(store.close)
+            
+            return data_xr
+    
+    def convert_nc2zarr(self, filename, stream=False, memory_budget_mb=1024, num_workers=1, append_dim=None, mmap=False):
         """
         Convert netCDF to Zarr. 
                 
         Args:
             filename (str): Name to save Zarr as under the location
                            of the zarr files (default: "../zarr_data").
+                           
+            stream (bool): Stream the conversion -- the netCDF file is opened lazily & each
+                           variable is read, compressed & written to Zarr chunk by chunk, 
+                           rather than loading the entire file into memory. Default: False
+                           
+            memory_budget_mb (float): Streaming only. Upper bound (in MB) on the memory used by the
+                                      chunks in flight. Default: 1024
+                                      
+            num_workers (int): Streaming or scheduler only. Number of chunks read & written concurrently. 
+                               Default: 1
+                               
+            append_dim (str): Dimension along which to append to an existing Zarr (e.g. "time" to add a 
+                              forecast hour to a time-series Zarr). If the Zarr does not exist, it is created.
+                              Default: None (the Zarr must not exist)
+                              
+            mmap (bool): Memory-map a classic netCDF file (e.g. gfs_ctrl.nc, oro_data) & write it chunk by chunk 
+                         w/in the memory budget, so each chunk is read from the mapped file straight into the 
+                         buffer compressed into Zarr (see use_mmap()). HDF5-based netCDF-4 files are converted as 
+                         usual. Default: False
         
         Return: If Xarray is not empty, then Zarr will be saved under the location
         of the Zarr files (default: "../zarr_data") -- otherwise, Zarr will not be saved 
@@ -130,29 +308,60 @@ class DataConverter():
         
         """
         
+        run_t = time.time()
+        store = f'{self.zarr_data_dir}/{filename}.zarr'
+        
+        # Memory-mapped conversions are streamed, as the mapped file is read chunk by chunk
+        mmap = mmap and self.use_mmap()
+        stream = stream or mmap
+        
+        # Return the existing Zarr if the unchanged netCDF file was converted to it w/ the same options.
+        # Appends modify the Zarr, so they are never cached.
+        params = self.cache_params('nc2zarr', stream=stream, memory_budget_mb=memory_budget_mb if stream else None, 
+                                   num_workers=num_workers if stream else None, mmap=mmap)
+        cache_key = self.cache_key(store, params) if not append_dim else None
+        if cache_key and self.conversion_cache.lookup(cache_key, store):
+            return self.cached_zarr(store, run_t)
+        
         # Convert netCDF to Xarray
-        data_xr = self.convert_nc2xarray()
+        data_xr = self.convert_nc2xarray(lazy=stream, mmap=mmap)
 
         # Convert Xarray to Zarr
         start_t = time.time()
+        store_exists = os.path.exists(store)
         if data_xr!=None:
             try:
-                data_zarr = data_xr.to_zarr(store=f'{self.zarr_data_dir}/{filename}.zarr')     
+                data_zarr = self.write_zarr(data_xr, store, stream, memory_budget_mb, num_workers, append_dim=append_dim)
                 print("\nData Converted to Zarr ... Completed.")
                 
                 # Calculate processing time.
                 delta_t2 = (time.time()-start_t)/60
                 print(f"Zarr Conversion Processing Time: {delta_t2} min.\n")
                 
+                self.run_manifest.record(ConversionResult(self.input_path(), store, run_t))
+                if cache_key:
+                    self.conversion_cache.record(cache_key, self.input_path(), store, params)
                 return data_zarr
             
             # If a user saves Zarr with the name of an existing Zarr, then a notification will be sent.
             # Note: This prevents an exisiting Zarr from being overwritten.
+            # Otherwise, the reason of the failure is sent.
             except Exception as e: 
-                print(f"\nData Not Converted to Zarr. REASON: The following Zarr currently exist: {self.zarr_data_dir}/{filename}.zarr.\n*TO RESOLVE: Either remove existing {filename}.zarr within {self.zarr_data_dir} (OR) save newly converted Zarr under a different name. For example, execute command in the following format:\npython main_nc2zarr_converter -f <FILENAME_WITH_EXTENSION> -z <NEW_FILENAME_FOR_ZARR_WHICH_DOES_NOT_EXIST> -d <DISALLOWED_VAR_1 DISALLOWED_VAR_2 ... DISALLOWED_VAR_N (OR) None>\n")
+                self.run_manifest.record(ConversionResult(self.input_path(), store, run_t, e))
+                if append_dim:
+                    print(f"\nData Not Appended to Zarr. REASON: {type(e).__name__}: {e}\n")
+                elif store_exists:
+                    print(f"\nData Not Converted to Zarr. REASON: The following Zarr currently exist: {store}.\n*TO RESOLVE: Either remove existing {filename}.zarr within {self.zarr_data_dir} (OR) save newly converted Zarr under a different name. For example, execute command in the following format:\npython main_nc2zarr_converter -f <FILENAME_WITH_EXTENSION> -z <NEW_FILENAME_FOR_ZARR_WHICH_DOES_NOT_EXIST> -d <DISALLOWED_VAR_1 DISALLOWED_VAR_2 ... DISALLOWED_VAR_N (OR) None>\n")
+                else:
+                    print(f"\nData Not Converted to Zarr. REASON: {type(e).__name__}: {e}\n")
+            
+            # Close the lazily opened netCDF file (or cloud object) once written
+            finally:
+                data_xr.close()
                 
         # If Xarray is empty, then conversion to Zarr will not occur & a notification will be sent
         else:
+            self.run_manifest.record(ConversionResult(self.input_path(), store, run_t, self.error or "Xarray is empty."))
             print('\nConversion to Zarr will not occur because Xarray is empty.\n')
             
         return
@@ -183,10 +392,35 @@ class DataConverter():
         data_xr = None   
         try:
 
-            # Convert GRIB to Xarray           
-            data_xr = xr.load_dataset(f'{self.raw_data_dir}/{self.filename}',
-                                      engine='cfgrib',
-                                      backend_kwargs={'filter_by_keys': grb_dict}) 
+            # Locate the GRIB's index (e.g. within the GRIB index cache)
+            backend_kwargs = {'filter_by_keys': grb_dict}
+            indexpath = self.grb_indexpath()
+            if indexpath is not None:
+                backend_kwargs['indexpath'] = indexpath
+
+            # Convert GRIB to Xarray. W/ variables of interest, only their GRIB messages are decoded.
+            if self.variables:
+                with self.instrumentation.span('open'):
+                    datasets = [xr.open_dataset(f'{self.raw_data_dir}/{self.filename}',
+                                                engine='cfgrib',
+                                                drop_variables=self.drop_variables,
+                                                backend_kwargs={**backend_kwargs, 'filter_by_keys': {**grb_dict, 'shortName': v}})
+                                for v in self.variables]
+                with self.instrumentation.span('merge'):
+                    data_xr = xr.merge(datasets, combine_attrs='drop_conflicts')
+            else:
+                with self.instrumentation.span('open'):
+                    data_xr = xr.open_dataset(f'{self.raw_data_dir}/{self.filename}',
+                                              engine='cfgrib',
+                                              drop_variables=self.drop_variables,
+                                              backend_kwargs=backend_kwargs)
+                
+            # Subset the region of interest prior to reading & decoding the GRIB messages
+            with self.instrumentation.span('decode'):
+                data_xr = subset_dataset(data_xr, isel=self.isel, bbox=self.bbox).load()
+            self.instrumentation.add_bytes('decode', data_xr.nbytes)
+            if self.grb_index_cache:
+                self.grb_index_cache.evict()
             
             # Print filtered GRIB's data features
             if print_feats:
@@ -201,20 +435,29 @@ class DataConverter():
                 print(f"Xarray Conversion Processing Time: {delta_t} min.")
         
             else:
+                self.error = "The GRIB's Xarray does not contain variables. The data's unique key(s) has to be specified by the user."
                 print("\nData Not Converted to Xarray because the data's unique key(s) has to be specified by the user.")
     
         except Exception as e:
+            self.error = e
             error_mssg = f"\n* XARRAY NOTIFICATION:\n {e}.\n\nThe GRIB file features a unique key with multiple values. For the conversion to Xarray, the user must request for a unique key-value pair of the GRIB file.\n*TO RESOLVE: Re-execute script with the following  -k & -v flags appended: -k <GRIB_KEY_1 GRIB_VALUE_2 ... GRIB_KEY_N> -v <GRIB_VALUE_1 GRIB_VALUE_2 ... GRIB_VALUE_N>\n"
             print(error_mssg)
             
         return data_xr
         
-    def convert_grb2zarr(self, filename, grb_dict={}):
+    def convert_grb2zarr(self, filename, grb_dict={}, append_dim=None, num_workers=1):
         """
         Convert GRIB (.Grb### or .grb) to Zarr.
                 
             filename (str): Name to save Zarr as under the location
                            of the zarr files (default: "../zarr_data").
+                           
+            append_dim (str): Dimension along which to append to an existing Zarr (e.g. "step" to add the
+                              forecast hours of GFSPRS.GrbF00/12/24 to a single Zarr). A scalar coordinate 
+                              is promoted to a dimension. If the Zarr does not exist, it is created.
+                              Default: None (the Zarr must not exist)
+                              
+            num_workers (int): Scheduler only. Number of chunks compressed & written concurrently. Default: 1
         
         Return: If Xarray is not empty, then Zarr will be saved under the location
         of the Zarr files (default: "../zarr_data") -- otherwise, Zarr will not be saved 
@@ -222,44 +465,669 @@ class DataConverter():
         
         """        
 
+        run_t = time.time()
+        
+        # For GRIB files not featuring a unique key with multiple values cases
+        store = f'{self.zarr_data_dir}/{filename}.zarr'
+        
+        # For GRIB file featuring a unique key with multiple values cases, save Zarr's 
+        # name with appending unique keys & values
+        if grb_dict!={}:
+            combine_kv = '_'.join(f'{k}{v}' for k,v in grb_dict.items())
+            store = f'{self.zarr_data_dir}/{filename}_{combine_kv}.zarr'
+        
+        # Return the existing Zarr if the unchanged GRIB file was converted to it w/ the same options.
+        # Appends modify the Zarr, so they are never cached.
+        params = self.cache_params('grb2zarr', grb_dict=grb_dict)
+        cache_key = self.cache_key(store, params) if not append_dim else None
+        if cache_key and self.conversion_cache.lookup(cache_key, store):
+            return self.cached_zarr(store, run_t)
+        
         # Convert GRIB (.Grb### or .grb) to Xarray
         data_xr = self.convert_grb2xarray(grb_dict)
+        store_exists = os.path.exists(store)
         
         # Convert Xarray to Zarr
         start_t = time.time()
-        kv_txt = []
         if data_xr!=None:
             try:
-                # For GRIB files not featuring a unique key with multiple values cases
-                if grb_dict=={}:
-                    data_zarr = data_xr.to_zarr(store=f'{self.zarr_data_dir}/{filename}.zarr')#, mode='w')
-                else:
-                    # For GRIB file featuring a unique key with multiple values cases
-                    for k,v in grb_dict.items():
-                        kv_txt.append(f'{k}{v}')
-                        combine_kv = '_'.join(kv_txt)
-                        
-                    # Save Zarr's name with appending unique keys & values
-                    data_zarr = data_xr.to_zarr(store=f'{self.zarr_data_dir}/{filename}_{combine_kv}.zarr')#, mode='w')
+                data_zarr = self.write_zarr(data_xr, store, num_workers=num_workers, append_dim=append_dim)
                 
                 # Calculate processing time
                 delta_t2 = (time.time()-start_t)/60
                 print("\nData Converted to Zarr ... Completed.")
                 print(f"Zarr Conversion Processing Time: {delta_t2} min.\n")
                 
+                self.run_manifest.record(ConversionResult(self.input_path(), store, run_t))
+                if cache_key:
+                    self.conversion_cache.record(cache_key, self.input_path(), store, params)
                 return data_zarr
             
             # If a user saves Zarr with the name of an existing Zarr, then a notification will be sent.
-            # Note: This prevents an exisiting Zarr from being overwritten.
+            # Note: This prevents an exisiting Zarr from being overwritten. 
+            # Otherwise, the reason of the failure is sent.
             except Exception as e: 
-                print(f"\nData Not Converted to Zarr. REASON: The following Zarr currently exist: {self.zarr_data_dir}/{filename}.zarr.\n*TO RESOLVE: Either remove existing {filename}.zarr within {self.zarr_data_dir} (OR) save newly converted Zarr under a different name. For example, execute command in the following format:\npython main_nc2zarr_converter -f <FILENAME_WITH_EXTENSION> -z <NEW_FILENAME_FOR_ZARR_WHICH_DOES_NOT_EXIST> -k <GRIB_KEY_1 GRIB_VALUE_2 ... GRIB_KEY_N> -v <GRIB_VALUE_1 GRIB_VALUE_2 ... GRIB_VALUE_N>\n")
+                self.run_manifest.record(ConversionResult(self.input_path(), store, run_t, e))
+                if append_dim:
+                    print(f"\nData Not Appended to Zarr. REASON: {type(e).__name__}: {e}\n")
+                elif not store_exists:
+                    print(f"\nData Not Converted to Zarr. REASON: {type(e).__name__}: {e}\n")
+                else:
+                    print(f"\nData Not Converted to Zarr. REASON: The following Zarr currently exist: {store}.\n*TO RESOLVE: Either remove existing {filename}.zarr within {self.zarr_data_dir} (OR) save newly converted Zarr under a different name. For example, execute command in the following format:\npython main_nc2zarr_converter -f <FILENAME_WITH_EXTENSION> -z <NEW_FILENAME_FOR_ZARR_WHICH_DOES_NOT_EXIST> -k <GRIB_KEY_1 GRIB_VALUE_2 ... GRIB_KEY_N> -v <GRIB_VALUE_1 GRIB_VALUE_2 ... GRIB_VALUE_N>\n")
         
         # If Xarray is empty, then conversion to Zarr will not occur & a notification will be sent
         else:
+            self.run_manifest.record(ConversionResult(self.input_path(), store, run_t, self.error or "Xarray is empty."))
             print('\nConversion to Zarr will not occur because Xarray is empty.\n')
 
         return
     
+    def convert_grb2zarr_all(self, filename, layout="stores", print_feats=False):
+        """
+        Convert every hypercube of GRIB (.Grb### or .grb) to Zarr in a single run.
+        
+        The GRIB's messages are scanned once to build the GRIB's index & to find each distinct 
+        hypercube (e.g. typeOfLevel). Each hypercube is then read from the same index, rather than
+        re-scanning the GRIB file per key-value pair of interest. W/ variables of interest, only the 
+        hypercubes featuring them are converted, each subset to them.
+        
+        Args:
+            filename (str): Name to save Zarr as under the location
+                            of the zarr files (default: "../zarr_data").
+                            
+            layout (str): Layout of the Zarr(s). Options: 
+                          "stores" - One Zarr per hypercube, named <filename>_<GRIB_KEY><GRIB_VALUE>.zarr 
+                                     (as per convert_grb2zarr()).
+                          "groups" - One Zarr, <filename>.zarr, w/ one group per hypercube named 
+                                     <GRIB_KEY><GRIB_VALUE>.
+                          Default: "stores"
+                          
+            print_feats (bool): Print each hypercube's information to prompted screen.
+        
+        Return (dict): Zarr store per hypercube name.
+        
+        References: 
+        - https://github.com/ecmwf/cfgrib#automatic-filtering
+        
+        """
+        start_t = time.time()
+        data_zarrs = {}
+        
+        # Location of the GRIB's index, shared by every hypercube during the run. W/o a GRIB 
+        # index cache, the index is temporary.
+        with tempfile.TemporaryDirectory() as index_dir:
+            try:
+                indexpath = self.grb_indexpath()
+                if indexpath is None:
+                    indexpath = f'{index_dir}/{{short_hash}}.idx'
+                
+                # Scan the GRIB's messages once & split them into hypercubes
+                datasets = cfgrib.open_datasets(f'{self.raw_data_dir}/{self.filename}', 
+                                                backend_kwargs={'indexpath': indexpath},
+                                                drop_variables=self.drop_variables)
+                if self.grb_index_cache:
+                    self.grb_index_cache.evict()
+                hypercubes = list(zip(self.name_hypercubes(datasets), datasets))
+                
+                # Keep the hypercubes featuring the variables of interest
+                if self.variables:
+                    found = {n for _, data_xr in hypercubes for var_name, var in data_xr.data_vars.items()
+                             for n in (var_name, var.attrs.get('GRIB_shortName'))}
+                    missing = [v for v in self.variables if v not in found]
+                    if missing:
+                        raise ValueError(f"Variable(s) not within the GRIB: {missing}. Options: {sorted(n for n in found if n)}")
+                    for _, data_xr in hypercubes:
+                        if not self.grb_variables(data_xr):
+                            data_xr.close()
+                    hypercubes = [(name, data_xr) for name, data_xr in hypercubes if self.grb_variables(data_xr)]
+            except Exception as e:
+                self.run_manifest.record(ConversionResult(self.input_path(), f'{self.zarr_data_dir}/{filename}.zarr', start_t, e))
+                print(f"\n* XARRAY NOTIFICATION:\n {e}.\n\nThe GRIB file's hypercubes could not be read.\n")
+                return data_zarrs
+            
+            print(f"\nGRIB Scanned ... {len(hypercubes)} Hypercube(s) Found.")
+            delta_t = (time.time()-start_t)/60
+            print(f"GRIB Scan Processing Time: {delta_t} min.")
+            
+            # Convert each hypercube to Zarr
+            for name, data_xr in hypercubes:
+                start_t = time.time()
+                if print_feats:
+                    print(f"\n== Hypercube: {name} ==")
+                    self.print_attributes(data_xr)
+                if layout == "groups":
+                    store, group = f'{self.zarr_data_dir}/{filename}.zarr', name
+                else:
+                    store, group = f'{self.zarr_data_dir}/{filename}_{name}.zarr', None
+                try:
+                    
+                    # Subset the variables & region of interest prior to reading the hypercube's data
+                    variables = self.grb_variables(data_xr)
+                    data_zarrs[name] = self.write_zarr(subset_dataset(data_xr, variables, self.isel, self.bbox), store, group=group)
+                    
+                    # Calculate processing time
+                    delta_t2 = (time.time()-start_t)/60
+                    print(f"\nHypercube {name} Converted to Zarr ... Completed.")
+                    print(f"Zarr Conversion Processing Time: {delta_t2} min.")
+                    self.run_manifest.record(ConversionResult(self.input_path(), f'{store}/{group}' if group else store, start_t))
+                    
+                # A failed hypercube does not prevent the remaining hypercubes from being converted 
+                except Exception as e:
+                    self.run_manifest.record(ConversionResult(self.input_path(), f'{store}/{group}' if group else store, start_t, e))
+                    print(f"\nHypercube {name} Not Converted to Zarr. REASON: {type(e).__name__}: {e}")
+                finally:
+                    data_xr.close()
+            
+        return data_zarrs
+    
+    def input_path(self):
+        """
+        Path of the file of interest, as recorded in the run manifest.
+        
+        Args:
+            None
+            
+        Return (str): Path of the file of interest.
+        
+        """
+        return f'{self.raw_data_dir}/{self.filename}'
+    
+    def use_mmap(self):
+        """
+        Check whether the file of interest may be memory-mapped, i.e. whether it is a classic netCDF file (classic 
+        or 64-bit offset format, e.g. gfs_ctrl.nc & some oro_data files). 
+        
+        The variables of a classic file are stored contiguously & uncompressed, so a chunk of a variable is a view 
+        of the mapped file. Each chunk is copied once -- straight from the mapped file (i.e. the page cache) into 
+        native byte order -- prior to its compression, rather than read into a buffer of the entire file by the 
+        netCDF4 library & copied again per chunk. HDF5-based netCDF-4 files are compressed & chunked by HDF5,
+        so they are not memory-mapped.
+        
+        Args:
+            None
+            
+        Return (bool): True if the file of interest is a classic netCDF file. Otherwise, a notification is sent.
+        
+        References:
+        - https://docs.scipy.org/doc/scipy/reference/generated/scipy.io.netcdf_file.html
+        
+        """
+        if is_classic_netcdf(self.input_path()):
+            return True
+        
+        print(f"\n* Note: {self.filename} is not a classic netCDF file (e.g. it is an HDF5-based netCDF-4 file), so it will not be memory-mapped. Converting as usual.")
+        
+        return False
+    
+    def cache_params(self, conversion, **kwargs):
+        """
+        Parameters of a conversion which determine its Zarr, as keyed by the conversion cache.
+        
+        Args:
+            conversion (str): Conversion of interest (e.g. "nc2zarr", "grb2zarr").
+            
+            kwargs: Remaining parameters of the conversion (e.g. the GRIB's filter keys).
+            
+        Return (dict): Parameters of the conversion.
+        
+        """
+        return {"conversion": conversion, "refactor_variables": self.refactor_variables, "variables": self.variables,
+                "drop_variables": self.drop_variables, "isel": self.isel, "bbox": self.bbox, "profile": self.profile,
+                "target_chunk_mb": self.target_chunk_mb, "compressor": self.compressor, "clevel": self.clevel,
+                "precision": self.precision, **kwargs}
+    
+    def cache_key(self, store, params):
+        """
+        Key of a conversion within the conversion cache.
+        
+        Args:
+            store (str): Path of the Zarr store.
+            
+            params (dict): Parameters of the conversion (see cache_params()).
+            
+        Return (str): Key of the conversion -- or None if the conversion cache is not set (or the file of 
+        interest does not exist).
+        
+        """
+        if self.conversion_cache is None or not os.path.isfile(self.input_path()):
+            return None
+        
+        return self.conversion_cache.key(self.input_path(), store, params)
+    
+    def cached_zarr(self, store, run_t):
+        """
+        Return the existing Zarr of a cached conversion.
+        
+        Args:
+            store (str): Path of the Zarr store.
+            
+            run_t (float): Start time of the conversion (seconds since the epoch).
+            
+        Return (zarr.Group): Read-only Zarr group of the existing Zarr.
+        
+        """
+        print(f"\nData Already Converted to Zarr ... Skipped. The file of interest & its options are unchanged since its conversion to {store}.\n")
+        self.run_manifest.record(ConversionResult(self.input_path(), store, run_t, status="cached"))
+        
+        return open_group(store)
+    
+    def grb_indexpath(self):
+        """
+        Location of the GRIB's cfgrib index.
+        
+        Args:
+            None
+            
+        Return (str): cfgrib index path within the GRIB index cache -- or None (cfgrib's default 
+        location next to the GRIB file) if the GRIB index cache is not set.
+        
+        """
+        if self.grb_index_cache:
+            return self.grb_index_cache.indexpath(f'{self.raw_data_dir}/{self.filename}')
+        
+        return None
+    
+    def grb_variables(self, data_xr):
+        """
+        Data variables of a GRIB hypercube matching the variables of interest. As in convert_grb2xarray(), the
+        variables of interest are GRIB shortNames (e.g. "2t") -- their Xarray names (e.g. "t2m") are accepted too.
+        
+        Args:
+            data_xr (Dataset): GRIB hypercube's Xarray Dataset.
+            
+        Return (list): Names of the matching data variables (empty w/o variables of interest).
+        
+        """
+        return [name for name, var in data_xr.data_vars.items()
+                if name in (self.variables or []) or var.attrs.get('GRIB_shortName') in (self.variables or [])]
+    
+    def name_hypercubes(self, datasets):
+        """
+        Name each GRIB hypercube by the GRIB key-value pairs which distinguish it.
+        
+        Args:
+            datasets (list): GRIB hypercubes' Xarray Datasets.
+            
+        Return (list): Name per hypercube in the format of <GRIB_KEY_1><GRIB_VALUE_1>_..._<GRIB_KEY_N><GRIB_VALUE_N>.
+        The fewest keys among "typeOfLevel", "stepType" & "shortName" which distinguish the hypercubes are used.
+        
+        """
+        grb_keys = ("typeOfLevel", "stepType", "shortName")
+        
+        # Extract the GRIB key-value pairs shared by all variables of each hypercube
+        kv_pairs = []
+        for data_xr in datasets:
+            kv = {}
+            for k in grb_keys:
+                values = {v.attrs.get(f'GRIB_{k}') for v in data_xr.data_vars.values()}
+                if len(values) == 1 and None not in values:
+                    kv[k] = values.pop()
+            kv_pairs.append(kv)
+        
+        # Append GRIB keys until the hypercubes' names are unique
+        for n in range(1, len(grb_keys)+1):
+            names = ['_'.join(f'{k}{v}' for k,v in kv.items() if k in grb_keys[:n]) for kv in kv_pairs]
+            if len(set(names)) == len(names):
+                break
+        
+        # Number any remaining duplicated names
+        names = [name or 'hypercube' for name in names]
+        names = [f'{name}_{names[:i].count(name)}' if names.count(name) > 1 else name for i, name in enumerate(names)]
+        
+        return names
+    
+    def write_zarr(self, data_xr, store, stream=False, memory_budget_mb=1024, num_workers=1, group=None, append_dim=None, split_dims=()):
+        """
+        Write Xarray to Zarr w/ the chunking & compression profile of interest.
+        
+        Args:
+            data_xr (Dataset): Xarray Dataset.
+            
+            store (str): Path of the Zarr store.
+            
+            stream (bool): Write a lazily opened Xarray chunk by chunk. Default: False
+            
+            memory_budget_mb (float): Streaming only. Upper bound (in MB) on the memory used by the chunks 
+                                      in flight. Each worker holds one decoded chunk & its compressed copy.
+                                      Default: 1024
+                                      
+            num_workers (int): Streaming or scheduler only. Number of chunks read & written concurrently. Default: 1
+            
+            group (str): Group within the Zarr store to write to. Default: None (root of the store)
+            
+            append_dim (str): Dimension along which to append to an existing Zarr store (see append_zarr()). 
+                              If the Zarr store does not exist, it is created. Default: None (create only)
+                              
+            split_dims (tuple): Dimensions chunked one element at a time (e.g. "tile"). Default: ()
+            
+        Return (object): Zarr store.
+        
+        """
+        
+        # Append to an existing Zarr store
+        if append_dim:
+            data_xr = self.expand_append_dim(data_xr, append_dim)
+            if os.path.exists(f'{store}/{group}' if group else store):
+                return self.append_zarr(data_xr, store, append_dim, stream, num_workers, group)
+        
+        # Time each compression & write of a chunk to the store. Workers outside of this process (e.g. the
+        # processes & distributed schedulers) do not report to the instrumentation.
+        timed = self.instrumentation.enabled and self.scheduler in (None, 'threads')
+        zarr_store = TimedStore(store, self.instrumentation) if timed else store
+        
+        # For non-streaming cases w/o a profile, compression, scheduler or precision options, Zarr chooses the chunks & compressor
+        if not stream and not self.scheduler and not split_dims and self.profile is None and self.compressor is None and self.clevel is None and self.target_chunk_mb is None and not self.precision:
+            with self.instrumentation.span('zarr-write'):
+                return data_xr.to_zarr(store=zarr_store, group=group, consolidated=True)
+        
+        with self.instrumentation.span('encode'):
+            encoding = self.zarr_encoding(data_xr, stream, memory_budget_mb, num_workers, split_dims)
+        
+        # Align the chunks to the appended blocks, so each append only writes new chunks
+        if append_dim:
+            for name, var_encoding in encoding.items():
+                if 'chunks' in var_encoding and append_dim in data_xr[name].dims:
+                    chunks = list(var_encoding['chunks'])
+                    chunks[data_xr[name].dims.index(append_dim)] = data_xr.sizes[append_dim]
+                    var_encoding['chunks'] = tuple(chunks)
+        
+        # Write a copy of the bit-rounded data, so the source data is kept as is (e.g. for the precision report)
+        source_xr = data_xr
+        if self.precision:
+            data_xr = copy_bit_rounded(data_xr, encoding)
+        
+        if not stream and not self.scheduler:
+            with self.instrumentation.span('zarr-write'):
+                data_zarr = data_xr.to_zarr(store=zarr_store, group=group, encoding=encoding, consolidated=True)
+            if self.precision:
+                self.report_precision(source_xr, store, group)
+            return data_zarr
+        
+        # Chunk each variable individually, so the data is read from disk (or, for loaded data, split)
+        # one chunk at a time & each chunk is compressed & written by its own task
+        with self.instrumentation.span('encode'):
+            data_xr = chunk_dataset(data_xr, encoding)
+        
+        # Read, compress & write the chunks w/ a bounded number of workers
+        with self.instrumentation.span('zarr-write'):
+            delayed_zarr = data_xr.to_zarr(store=zarr_store, group=group, encoding=encoding, compute=False, consolidated=True)
+            data_zarr = self.compute_zarr(delayed_zarr, num_workers, data_xr.nbytes)
+        if self.precision:
+            self.report_precision(source_xr, store, group)
+        
+        return data_zarr
+    
+    def compute_zarr(self, delayed_zarr, num_workers=1, nbytes=None):
+        """
+        Compress & write the chunks of a delayed Zarr write concurrently via the Dask scheduler of interest.
+        
+        Args:
+            delayed_zarr (Delayed): Delayed Zarr write (e.g. via to_zarr(compute=False)).
+            
+            num_workers (int): Number of chunks compressed & written concurrently (i.e. threads, processes or 
+                               distributed workers). Default: 1
+                               
+            nbytes (int): Uncompressed size (in bytes) of the data written, to print the write's throughput. 
+                          Default: None
+                          
+        Return (object): Zarr store.
+        
+        References:
+        - https://docs.dask.org/en/stable/scheduling.html
+        
+        """
+        start_t = time.time()
+        scheduler = self.scheduler or 'threads'
+        
+        # Local Dask distributed cluster of single-threaded worker processes, shut down once written
+        if scheduler == 'distributed':
+            from dask.distributed import Client, LocalCluster, progress
+            with LocalCluster(n_workers=num_workers, threads_per_worker=1, dashboard_address=':0') as cluster, Client(cluster) as client:
+                future = client.compute(delayed_zarr)
+                if self.progress:
+                    progress(future)
+                data_zarr = future.result()
+        
+        # Local thread or process pool
+        else:
+            with ProgressBar() if self.progress else contextlib.nullcontext():
+                data_zarr = delayed_zarr.compute(scheduler=scheduler, num_workers=num_workers)
+        
+        # Calculate throughput
+        if nbytes:
+            delta_t = time.time()-start_t
+            print(f"\nZarr Write Throughput: {nbytes/1024**2/max(delta_t, 1e-9):.1f} MB/s ({num_workers} {scheduler} worker(s)).")
+            
+        return data_zarr
+    
+    def zarr_encoding(self, data_xr, stream=False, memory_budget_mb=1024, num_workers=1, split_dims=()):
+        """
+        Build the Zarr encoding of Xarray w/ the chunking & compression profile of interest.
+        
+        Args:
+            data_xr (Dataset): Xarray Dataset.
+            
+            stream (bool): Size the chunks so all the workers' chunks fit within the memory budget. Default: False
+            
+            memory_budget_mb (float): Streaming only. Upper bound (in MB) on the memory used by the chunks 
+                                      in flight. Default: 1024
+                                      
+            num_workers (int): Streaming or scheduler only. Number of chunks read & written concurrently. Default: 1
+            
+            split_dims (tuple): Dimensions chunked one element at a time (e.g. "tile"). Default: ()
+            
+        Return (dict): Encoding per variable name.
+        
+        """
+        
+        # Size the chunks so all the workers' chunks fit within the memory budget
+        target_chunk_mb = self.target_chunk_mb
+        if stream:
+            budget_chunk_mb = memory_budget_mb/(2*num_workers)
+            target_chunk_mb = min(target_chunk_mb or budget_chunk_mb, budget_chunk_mb)
+            
+        encoding = build_encoding(data_xr, self.profile or "auto", target_chunk_mb, self.compressor, self.clevel, split_dims)
+        
+        # Downcast, bit-round or pack the variables of interest prior to compression
+        if self.precision:
+            encoding = precision_encoding(data_xr, encoding, self.precision)
+            
+        return encoding
+    
+    def expand_append_dim(self, data_xr, append_dim):
+        """
+        Promote a scalar coordinate to a dimension of length 1 (e.g. the forecast "step" of a GRIB file).
+        The scalar coordinates which vary along it (e.g. the GRIB's "valid_time") are expanded along it too,
+        so they are appended rather than left at the first write's value.
+        
+        Args:
+            data_xr (Dataset): Xarray Dataset.
+            
+            append_dim (str): Dimension to append along.
+            
+        Return (Dataset): Xarray Dataset featuring the dimension.
+        
+        """
+        if append_dim not in data_xr.dims:
+            if append_dim not in data_xr.coords or data_xr[append_dim].ndim != 0:
+                raise ValueError(f"{append_dim} is neither a dimension nor a scalar coordinate of the data. Dimensions: {list(data_xr.dims)}")
+            data_xr = data_xr.expand_dims(append_dim)
+        
+        dependent = [name for name in APPEND_DEPENDENT_COORDS.get(append_dim, ()) if name in data_xr.coords and data_xr[name].ndim == 0]
+        if dependent:
+            data_xr = data_xr.assign_coords({name: data_xr[name].broadcast_like(data_xr[append_dim]) for name in dependent})
+        
+        return data_xr
+    
+    def append_zarr(self, data_xr, store, append_dim, stream=False, num_workers=1, group=None):
+        """
+        Append Xarray to an existing Zarr store along a dimension (e.g. a new forecast hour along "time").
+        
+        The schema of the data is validated against the Zarr store prior to writing. Only the variables
+        featuring the append dimension are written, w/ the Zarr store's existing chunks & compressor -- 
+        so an append only writes the new chunks, rather than re-writing the Zarr store. Data whose 
+        coordinate values already exist within the Zarr store (e.g. a re-run forecast hour) is written 
+        in place over the existing region.
+        
+        Args:
+            data_xr (Dataset): Xarray Dataset featuring the append dimension.
+            
+            store (str): Path of the existing Zarr store.
+            
+            append_dim (str): Dimension to append along.
+            
+            stream (bool): Write a lazily opened Xarray chunk by chunk. Default: False
+            
+            num_workers (int): Streaming or scheduler only. Number of chunks read & written concurrently. Default: 1
+            
+            group (str): Group within the Zarr store to write to. Default: None (root of the store)
+            
+        Return (object): Zarr store.
+        
+        """
+        # Decode the times left undecoded (e.g. by open_refactored()), so their units & calendar move from the
+        # attributes to the encoding -- & are replaced by the Zarr store's below
+        undecoded = {name: xr.conventions.decode_cf_variable(name, var, mask_and_scale=False)
+                     for name, var in data_xr.variables.items() if ' since ' in str(var.attrs.get('units', ''))}
+        data_xr = data_xr.assign_coords({name: var for name, var in undecoded.items() if name in data_xr.coords})
+        data_xr = data_xr.assign({name: var for name, var in undecoded.items() if name in data_xr.data_vars})
+
+        existing_xr = open_zarr(store, group=group)
+        try:
+            self.validate_schema(data_xr, existing_xr, append_dim)
+            
+            # Only the variables featuring the append dimension change. Static variables (e.g. lat & lon) are kept.
+            data_xr = data_xr.drop_vars([name for name in data_xr.variables if append_dim not in data_xr[name].dims])
+            
+            # Encode the appended data alike the Zarr store (e.g. the time's units, calendar & data type), 
+            # rather than w/ the encoding of its own file
+            data_xr = data_xr.copy(deep=False)
+            for name, var in data_xr.variables.items():
+                var.encoding = {k: v for k, v in existing_xr[name].encoding.items()
+                                if k in APPEND_ENCODING_KEYS and k not in var.attrs}
+            
+            # Locate the appended coordinate values within the Zarr store, w/ both decoded alike
+            new_values = xr.decode_cf(xr.Dataset({append_dim: data_xr[append_dim].variable}))[append_dim].values
+            existing_index = existing_xr.indexes[append_dim]
+            positions = [existing_index.get_loc(v) if v in existing_index else None for v in new_values]
+            
+            # Align the chunks to the Zarr store's chunks
+            if stream:
+                data_xr = chunk_dataset(data_xr, {name: {'chunks': existing_xr[name].encoding['chunks']} 
+                                                  for name in data_xr.variables if 'chunks' in existing_xr[name].encoding})
+        finally:
+            existing_xr.close()
+        
+        # Append new coordinate values to the end of the dimension
+        if all(p is None for p in positions):
+            if new_values[0] <= existing_index[-1]:
+                raise ValueError(f"The {append_dim} values {new_values} precede the Zarr store's last {append_dim} ({existing_index[-1]}).")
+            delayed_zarr = data_xr.to_zarr(store=store, group=group, append_dim=append_dim, compute=False)
+        
+        # Overwrite the region of existing coordinate values
+        elif None not in positions and positions == list(range(positions[0], positions[0]+len(positions))):
+            region = {append_dim: slice(positions[0], positions[-1]+1)}
+            delayed_zarr = data_xr.drop_vars(append_dim).to_zarr(store=store, group=group, region=region, compute=False)
+            print(f"\n{append_dim} {new_values} currently exist within the Zarr. The existing region is overwritten.")
+        
+        else:
+            raise ValueError(f"The {append_dim} values {new_values} partially overlap the Zarr store's {append_dim} values.")
+        
+        with self.instrumentation.span('zarr-write'):
+            data_zarr = self.compute_zarr(delayed_zarr, num_workers)
+        
+        # Consolidate the metadata w/ the appended shapes (incl. stores written prior to consolidation)
+        consolidate(store)
+        
+        return data_zarr
+    
+    def validate_schema(self, data_xr, existing_xr, append_dim):
+        """
+        Validate the schema of Xarray against an existing Zarr store prior to appending.
+        
+        Args:
+            data_xr (Dataset): Xarray Dataset to append.
+            
+            existing_xr (Dataset): Xarray Dataset of the existing Zarr store.
+            
+            append_dim (str): Dimension to append along.
+            
+        Return: None. A ValueError is raised, listing every mismatch, if the schemas do not match.
+        
+        """
+        mismatches = []
+        
+        # The appended variables must match the Zarr store's variables
+        new_vars = {name for name in data_xr.variables if append_dim in data_xr[name].dims}
+        existing_vars = {name for name in existing_xr.variables if append_dim in existing_xr[name].dims}
+        if new_vars - existing_vars:
+            mismatches.append(f"Variable(s) not within the Zarr: {sorted(new_vars - existing_vars)}")
+        if existing_vars - new_vars:
+            mismatches.append(f"Variable(s) missing from the data: {sorted(existing_vars - new_vars)}")
+        
+        # Each variable must feature the same dimensions & data type
+        for name in (new_vars & existing_vars) - {append_dim}:
+            if data_xr[name].dims != existing_xr[name].dims:
+                mismatches.append(f"{name}: dimensions {data_xr[name].dims} != {existing_xr[name].dims}")
+            elif data_xr[name].dtype.kind != existing_xr[name].dtype.kind:
+                mismatches.append(f"{name}: data type {data_xr[name].dtype} != {existing_xr[name].dtype}")
+        
+        # All other dimensions must be of the same length
+        for dim, size in data_xr.sizes.items():
+            if dim != append_dim and dim in existing_xr.sizes and existing_xr.sizes[dim] != size:
+                mismatches.append(f"{dim}: length {size} != {existing_xr.sizes[dim]}")
+                
+        if mismatches:
+            raise ValueError("The data's schema does not match the Zarr's schema:\n- " + "\n- ".join(mismatches))
+        
+        return
+    
+    def report_precision(self, data_xr, store, group=None):
+        """
+        Print the size reduction & the largest error of each variable whose precision was reduced. The Zarr is 
+        read back & compared to the decoded source data.
+        
+        Args:
+            data_xr (Dataset): Xarray Dataset written to Zarr.
+            
+            store (str): Path of the Zarr store.
+            
+            group (str): Group within the Zarr store. Default: None (root of the store)
+            
+        Return (list): Dictionary per variable (see precision_report()).
+        
+        """
+        with self.instrumentation.span('precision-report'):
+            prefix = f'{store}/{group}' if group else store
+            written_xr = open_zarr(store, group=group)
+            rows = precision_report(data_xr, written_xr, self.precision, {name: path_size(f'{prefix}/{name}') for name in written_xr.variables})
+        print(f"\n* PRECISION:\n{format_precision_report(rows)}")
+        
+        return rows
+    
+    def report_metrics(self):
+        """
+        Stop the cProfile & tracemalloc capture (if requested), print the time & bytes per stage of the
+        conversion(s) & write them to the metrics file (if any). Call instrumentation.start() prior to the
+        conversion(s) to capture a cProfile profile or the peak memory.
+        
+        Args:
+            None
+            
+        Return (dict): Spans, byte counters, peak memory & profile (see Instrumentation.to_dict()).
+        
+        """
+        self.instrumentation.stop()
+        if self.instrumentation.enabled:
+            print(f"\n* CONVERSION STAGES:\n{self.instrumentation.summary()}")
+            if self.instrumentation.profile_stats:
+                print(f"\n* CPROFILE:\n{self.instrumentation.profile_stats}")
+        if self.metrics_path:
+            self.instrumentation.write(self.metrics_path)
+            print(f"\nThe conversion's metrics have been saved under {self.metrics_path}")
+            
+        return self.instrumentation.to_dict()
+    
     def print_attributes(self, data_xr):
         """
         Prints data's attributes.
@@ -0,0 +1,384 @@
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+from .zarr_encoding import PROFILES, COMPRESSORS, SCHEDULERS
+
+# Root of the repository. The data directories (raw_data, zarr_data & nc_data) are located under the root.
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Location of the package, so fresh processes import it alike this process
+PACKAGE_PARENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Subcommands of the CLI
+SUBCOMMANDS = ('download', 'nc2zarr', 'grb2zarr', 'zarr2nc', 'load', 'inspect')
+
+# Modules whose import dominates the CLI's startup. Each subcommand imports only those it needs, after its
+# arguments are parsed, so "--help" & argument errors import none of them.
+HEAVY_MODULES = ('numpy', 'xarray', 'netCDF4', 'dask', 'zarr', 'numcodecs', 'cfgrib', 'eccodes', 'boto3', 's3fs')
+
+# Startup budget (in seconds) of "<subcommand> --help" in a fresh process
+STARTUP_BUDGET_S = 0.5
+
+
+def add_root_arg(parser):
+    """
+    Add the data root argument shared by the subcommands.
+
+    Args:
+        parser (ArgumentParser): Parser of the subcommand.
+
+    Return: None
+
+    """
+    parser.add_argument("--root", type=str, default=os.environ.get("DATA_CONVERTER_ROOT", ROOT_DIR),
+                        help="Location of the raw_data, zarr_data & nc_data directories. Default: $DATA_CONVERTER_ROOT or the repository's root.")
+
+    return
+
+
+def add_zarr_args(parser):
+    """
+    Add the Zarr's chunking, compression, subset, scheduler & instrumentation arguments shared by nc2zarr & grb2zarr.
+
+    Args:
+        parser (ArgumentParser): Parser of the subcommand.
+
+    Return: None
+
+    """
+    parser.add_argument("-p", "--profile", type=str, choices=list(PROFILES), help="Chunking & compression profile of the Zarr. Options: 'auto', 'time-series', 'spatial-map', 'archive-max-compression'.")
+    parser.add_argument("-t", "--target_chunk_mb", type=float, help="Target uncompressed chunk size (in MB). Overrides the profile's target chunk size.")
+    parser.add_argument("-c", "--compressor", type=str, choices=COMPRESSORS, help="Compressor of the Zarr. Overrides the profile's compressor.")
+    parser.add_argument("-l", "--clevel", type=int, help="Compression level. Overrides the profile's compression level.")
+    parser.add_argument("--append_dim", type=str, help="Dimension along which to append to an existing Zarr (e.g. 'time'). If the Zarr does not exist, it is created.")
+    parser.add_argument("--drop_variables", type=str, nargs='+', help="Variables to exclude from the conversion.")
+    parser.add_argument("--isel", type=str, nargs='+', help="Index range per dimension to convert, e.g. --isel pfull=0:10 time=0")
+    parser.add_argument("--bbox", type=float, nargs=4, metavar=("LAT_MIN", "LAT_MAX", "LON_MIN", "LON_MAX"), help="Latitude & longitude bounding box to convert.")
+    parser.add_argument("--metrics", type=str, help="Path of the metrics file (.json for JSON lines, otherwise OpenMetrics-style text).")
+    parser.add_argument("--cprofile", action="store_true", help="Capture & print a cProfile profile of the conversion.")
+    parser.add_argument("--trace_memory", action="store_true", help="Capture the peak memory allocated by Python via tracemalloc.")
+    parser.add_argument("--scheduler", type=str, choices=SCHEDULERS, help="Dask scheduler compressing & writing the Zarr's chunks concurrently w/ the number of workers (-w).")
+    parser.add_argument("--progress", action="store_true", help="Print the progress of the Zarr's chunk writes.")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Streaming or scheduler only. Number of chunks read & written concurrently. Default: 1")
+    parser.add_argument("--manifest", type=str, help="Path of the JSON-lines run manifest. A record is appended per conversion.")
+    parser.add_argument("--cache_dir", type=str, help="Location of the conversion cache. If set, unchanged files are not converted again w/ the same options.")
+    parser.add_argument("--cache_quota_gb", type=float, help="Disk quota (in GB) of the Zarr stores recorded by the conversion cache. Default: No quota")
+    parser.add_argument("--precision", type=str, nargs='+', help="Precision options per variable, e.g. --precision '*=bits:10' t=pack:16 gh=float32. Options: float32, float16, bits:<N>, pack:<8|16|32>. Lossy.")
+
+    return
+
+
+def build_parser():
+    """
+    Build the CLI's argument parser w/ one subparser per subcommand (see SUBCOMMANDS).
+
+    Args:
+        None
+
+    Return (ArgumentParser): Argument parser.
+
+    """
+    argParser = argparse.ArgumentParser(prog="data_converter", description="Convert & load multidimensional data as Xarray, Zarr & Dask Array.")
+    subparsers = argParser.add_subparsers(dest="subcommand", metavar="subcommand")
+    subparsers.required = True
+
+    # download: Download an object from S3 cloud storage (see main_s3_download.py)
+    parser = subparsers.add_parser("download", help="Download an object from S3 cloud storage to raw_data.")
+    parser.add_argument("-b", "--bucket", type=str, help="Bucket's Amazon Resource Name (ARN). Options: 'noaa-ufs-regtests-pds', 'noaa-ufs-land-da-pds', 'noaa-ufs-srw-pds', etc.")
+    parser.add_argument("-k", "--key", type=str, help="Key of the object in cloud to download.")
+    parser.add_argument("-z", "--save_as_fn", type=str, help="Save as filename of downloaded cloud object.")
+    parser.add_argument("--cache_dir", type=str, help="Location of the download cache. If set, unchanged objects are not downloaded again.")
+    parser.add_argument("--cache_quota_gb", type=float, default=50, help="Disk quota (in GB) of the download cache. Default: 50")
+    parser.add_argument("--metrics", type=str, help="Path of the metrics file (.json for JSON lines, otherwise OpenMetrics-style text).")
+    add_root_arg(parser)
+
+    # nc2zarr: Convert netCDF to Zarr (see main_nc2zarr_converter.py)
+    parser = subparsers.add_parser("nc2zarr", help="Convert a netCDF file under raw_data to Zarr under zarr_data.")
+    parser.add_argument("-f", "--filename", type=str, help="netCDF file to convert to Zarr. Include file extension (e.g. .nc, .nc4).")
+    parser.add_argument("-z", "--filename2save", type=str, help="Save as Zarr name.")
+    parser.add_argument("-d", "--refactorvars", type=str, nargs='+', help="Multi-dimension variables in need of refactoring due to its duplication in variable.")
+    parser.add_argument("-s", "--stream", action="store_true", help="Stream the conversion chunk by chunk instead of loading the entire netCDF file into memory.")
+    parser.add_argument("-m", "--memory_budget", type=float, default=1024, help="Streaming only. Upper bound (in MB) on the memory used by the chunks in flight. Default: 1024")
+    parser.add_argument("--variables", type=str, nargs='+', help="Data variables to convert. Only the variables of interest (& the latitude & longitude) are read.")
+    parser.add_argument("--mmap", action="store_true", help="Memory-map a classic netCDF file (classic or 64-bit offset format) & write it chunk by chunk w/in the memory budget. Other files are converted as usual.")
+    add_zarr_args(parser)
+    add_root_arg(parser)
+
+    # grb2zarr: Convert GRIB to Zarr (see main_grb2zarr_converter.py)
+    parser = subparsers.add_parser("grb2zarr", help="Convert a GRIB file under raw_data to Zarr under zarr_data.")
+    parser.add_argument("-f", "--filename", type=str, help="GRIB file of interest to convert to Zarr (include file's extension).")
+    parser.add_argument("-k", "--grb_key", type=str, nargs='+', help="Unique GRIB key of interest.")
+    parser.add_argument("-v", "--grb_val", type=str, nargs='+', help="GRIB value corresponding to unique GRIB key of interest.")
+    parser.add_argument("-z", "--filename2save", type=str, help="Save as Zarr name.")
+    parser.add_argument("-a", "--all_hypercubes", action="store_true", help="Convert every hypercube of the GRIB file in a single run. The -k & -v flags are ignored.")
+    parser.add_argument("--layout", type=str, default="stores", choices=["stores", "groups"], help="Layout of the Zarr(s) when converting every hypercube. Default: 'stores'")
+    parser.add_argument("--index_dir", type=str, help="Location of the GRIB index cache. If set, the GRIB's index is cached & reused by repeat conversions.")
+    parser.add_argument("--index_max_mb", type=float, default=1024, help="Size limit (in MB) of the GRIB index cache. Default: 1024")
+    parser.add_argument("--variables", type=str, nargs='+', help="GRIB shortNames of the variables to convert (e.g. 2t soilw). Only their GRIB messages are decoded.")
+    add_zarr_args(parser)
+    add_root_arg(parser)
+
+    # zarr2nc: Convert Zarr to netCDF (see main_zarr2nc.py)
+    parser = subparsers.add_parser("zarr2nc", help="Convert a Zarr under zarr_data to netCDF under nc_data.")
+    parser.add_argument("-z", "--zarr_store",  type=str, help="Zarr name (exclude .zarr extension).")
+    parser.add_argument("-c", "--combine_by",  type=str, help="Unused. The Zarr is opened directly. Retained for compatibility.")
+    parser.add_argument("-g", "--group", type=str, help="Group within the Zarr to convert.")
+    parser.add_argument("-l", "--complevel", type=int, default=4, help="zlib compression level of the netCDF variables. If 0, the variables are not compressed. Default: 4")
+    parser.add_argument("--no_shuffle", action="store_true", help="Do not apply the byte shuffle filter prior to compression.")
+    parser.add_argument("-s", "--split_by", type=str, choices=["variable", "time"], help="Split the netCDF into one file per data variable or per time step.")
+    parser.add_argument("--split_dim", type=str, help="Time split only. Dimension to split along. Default: The Zarr's time dimension.")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="Number of Zarr chunks read & decompressed concurrently per netCDF file. Default: 4")
+    parser.add_argument("-n", "--max_workers", type=int, default=4, help="Split only. Number of netCDF files written concurrently. Default: 4")
+    parser.add_argument("--manifest", type=str, help="Path of the JSON-lines run manifest. A record is appended per conversion.")
+    add_root_arg(parser)
+
+    # load: Load a Zarr as Dask Array or load a selection into memory (see main_load_zarr.py)
+    parser = subparsers.add_parser("load", help="Load a Zarr under zarr_data as Dask Array, or load a selection of its variables.")
+    parser.add_argument("-z",  "--zarr_store", type=str, help="Zarr name (exclude .zarr extension).")
+    parser.add_argument("-v", "--variable", type=str, nargs='+', required=True, help="Zarr's variable(s) of interest.")
+    parser.add_argument("--sel", type=str, nargs='+', help="Label range per dimension to load, e.g. --sel latitude=55:20 time=2021-03-23T06")
+    parser.add_argument("--isel", type=str, nargs='+', help="Index range per dimension to load, e.g. --isel time=0")
+    parser.add_argument("--method", type=str, help="Method for inexact matches of single labels (e.g. 'nearest').")
+    parser.add_argument("--cache_mb", type=float, default=256, help="Byte budget (in MB) of the decompressed chunks cached in-process. Default: 256")
+    parser.add_argument("-r", "--repeat", type=int, default=1, help="Number of times to load the selection. Default: 1")
+    add_root_arg(parser)
+
+    # inspect: Report the structure of a file or Zarr from its metadata only (see main_inspect.py)
+    parser = subparsers.add_parser("inspect", help="Report the variables, dimensions, data types, sizes & GRIB hypercubes of a file under raw_data or a Zarr under zarr_data w/o reading its data.")
+    parser.add_argument("-f", "--filename", type=str, help="netCDF or GRIB file under raw_data to inspect (include file's extension).")
+    parser.add_argument("-z", "--zarr_store", type=str, help="Zarr under zarr_data to inspect (exclude .zarr extension).")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    parser.add_argument("--index_dir", type=str, help="GRIB only. Location of the GRIB index cache. If set, the GRIB's index is cached & reused by repeat inspections & conversions.")
+    add_root_arg(parser)
+
+    return argParser
+
+
+def run_download(args):
+    """
+    Download an object from S3 cloud storage to raw_data. Imports boto3 only.
+
+    Args:
+        args (Namespace): Parsed arguments of the subcommand.
+
+    Return (int): Exit code. Nonzero if the object was not downloaded.
+
+    """
+    from .download_data import DownloadData
+
+    # The download's failure is held by the downloader, since a previous download may exist under the same name
+    dl_wrapper = DownloadData(args.bucket, args.key, args.save_as_fn, f'{args.root}/raw_data', csp_storage='s3',
+                              cache_dir=args.cache_dir, cache_quota_gb=args.cache_quota_gb, metrics_path=args.metrics)
+    if dl_wrapper.error is not None:
+        print(f"REASON: {type(dl_wrapper.error).__name__}: {dl_wrapper.error}")
+
+    return 0 if dl_wrapper.error is None else 1
+
+
+def run_nc2zarr(args):
+    """
+    Convert a netCDF file under raw_data to Zarr under zarr_data.
+
+    Args:
+        args (Namespace): Parsed arguments of the subcommand.
+
+    Return (int): Exit code. Nonzero if the conversion failed.
+
+    """
+    from .data_converter import DataConverter
+    from .precision import parse_precision
+    from .subset import parse_isel
+
+    dc_wrapper = DataConverter(args.filename, args.refactorvars, f'{args.root}/raw_data', f'{args.root}/zarr_data',
+                               profile=args.profile, target_chunk_mb=args.target_chunk_mb, compressor=args.compressor,
+                               clevel=args.clevel, manifest_path=args.manifest, variables=args.variables,
+                               drop_variables=args.drop_variables, isel=parse_isel(args.isel), bbox=args.bbox, metrics_path=args.metrics,
+                               cprofile=args.cprofile, trace_memory=args.trace_memory, scheduler=args.scheduler, progress=args.progress,
+                               cache_dir=args.cache_dir, cache_quota_gb=args.cache_quota_gb, precision=parse_precision(args.precision))
+    dc_wrapper.instrumentation.start()
+    dc_wrapper.convert_nc2zarr(args.filename2save, stream=args.stream, memory_budget_mb=args.memory_budget,
+                               num_workers=args.workers, append_dim=args.append_dim, mmap=args.mmap)
+    dc_wrapper.report_metrics()
+
+    return dc_wrapper.run_manifest.exit_code()
+
+
+def run_grb2zarr(args):
+    """
+    Convert a GRIB file (or each of its hypercubes) under raw_data to Zarr under zarr_data.
+
+    Args:
+        args (Namespace): Parsed arguments of the subcommand.
+
+    Return (int): Exit code. Nonzero if a conversion failed.
+
+    """
+    from .data_converter import DataConverter
+    from .precision import parse_precision
+    from .subset import parse_isel
+
+    dc_wrapper = DataConverter(args.filename, None, f'{args.root}/raw_data', f'{args.root}/zarr_data',
+                               profile=args.profile, target_chunk_mb=args.target_chunk_mb, compressor=args.compressor,
+                               clevel=args.clevel, grb_index_dir=args.index_dir, grb_index_max_mb=args.index_max_mb,
+                               manifest_path=args.manifest, variables=args.variables, drop_variables=args.drop_variables,
+                               isel=parse_isel(args.isel), bbox=args.bbox, metrics_path=args.metrics,
+                               cprofile=args.cprofile, trace_memory=args.trace_memory, scheduler=args.scheduler, progress=args.progress,
+                               cache_dir=args.cache_dir, cache_quota_gb=args.cache_quota_gb, precision=parse_precision(args.precision))
+    dc_wrapper.instrumentation.start()
+    if args.all_hypercubes:
+        dc_wrapper.convert_grb2zarr_all(args.filename2save, args.layout)
+    elif args.grb_key!=None and args.grb_val!=None:
+        dc_wrapper.convert_grb2zarr(args.filename2save, dict(zip(args.grb_key, args.grb_val)), args.append_dim, args.workers)
+    else:
+        dc_wrapper.convert_grb2zarr(args.filename2save, dict(), args.append_dim, args.workers)
+    dc_wrapper.report_metrics()
+
+    return dc_wrapper.run_manifest.exit_code()
+
+
+def run_zarr2nc(args):
+    """
+    Convert a Zarr under zarr_data to netCDF under nc_data.
+
+    Args:
+        args (Namespace): Parsed arguments of the subcommand.
+
+    Return (int): Exit code. Nonzero if a conversion failed.
+
+    """
+    from .zarr2nc import Zarr2NC
+
+    start_t = time.time()
+    zarr2nc_wrapper = Zarr2NC(f'{args.root}/zarr_data', f'{args.root}/nc_data', complevel=args.complevel,
+                              shuffle=not args.no_shuffle, manifest_path=args.manifest)
+    zarr2nc_wrapper.convert_zarr2nc(args.zarr_store, args.combine_by, args.split_by, args.split_dim, args.group,
+                                    args.workers, args.max_workers)
+
+    # Calculalate processing time.
+    delta_t = (time.time()-start_t)/60
+    print(f"\nProcessing time: {delta_t} min.\n")
+
+    return zarr2nc_wrapper.run_manifest.exit_code()
+
+
+def run_load(args):
+    """
+    Load a Zarr under zarr_data as Dask Array, or load a selection of its variables into memory via the chunk cache.
+
+    Args:
+        args (Namespace): Parsed arguments of the subcommand.
+
+    Return (int): Exit code.
+
+    """
+    from .load_zarr_data import LoadZarrData
+    from .subset import parse_isel, parse_sel
+
+    start_t = time.time()
+    load_wrapper = LoadZarrData(args.zarr_store, args.variable[0], zarr_dir=f'{args.root}/zarr_data', cache_mb=args.cache_mb)
+
+    # Loads Zarr as Dask Array.
+    if not args.sel and not args.isel:
+        dask_array = load_wrapper.as_dask_array()
+        print(dask_array)
+
+    # Loads the Zarr's variables of interest into memory via the chunk cache.
+    else:
+        for i in range(args.repeat):
+            read_t = time.time()
+            data_xr = load_wrapper.load(args.variable, parse_sel(args.sel), parse_isel(args.isel), args.method)
+            print(f"\nLoad {i+1}: {(time.time()-read_t)*1000:.1f} ms. Chunk Cache: {load_wrapper.cache_info()}")
+        print(data_xr)
+
+    # Calculalate processing time.
+    delta_t = (time.time()-start_t)/60
+    print(f"\nProcessing time: {delta_t} min.")
+
+    return 0
+
+
+def run_inspect(args):
+    """
+    Report the structure of a netCDF or GRIB file under raw_data, or a Zarr under zarr_data, from its metadata only.
+    No data is read or decoded.
+
+    Args:
+        args (Namespace): Parsed arguments of the subcommand.
+
+    Return (int): Exit code. Nonzero if neither a file nor a Zarr was given or found.
+
+    """
+    from .file_inspector import inspect_file, format_report
+
+    if args.filename:
+        path = f'{args.root}/raw_data/{args.filename}'
+    elif args.zarr_store:
+        path = f'{args.root}/zarr_data/{args.zarr_store}.zarr'
+    else:
+        print("\nA file (-f) or a Zarr (-z) to inspect is required.\n")
+        return 2
+    if not os.path.exists(path):
+        print(f"\n{path} does not exist.\n")
+        return 1
+
+    report = inspect_file(path, args.index_dir)
+    print(json.dumps(report, indent=2, default=str) if args.json else format_report(report))
+
+    return 0
+
+
+def main(argv=None):
+    """
+    Entry point of the CLI. Parses the arguments prior to importing the subcommand's dependencies.
+
+    Args:
+        argv (list): Arguments, e.g. ["nc2zarr", "-f", "sfcf024.nc", "-z", "sfcf024"]. Default: sys.argv[1:]
+
+    Return (int): Exit code.
+
+    """
+    args = build_parser().parse_args(argv)
+    handlers = {'download': run_download, 'nc2zarr': run_nc2zarr, 'grb2zarr': run_grb2zarr,
+                'zarr2nc': run_zarr2nc, 'load': run_load, 'inspect': run_inspect}
+
+    return handlers[args.subcommand](args)
+
+
+def measure_startup(subcommand, repeat=5):
+    """
+    Measure the startup of "<subcommand> --help" in a fresh Python process, i.e. the fixed cost paid by each
+    invocation of the CLI prior to any work.
+
+    Args:
+        subcommand (str): Subcommand of interest (see SUBCOMMANDS).
+
+        repeat (int): Number of runs. The fastest run is kept. Default: 5
+
+    Return (dict): "subcommand", "wall_s" (incl. the interpreter's startup) & "heavy_modules" (the heavy
+    modules imported, see HEAVY_MODULES).
+
+    """
+    code = (f"import io, sys, json, contextlib, {__package__}.data_converter_cli as cli\n"
+            "try:\n"
+            "    with contextlib.redirect_stdout(io.StringIO()):\n"
+            f"        cli.main([{subcommand!r}, '--help'])\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "print(json.dumps(sorted(name for name in cli.HEAVY_MODULES if name in sys.modules)))")
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join([PACKAGE_PARENT_DIR, os.environ.get('PYTHONPATH', '')])}
+
+    runs = []
+    for _ in range(repeat):
+        start_t = time.perf_counter()
+        proc = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, env=env, check=True)
+        runs.append((time.perf_counter()-start_t, json.loads(proc.stdout.strip().splitlines()[-1])))
+    wall_s, heavy_modules = min(runs)
+
+    return {"subcommand": subcommand, "wall_s": wall_s, "heavy_modules": heavy_modules}
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,270 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+
+# Age (in seconds) below which a partial download may still be in progress (e.g. by another worker) & is not evicted
+PART_GRACE_S = 3600
+
+class DownloadCache():
+    """
+
+    Local content cache of cloud objects, keyed by bucket, key & ETag.
+
+    A cached object is validated against the object's size & ETag in cloud storage, so an
+    object is only downloaded again once it changes upstream. Interrupted downloads are resumed
+    via ranged GETs. Cached objects are copied to their destination, so writes to the destination never
+    alter the cache, & evicted least recently used first once the cache (incl. the partial downloads of
+    interrupted runs) exceeds its disk quota.
+
+    """
+    def __init__(self, cache_dir="../download_cache", quota_gb=50, chunk_mb=8):
+        """
+        Args:
+            cache_dir (str): Location of the cache. Default: "../download_cache"
+
+            quota_gb (float): Disk quota (in GB) of the cache. Default: 50
+
+            chunk_mb (float): Size (in MB) of the blocks streamed to disk per read. Default: 8
+
+        """
+        self.cache_dir = cache_dir
+        self.quota_gb = quota_gb
+        self.chunk_size = int(chunk_mb*1024**2)
+
+        # Create directory for storing the cache
+        try:
+            os.makedirs(self.cache_dir)
+        except FileExistsError:
+            pass
+
+    def entry_path(self, bucket_arn, obj_key):
+        """
+        Path of a cloud object's cache entry.
+
+        Args:
+            bucket_arn (str): Cloud bucket's Amazon Resource Name (ARN).
+
+            obj_key (str): Key of the object in cloud storage.
+
+        Return (str): Path of the cached object. Its metadata (bucket, key, ETag & size) is saved
+        alongside, w/ a ".json" extension.
+
+        """
+        key = hashlib.sha1(f'{bucket_arn}/{obj_key}'.encode()).hexdigest()[:16]
+
+        return f'{self.cache_dir}/{key}_{os.path.basename(obj_key)}'
+
+    def read_metadata(self, path):
+        """
+        Read the metadata of a cache entry.
+
+        Args:
+            path (str): Path of the cached object (or its partial download).
+
+        Return (dict): Metadata of the entry, or an empty dictionary if the entry does not exist.
+
+        """
+        try:
+            with open(f'{path}.json') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def write_metadata(self, path, metadata):
+        """
+        Write the metadata of a cache entry.
+
+        Args:
+            path (str): Path of the cached object (or its partial download).
+
+            metadata (dict): Metadata of the entry.
+
+        Return: None
+
+        """
+        with open(f'{path}.json.tmp', 'w') as f:
+            json.dump(metadata, f)
+        os.replace(f'{path}.json.tmp', f'{path}.json')
+
+        return
+
+    def fetch(self, boto_client, bucket_arn, obj_key, filename):
+        """
+        Fetch a cloud object to a file, downloading it only if the cache does not hold its current version.
+
+        Args:
+            boto_client (object): boto3 client.
+
+            bucket_arn (str): Cloud bucket's Amazon Resource Name (ARN).
+
+            obj_key (str): Key of the object in cloud storage.
+
+            filename (str): Path to save the object as on local disk.
+
+        Return (str): Status of the fetch. Options: "unchanged" (file already holds the current version),
+        "cached" (copied from the cache) or "downloaded".
+
+        """
+        head = boto_client.head_object(Bucket=bucket_arn, Key=obj_key)
+        etag = head['ETag'].strip('"')
+        size = head['ContentLength']
+
+        path = self.entry_path(bucket_arn, obj_key)
+        metadata = self.read_metadata(path)
+        status = "cached"
+
+        # Download the object if the cache does not hold its current version, or if the cached object
+        # was modified since its download
+        if not (metadata.get('etag') == etag and metadata.get('size') == size and os.path.exists(path)
+                and os.path.getsize(path) == size and os.stat(path).st_mtime_ns == metadata.get('mtime_ns')):
+            self.download(boto_client, bucket_arn, obj_key, etag, size, path)
+            status = "downloaded"
+
+        # Mark entry as recently used
+        os.utime(f'{path}.json')
+
+        # Skip files which are an unmodified copy of the cached object (rather than a hard link to it)
+        if (os.path.exists(filename) and not os.path.samefile(path, filename) and os.path.getsize(filename) == size
+                and os.stat(filename).st_mtime_ns == os.stat(path).st_mtime_ns):
+            status = "unchanged"
+        else:
+            self.copy(path, filename)
+
+        self.evict(keep=path)
+
+        return status
+
+    def download(self, boto_client, bucket_arn, obj_key, etag, size, path):
+        """
+        Download a cloud object to the cache, resuming a previously interrupted download of the same ETag.
+
+        Args:
+            boto_client (object): boto3 client.
+
+            bucket_arn (str): Cloud bucket's Amazon Resource Name (ARN).
+
+            obj_key (str): Key of the object in cloud storage.
+
+            etag (str): ETag of the object.
+
+            size (int): Size (in bytes) of the object.
+
+            path (str): Path of the cached object.
+
+        Return: None
+
+        """
+        part_path = f'{path}.part'
+
+        # Resume only a partial download of the same version of the object
+        part_metadata = self.read_metadata(part_path)
+        if part_metadata.get('etag') != etag or not os.path.exists(part_path):
+            with open(part_path, 'wb'):
+                pass
+            self.write_metadata(part_path, {'bucket': bucket_arn, 'key': obj_key, 'etag': etag, 'size': size})
+        offset = os.path.getsize(part_path)
+
+        # Stream the remaining bytes via a ranged GET. IfMatch ensures the object has not changed since.
+        if offset < size:
+            response = boto_client.get_object(Bucket=bucket_arn, Key=obj_key, Range=f'bytes={offset}-', IfMatch=f'"{etag}"')
+            with open(part_path, 'ab') as f:
+                for block in response['Body'].iter_chunks(chunk_size=self.chunk_size):
+                    f.write(block)
+
+        # Validate the download. A single-part upload's ETag is the MD5 of its content.
+        if os.path.getsize(part_path) != size:
+            raise IOError(f"Downloaded size of {obj_key} ({os.path.getsize(part_path)} bytes) does not match its size ({size} bytes).")
+        if '-' not in etag and self.md5(part_path) != etag:
+            os.remove(part_path)
+            raise IOError(f"Downloaded content of {obj_key} does not match its ETag ({etag}).")
+
+        os.replace(part_path, path)
+        os.remove(f'{part_path}.json')
+        self.write_metadata(path, {'bucket': bucket_arn, 'key': obj_key, 'etag': etag, 'size': size,
+                                   'mtime_ns': os.stat(path).st_mtime_ns, 'downloaded': time.time()})
+
+        return
+
+    def md5(self, path):
+        """
+        MD5 checksum of a file.
+
+        Args:
+            path (str): Path of the file.
+
+        Return (str): Hexadecimal MD5 checksum.
+
+        """
+        md5 = hashlib.md5()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(self.chunk_size), b''):
+                md5.update(block)
+
+        return md5.hexdigest()
+
+    def copy(self, path, filename):
+        """
+        Copy a cached object to its destination. The copy keeps the cached object's modification time, so
+        an unmodified copy is recognized by its size & modification time.
+
+        Args:
+            path (str): Path of the cached object.
+
+            filename (str): Destination of the object.
+
+        Return: None
+
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+        if os.path.lexists(filename):
+            os.remove(filename)
+        shutil.copyfile(path, filename)
+        os.utime(filename, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns))
+
+        return
+
+    def last_used(self, entry):
+        """
+        Time a cache entry was last used.
+
+        Args:
+            entry (str): Path of the cached object (or its partial download).
+
+        Return (float): Time the cached object was last fetched (or the partial download was last written to).
+
+        """
+        if entry.endswith('.part') and os.path.exists(entry):
+            return os.path.getmtime(entry)
+
+        return os.path.getmtime(f'{entry}.json')
+
+    def evict(self, keep=None):
+        """
+        Evict the least recently used objects & partial downloads until the cache is within its disk quota.
+        Partial downloads written to w/in the last PART_GRACE_S seconds may still be in progress & are kept.
+
+        Args:
+            keep (str): Path of a cached object which must not be evicted. Default: None
+
+        Return (list): Evicted objects & partial downloads.
+
+        """
+        entries = sorted((f'{self.cache_dir}/{fn[:-5]}' for fn in os.listdir(self.cache_dir) if fn.endswith('.json')),
+                         key=self.last_used)
+        total = sum(os.path.getsize(e) for e in entries if os.path.exists(e))
+
+        evicted = []
+        for entry in entries:
+            if total <= self.quota_gb*1024**3:
+                break
+            if entry == keep or (entry.endswith('.part') and time.time()-self.last_used(entry) < PART_GRACE_S):
+                continue
+            if os.path.exists(entry):
+                total -= os.path.getsize(entry)
+                os.remove(entry)
+            os.remove(f'{entry}.json')
+            evicted.append(entry)
+
+        return evicted
@@ -1,6 +1,39 @@
 import os
 import time
 import boto3
+from collections import Counter
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from .download_cache import DownloadCache
+from .instrumentation import Instrumentation
+
+
+def save_as_names(keys, prefix=None):
+    """
+    Name the file of each object to download, so no two objects are saved as the same file.
+    
+    Args:
+        keys (list): Keys of the objects.
+        
+        prefix (str): Prefix of the objects' keys. Each object is saved under its key's path relative to 
+                      the prefix. Default: None (each object is saved under its key's filename -- objects 
+                      sharing a filename, e.g. the same tile of two runs, are saved under their keys' paths)
+                      
+    Return (dict): Name (or relative path) to save each object as under the raw files' directory, per key.
+    
+    """
+    if prefix is not None:
+        base = prefix if prefix.endswith('/') else os.path.dirname(prefix)
+        return {key: key[len(base):].lstrip('/') for key in keys}
+    
+    counts = Counter(os.path.basename(key) for key in keys)
+    shared = sorted({os.path.basename(key) for key in keys if counts[os.path.basename(key)] > 1})
+    if shared:
+        print(f"\n* Note: Objects sharing a filename ({', '.join(shared)}) are saved under their keys' paths.")
+    
+    return {key: key.lstrip('/') if counts[os.path.basename(key)] > 1 else os.path.basename(key) for key in keys}
+
 
 class DownloadData():
     """
@@ -8,7 +41,8 @@ class DownloadData():
     Downloads object from S3 cloud storage.
 
     """
-    def __init__(self, bucket_arn, obj_key, save_as_fn, raw_data_dir="../raw_data", csp_storage='s3'):
+    def __init__(self, bucket_arn, obj_key, save_as_fn, raw_data_dir="../raw_data", csp_storage='s3', boto_client=None,
+                 cache_dir=None, cache_quota_gb=50, metrics_path=None):
         """
         Args:
             bucket_arn (str): Cloud bucket's Amazon Resource Name (ARN). 
@@ -24,14 +58,32 @@ class DownloadData():
                                 
             csp_storage (str): Cloud service providers storage name. 
                                Default is 's3'
+                               
+            boto_client (object): Existing boto3 client to reuse (e.g. shared across downloads). 
+                                  Default: None (a new client is created)
+                                  
+            cache_dir (str): Location of the download cache. If set, the object is only downloaded if the cache
+                             does not hold its current version (validated by size & ETag), & interrupted 
+                             downloads are resumed. Default: None (always download)
+                             
+            cache_quota_gb (float): Disk quota (in GB) of the download cache. Default: 50
+            
+            metrics_path (str): Path of the metrics file. If set, the download is timed as the "download" span &
+                                its bytes are counted (see Instrumentation). Default: None
         
         """
         self.bucket_arn = bucket_arn
         self.obj_key = obj_key
         self.save_as_fn = save_as_fn
         self.csp_storage = csp_storage
-        self.boto_client = boto3.client(self.csp_storage)
+        self.boto_client = boto_client or boto3.client(self.csp_storage)
         self.raw_data_dir = raw_data_dir
+        self.download_cache = DownloadCache(cache_dir, cache_quota_gb) if cache_dir else None
+        self.instrumentation = Instrumentation(metrics_path is not None)
+        
+        # Status of the download ("downloaded", "cached" or "unchanged") & the reason of its failure (if any)
+        self.status = None
+        self.error = None
         
         # Create directory for storing raw files
         try:
@@ -42,17 +94,176 @@ class DownloadData():
         # Download file from cloud storage
         start_t = time.time()
         try:
-            self.boto_client.download_file(Bucket=self.bucket_arn, 
-                                           Key=self.obj_key, 
-                                           Filename=f"{self.raw_data_dir}/{self.save_as_fn}")
+            with self.instrumentation.span('download'):
+                if self.download_cache:
+                    status = self.download_cache.fetch(self.boto_client, self.bucket_arn, self.obj_key,
+                                                       f"{self.raw_data_dir}/{self.save_as_fn}")
+                else:
+                    self.boto_client.download_file(Bucket=self.bucket_arn, 
+                                                   Key=self.obj_key, 
+                                                   Filename=f"{self.raw_data_dir}/{self.save_as_fn}")
+                    status = "downloaded"
+            self.status = status
+            if status == "downloaded":
+                self.instrumentation.add_bytes('download', os.path.getsize(f"{self.raw_data_dir}/{self.save_as_fn}"))
+            if metrics_path:
+                self.instrumentation.write(metrics_path)
             
             # Calculate processing time.
-            print(f"\nThe following cloud object has been downloaded to {self.raw_data_dir} as {self.save_as_fn}:\n{self.obj_key}")
+            print(f"\nThe following cloud object has been {status} to {self.raw_data_dir} as {self.save_as_fn}:\n{self.obj_key}")
             delta_t = (time.time()-start_t)/60
             print(f"\nProcessing time: {delta_t} min.\n")
 
         # If object's key doest not exist within the ARN of interest, then a notification will be sent
         except Exception as e: 
+            self.error = e
             print(f"\nThe following cloud key does not exist in {bucket_arn} bucket:\n{self.obj_key}\n")
-            
 
+
+class BulkDownloadData():
+    """
+
+    Downloads many objects from S3 cloud storage concurrently.
+
+    """
+    def __init__(self, bucket_arn, raw_data_dir="../raw_data", csp_storage='s3', max_workers=8,
+                 multipart_chunksize_mb=8, max_concurrency=10, endpoint_url=None, boto_client=None,
+                 cache_dir=None, cache_quota_gb=50):
+        """
+        Args:
+            bucket_arn (str): Cloud bucket's Amazon Resource Name (ARN). 
+                              Options: 'noaa-ufs-regtests-pds', 'noaa-ufs-land-da-pds',
+                              'noaa-ufs-srw-pds'
+                              
+            raw_data_dir (str): Directory to save downloaded files. 
+                                Default: "../raw_data"
+                                
+            csp_storage (str): Cloud service providers storage name. 
+                               Default is 's3'
+                               
+            max_workers (int): Number of objects downloaded concurrently. Default: 8
+            
+            multipart_chunksize_mb (float): Part size (in MB) of multipart downloads. Objects larger than
+                                            the part size are downloaded in parts. Default: 8
+                                            
+            max_concurrency (int): Number of parts downloaded concurrently per object. Default: 10
+            
+            endpoint_url (str): URL of the storage endpoint (e.g. a local S3 stand-in). 
+                                Default: None (the cloud service provider's endpoint)
+                                
+            boto_client (object): Existing boto3 client to reuse. Default: None (a pooled client is created)
+            
+            cache_dir (str): Location of the download cache. If set, objects are only downloaded if the cache
+                             does not hold their current version (validated by size & ETag), & interrupted 
+                             downloads are resumed. Default: None (always download)
+                             
+            cache_quota_gb (float): Disk quota (in GB) of the download cache. Default: 50
+        
+        """
+        self.bucket_arn = bucket_arn
+        self.raw_data_dir = raw_data_dir
+        self.max_workers = max_workers
+        self.download_cache = DownloadCache(cache_dir, cache_quota_gb, multipart_chunksize_mb) if cache_dir else None
+        
+        # One client shared by all downloads, w/ a connection pool large enough for every part in flight
+        pool_size = max(max_workers*max_concurrency, 10)
+        self.boto_client = boto_client or boto3.client(csp_storage, endpoint_url=endpoint_url,
+                                                       config=Config(max_pool_connections=pool_size))
+        self.transfer_config = TransferConfig(multipart_threshold=int(multipart_chunksize_mb*1024**2),
+                                              multipart_chunksize=int(multipart_chunksize_mb*1024**2),
+                                              max_concurrency=max_concurrency)
+        
+        # Create directory for storing raw files
+        try:
+            os.makedirs(self.raw_data_dir)
+        except FileExistsError:
+            pass
+        
+    def list_keys(self, prefix):
+        """
+        List the keys of the objects under a prefix.
+        
+        Args:
+            prefix (str): Prefix of the objects' keys (e.g. "develop-20230222/INTEL/atmaero_control_p8_rad/").
+            
+        Return (list): Keys of the objects.
+        
+        """
+        keys = []
+        paginator = self.boto_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket_arn, Prefix=prefix):
+            keys.extend(obj['Key'] for obj in page.get('Contents', []) if not obj['Key'].endswith('/'))
+            
+        return keys
+    
+    def download_object(self, obj_key, save_as_fn):
+        """
+        Download a single object.
+        
+        Args:
+            obj_key (str): Key of the object in cloud storage.
+            
+            save_as_fn (str): Name (or relative path) to save downloaded file as under the raw files' directory.
+            
+        Return (dict): Result of the download holding its "key", "filename", "status" ("success" or "failed"),
+        "fetch" ("downloaded", "cached" or "unchanged"), "error", "bytes" & "seconds".
+        
+        """
+        filename = f"{self.raw_data_dir}/{save_as_fn}"
+        result = {"key": obj_key, "filename": filename, "status": "failed", "fetch": None, "error": None, "bytes": 0, "seconds": 0.0}
+        start_t = time.time()
+        try:
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+            if self.download_cache:
+                result["fetch"] = self.download_cache.fetch(self.boto_client, self.bucket_arn, obj_key, filename)
+            else:
+                self.boto_client.download_file(Bucket=self.bucket_arn, Key=obj_key, Filename=filename,
+                                               Config=self.transfer_config)
+                result["fetch"] = "downloaded"
+            result["bytes"] = os.path.getsize(filename) if result["fetch"] == "downloaded" else 0
+            result["status"] = "success"
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+        result["seconds"] = time.time()-start_t
+        
+        return result
+        
+    def download(self, keys=None, prefix=None):
+        """
+        Download the objects of interest concurrently.
+        
+        Args:
+            keys (list): Keys of the objects. Each object is saved under its key's filename (see save_as_names()). 
+                         Default: None
+            
+            prefix (str): Prefix of the objects' keys. Each object is saved under its key's path relative 
+                          to the prefix. Used when keys are not given. Default: None
+                          
+        Return (list): Result per object (see download_object()).
+        
+        """
+        
+        # Name each downloaded file
+        save_as = save_as_names(keys) if keys else save_as_names(self.list_keys(prefix), prefix)
+        
+        # Download the objects concurrently
+        start_t = time.time()
+        results = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self.download_object, key, fn) for key, fn in save_as.items()]
+            for future in as_completed(futures):
+                result = future.result()
+                if result["status"] == "success":
+                    print(f"- {result['key']} ... {result['fetch'].capitalize()} ({result['bytes']/1024**2:.1f} MB, {result['seconds']:.1f} s).")
+                else:
+                    print(f"- {result['key']} ... FAILED. REASON: {result['error']}")
+                results.append(result)
+        
+        # Calculate aggregate bandwidth
+        delta_t = time.time()-start_t
+        total_mb = sum(r["bytes"] for r in results)/1024**2
+        n_failed = sum(r["status"] != "success" for r in results)
+        print(f"\n{len(results)-n_failed} of {len(results)} object(s) downloaded to {self.raw_data_dir} ({total_mb:.1f} MB).")
+        print(f"Processing time: {delta_t/60} min. Bandwidth: {total_mb/max(delta_t, 1e-9):.2f} MB/s\n")
+        
+        return results
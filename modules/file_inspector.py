@@ -0,0 +1,315 @@
+import os
+import json
+import math
+
+# Size (in bytes) of each value decoded from a GRIB message (cfgrib decodes the values as float32)
+GRIB_VALUE_BYTES = 4
+
+
+def detect_format(path):
+    """
+    Detect the format of a file (or Zarr store) from its leading bytes rather than its extension.
+
+    Args:
+        path (str): Path of the file or Zarr store.
+
+    Return (str): Format. Options: "zarr", "grib", "netcdf".
+
+    """
+    if os.path.isdir(path):
+        if any(os.path.exists(f'{path}/{fn}') for fn in ('.zmetadata', '.zgroup', '.zarray')):
+            return "zarr"
+        raise ValueError(f"{path} is neither a Zarr store nor a file.")
+
+    with open(path, 'rb') as f:
+        magic = f.read(8)
+    if magic.startswith(b'GRIB'):
+        return "grib"
+    if magic.startswith((b'CDF', b'\x89HDF')):
+        return "netcdf"
+
+    raise ValueError(f"The format of {path} is neither netCDF, GRIB nor Zarr.")
+
+
+def is_classic_netcdf(path):
+    """
+    Check whether a file is a classic netCDF file (i.e. the classic or 64-bit offset format) rather than an
+    HDF5-based netCDF-4 file. The variables of classic files are stored contiguously & uncompressed, so they
+    may be memory-mapped.
+
+    Args:
+        path (str): Path of the file.
+
+    Return (bool): True if the file is a classic netCDF file.
+
+    """
+    if not os.path.isfile(path):
+        return False
+    with open(path, 'rb') as f:
+        magic = f.read(4)
+
+    return magic[:3] == b'CDF' and magic[3:] in (b'\x01', b'\x02')
+
+
+def json_value(value):
+    """
+    Convert an attribute's value to a JSON-serializable value.
+
+    Args:
+        value (object): Attribute's value (e.g. a NumPy scalar or array).
+
+    Return (object): JSON-serializable value.
+
+    """
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    if isinstance(value, bytes):
+        return value.decode(errors='replace')
+
+    return value
+
+
+def inspect_netcdf(path):
+    """
+    Inspect the structure of a netCDF file from its header. No variable is read.
+
+    Args:
+        path (str): Path of the netCDF file.
+
+    Return (dict): Report holding the file's "format", "dims", "variables" (dims, shape, dtype, estimated uncompressed
+    "size_mb", chunking, compression & attributes per variable), "attrs", "groups" (nested reports) & the
+    "refactor_variables" which Xarray disallows (variables named after one of their dimensions, but not 1-D along it).
+
+    """
+    import netCDF4
+
+    def inspect_group(group):
+        dims = {name: {"size": len(dim), "unlimited": dim.isunlimited()} for name, dim in group.dimensions.items()}
+        variables = {}
+        for name, var in group.variables.items():
+            itemsize = getattr(var.dtype, 'itemsize', None)
+            filters = var.filters() if var.filters() else {}
+            chunking = var.chunking()
+            variables[name] = {"dims": list(var.dimensions), "shape": list(var.shape), "dtype": str(var.dtype),
+                               "size_mb": math.prod(var.shape)*itemsize/1024**2 if itemsize else None,
+                               "chunks": chunking if isinstance(chunking, list) else None,
+                               "compression": {k: v for k, v in filters.items() if v} or None,
+                               "attrs": {k: json_value(var.getncattr(k)) for k in var.ncattrs()}}
+
+        return {"dims": dims, "variables": variables,
+                "attrs": {k: json_value(group.getncattr(k)) for k in group.ncattrs()},
+                "refactor_variables": [name for name, var in group.variables.items()
+                                       if name in var.dimensions and var.dimensions != (name,)],
+                "groups": {name: inspect_group(subgroup) for name, subgroup in group.groups.items()}}
+
+    with netCDF4.Dataset(path) as nc:
+        report = {"path": path, "format": nc.data_model, **inspect_group(nc)}
+
+    return report
+
+
+def inspect_grib(path, grb_index_dir=None):
+    """
+    Inspect the structure of a GRIB file from its messages' headers. No data section is decoded.
+
+    Args:
+        path (str): Path of the GRIB file.
+
+        grb_index_dir (str): Location of the GRIB index cache. If set, the messages' headers are cached & reused
+                             by repeat inspections & conversions of the unchanged GRIB file. Default: None
+
+    Return (dict): Report holding the file's "format", number of "messages", "variables" (name, units, type(s) of level,
+    number of levels & steps, grid & estimated uncompressed "size_mb" per shortName) & the distinct "hypercubes" --
+    each w/ the "filter_by_keys" (the -k & -v flags) which select it, its variables, levels, steps & "size_mb".
+
+    """
+    from .grib_index_cache import GribIndexCache, scan_messages
+
+    messages = GribIndexCache(grb_index_dir).messages(path) if grb_index_dir else scan_messages(path)
+
+    # Summarize the messages per variable
+    variables = {}
+    for msg in messages:
+        var = variables.setdefault(msg['shortName'], {"name": msg['name'], "units": msg['units'], "type_of_level": [],
+                                                      "levels": set(), "steps": set(), "grid": [msg['Nj'], msg['Ni']],
+                                                      "messages": 0, "size_mb": 0.0})
+        if msg['typeOfLevel'] not in var["type_of_level"]:
+            var["type_of_level"].append(msg['typeOfLevel'])
+        var["levels"].add((msg['typeOfLevel'], msg['level']))
+        var["steps"].add(msg['step'])
+        var["messages"] += 1
+        var["size_mb"] += (msg['numberOfPoints'] or 0)*GRIB_VALUE_BYTES/1024**2
+
+    # Group the messages into hypercubes by type of level (& step type, where a type of level has several).
+    # Xarray represents a single hypercube per variable, so a GRIB file w/ several hypercubes is converted one
+    # hypercube at a time (or every hypercube at once via -a).
+    step_types = {}
+    for msg in messages:
+        step_types.setdefault(msg['typeOfLevel'], set()).add(msg['stepType'])
+    hypercubes = {}
+    for msg in messages:
+        filter_by_keys = {"typeOfLevel": msg['typeOfLevel']}
+        if len(step_types[msg['typeOfLevel']]) > 1:
+            filter_by_keys["stepType"] = msg['stepType']
+        name = '_'.join(f'{k}{v}' for k, v in filter_by_keys.items())
+        cube = hypercubes.setdefault(name, {"filter_by_keys": filter_by_keys, "variables": set(), "levels": set(),
+                                            "steps": set(), "messages": 0, "size_mb": 0.0})
+        cube["variables"].add(msg['shortName'])
+        cube["levels"].add(msg['level'])
+        cube["steps"].add(msg['step'])
+        cube["messages"] += 1
+        cube["size_mb"] += (msg['numberOfPoints'] or 0)*GRIB_VALUE_BYTES/1024**2
+
+    for var in variables.values():
+        var["levels"], var["steps"] = len(var["levels"]), len(var["steps"])
+    for cube in hypercubes.values():
+        cube["variables"] = sorted(cube["variables"])
+        cube["levels"] = sorted(cube["levels"], key=str)
+        cube["steps"] = sorted(cube["steps"], key=str)
+
+    return {"path": path, "format": "GRIB", "messages": len(messages), "variables": variables, "hypercubes": hypercubes}
+
+
+def read_zarr_metadata(store):
+    """
+    Read the metadata objects of a Zarr store (v2) w/o reading its chunks.
+
+    Args:
+        store (str): Path of the Zarr store.
+
+    Return (dict): Metadata object per key (e.g. "t/.zarray", ".zattrs"). A consolidated store's metadata is
+    read w/ a single read.
+
+    """
+    if os.path.exists(f'{store}/.zmetadata'):
+        with open(f'{store}/.zmetadata') as f:
+            return json.load(f)['metadata']
+
+    metadata = {}
+    for root, dirs, files in os.walk(store):
+        rel = os.path.relpath(root, store)
+        for fn in ('.zgroup', '.zarray', '.zattrs'):
+            if fn in files:
+                with open(f'{root}/{fn}') as f:
+                    metadata[fn if rel == '.' else f'{rel}/{fn}'] = json.load(f)
+
+        # The chunks of an array are not walked
+        if '.zarray' in files:
+            dirs[:] = []
+
+    return metadata
+
+
+def inspect_zarr(store):
+    """
+    Inspect the structure of a Zarr store from its metadata. No chunk is read.
+
+    Args:
+        store (str): Path of the Zarr store.
+
+    Return (dict): Report holding the store's "format", "consolidated", "dims", "variables" (dims, shape, dtype,
+    estimated uncompressed "size_mb", chunks, compression & attributes per array), "attrs" & "groups" (nested reports).
+
+    """
+    metadata = read_zarr_metadata(store)
+
+    def inspect_group(prefix):
+        dims, variables, groups = {}, {}, {}
+        for key, meta in metadata.items():
+            path, fn = os.path.split(key)
+            parent, name = os.path.split(path)
+            if fn == '.zarray' and parent == prefix:
+                attrs = metadata.get(f'{path}/.zattrs', {})
+                dtype = meta['dtype'] if isinstance(meta['dtype'], str) else None
+                itemsize = int(dtype[2:]) if dtype and dtype[2:].isdigit() else None
+                var_dims = attrs.get('_ARRAY_DIMENSIONS', [])
+                dims.update({dim: {"size": size, "unlimited": False} for dim, size in zip(var_dims, meta['shape'])})
+                variables[name] = {"dims": var_dims, "shape": meta['shape'], "dtype": meta['dtype'],
+                                   "size_mb": math.prod(meta['shape'])*itemsize/1024**2 if itemsize else None,
+                                   "chunks": meta['chunks'], "compression": meta['compressor'],
+                                   "attrs": {k: v for k, v in attrs.items() if k != '_ARRAY_DIMENSIONS'}}
+            elif fn == '.zgroup' and parent == prefix and path:
+                groups[name] = inspect_group(path)
+
+        return {"dims": dims, "variables": variables, "attrs": metadata.get(f'{prefix}/.zattrs' if prefix else '.zattrs', {}),
+                "groups": groups}
+
+    return {"path": store, "format": "Zarr", "consolidated": os.path.exists(f'{store}/.zmetadata'), **inspect_group('')}
+
+
+def inspect_file(path, grb_index_dir=None):
+    """
+    Inspect the structure of a netCDF file, GRIB file or Zarr store from its metadata only (headers, GRIB section
+    metadata or Zarr metadata objects). No data is read or decoded.
+
+    Args:
+        path (str): Path of the file or Zarr store.
+
+        grb_index_dir (str): GRIB only. Location of the GRIB index cache (see inspect_grib()). Default: None
+
+    Return (dict): Report of the file (see inspect_netcdf(), inspect_grib() & inspect_zarr()) w/ its size on disk
+    ("file_mb") & the time to inspect it ("seconds").
+
+    """
+    import time
+    from .run_manifest import path_size
+
+    start_t = time.time()
+    file_format = detect_format(path)
+    if file_format == "zarr":
+        report = inspect_zarr(path)
+    elif file_format == "grib":
+        report = inspect_grib(path, grb_index_dir)
+    else:
+        report = inspect_netcdf(path)
+    report["file_mb"] = path_size(path)/1024**2
+    report["seconds"] = time.time()-start_t
+
+    return report
+
+
+def format_report(report, indent=""):
+    """
+    Format an inspection report as text to print to prompted screen.
+
+    Args:
+        report (dict): Report of the file (see inspect_file()).
+
+        indent (str): Indentation of nested groups. Default: ""
+
+    Return (str): Report as text.
+
+    """
+    lines = []
+    if not indent:
+        lines += [f"\n== {report['path']} ({report['format']}, {report['file_mb']:.1f} MB on disk, inspected in {report['seconds']:.3f} s) =="]
+
+    # GRIB: Variables & hypercubes
+    if "hypercubes" in report:
+        lines += [f"\n== Variable(s): {len(report['variables'])} across {report['messages']} message(s) ==\n"]
+        for name, var in report['variables'].items():
+            lines += [f"- {name:10s} {var['name']} [{var['units']}]  {', '.join(map(str, var['type_of_level']))}  "
+                      f"levels: {var['levels']}  steps: {var['steps']}  grid: {var['grid'][0]} x {var['grid'][1]}  {var['size_mb']:.1f} MB"]
+        lines += [f"\n== Hypercube(s): {len(report['hypercubes'])} ==\n"]
+        for name, cube in report['hypercubes'].items():
+            flags = f"-k {' '.join(cube['filter_by_keys'])} -v {' '.join(map(str, cube['filter_by_keys'].values()))}"
+            lines += [f"- {name}  ({flags})  {cube['messages']} message(s)  {cube['size_mb']:.1f} MB",
+                      f"    variables: {' '.join(map(str, cube['variables']))}",
+                      f"    levels: {', '.join(map(str, cube['levels']))}  steps: {', '.join(map(str, cube['steps']))}"]
+        return "\n".join(lines)
+
+    # netCDF & Zarr: Dimensions, variables & groups
+    lines += [f"\n{indent}== Dimension(s) ==\n"]
+    lines += [f"{indent}- {name} = {dim['size']}" + (" (unlimited)" if dim['unlimited'] else "") for name, dim in report['dims'].items()]
+    lines += [f"\n{indent}== Variable(s) ==\n"]
+    for name, var in report['variables'].items():
+        size = f"{var['size_mb']:.1f} MB" if var['size_mb'] is not None else "n/a"
+        lines += [f"{indent}- {name}  ({', '.join(var['dims'])})  {var['dtype']}  {size}"
+                  + (f"  chunks: {tuple(var['chunks'])}" if var['chunks'] else "")]
+    if report.get('refactor_variables'):
+        lines += [f"\n{indent}* Note: Xarray disallows the following variables named after their dimensions. To convert, append: -d {' '.join(report['refactor_variables'])}"]
+    for name, group in report['groups'].items():
+        lines += [f"\n{indent}== Group: {name} =="]
+        lines += [format_report(group, indent + "    ")]
+
+    return "\n".join(lines)
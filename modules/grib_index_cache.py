@@ -0,0 +1,198 @@
+import os
+import json
+import shutil
+import hashlib
+import eccodes
+
+class GribIndexCache():
+    """
+
+    Managed on-disk cache of cfgrib indexes & GRIB message offsets.
+
+    Each cached GRIB file has its own entry under the cache directory, keyed by the file's
+    path, size & modification time -- so an entry is never reused once the GRIB file changes.
+    An entry holds the cfgrib index(es) of the file & the offsets & header keys of its messages.
+    Entries are evicted least recently used first once the cache exceeds its size limit.
+
+    """
+    # GRIB header keys recorded per message
+    MESSAGE_KEYS = ('shortName', 'name', 'units', 'paramId', 'typeOfLevel', 'level', 'stepType', 'step',
+                    'dataDate', 'dataTime', 'gridType', 'Ni', 'Nj', 'numberOfPoints', 'bitsPerValue')
+
+    def __init__(self, cache_dir="../grib_index_cache", max_size_mb=1024):
+        """
+        Args:
+            cache_dir (str): Location of the cache. Default: "../grib_index_cache"
+
+            max_size_mb (float): Size limit (in MB) of the cache. Default: 1024
+
+        """
+        self.cache_dir = cache_dir
+        self.max_size_mb = max_size_mb
+
+        # Create directory for storing the cache
+        try:
+            os.makedirs(self.cache_dir)
+        except FileExistsError:
+            pass
+
+    def entry_dir(self, grib_path):
+        """
+        Locate (& create) the cache entry of a GRIB file.
+
+        Args:
+            grib_path (str): Path of the GRIB file.
+
+        Return (str): Directory of the GRIB file's cache entry.
+
+        """
+        grib_path = os.path.abspath(grib_path)
+        stat = os.stat(grib_path)
+        key = hashlib.sha1(f'{grib_path}:{stat.st_size}:{stat.st_mtime_ns}'.encode()).hexdigest()[:16]
+        entry = f'{self.cache_dir}/{os.path.basename(grib_path)}.{key}'
+
+        try:
+            os.makedirs(entry)
+        except FileExistsError:
+            pass
+
+        # Mark entry as recently used
+        os.utime(entry)
+
+        return entry
+
+    def indexpath(self, grib_path):
+        """
+        cfgrib index path of a GRIB file.
+
+        Args:
+            grib_path (str): Path of the GRIB file.
+
+        Return (str): Template of the cfgrib index path to pass as cfgrib's "indexpath" backend argument.
+        cfgrib fills in {short_hash} from the index keys, which include the keys of filter_by_keys.
+
+        """
+        return f'{self.entry_dir(grib_path)}/{{short_hash}}.idx'
+
+    def messages(self, grib_path, filter_by_keys={}):
+        """
+        Offsets & header keys of a GRIB file's messages.
+
+        The GRIB file is scanned once (headers only -- the data sections are not decoded) & the
+        result is cached. Subsequent calls read the cached result.
+
+        Args:
+            grib_path (str): Path of the GRIB file.
+
+            filter_by_keys (dict): GRIB key-value pairs the messages must match. Default: {}
+
+        Return (list): Dictionary per message holding its "offset", "length" & header keys (see MESSAGE_KEYS).
+
+        """
+        messages_path = f'{self.entry_dir(grib_path)}/messages.json'
+
+        if os.path.exists(messages_path):
+            with open(messages_path) as f:
+                messages = json.load(f)
+        else:
+            messages = self.scan_messages(grib_path)
+
+            # Write to a temporary file first, so concurrent readers never see a partial file
+            with open(f'{messages_path}.{os.getpid()}.tmp', 'w') as f:
+                json.dump(messages, f, default=str)
+            os.replace(f'{messages_path}.{os.getpid()}.tmp', messages_path)
+            self.evict()
+
+        return [msg for msg in messages
+                if all(str(msg.get(k)) == str(v) for k,v in filter_by_keys.items())]
+
+    def scan_messages(self, grib_path):
+        """
+        Scan the headers of a GRIB file's messages (see scan_messages()).
+
+        Args:
+            grib_path (str): Path of the GRIB file.
+
+        Return (list): Dictionary per message holding its "offset", "length" & header keys (see MESSAGE_KEYS).
+
+        """
+        return scan_messages(grib_path, self.MESSAGE_KEYS)
+
+    def size(self, path=None):
+        """
+        Size (in bytes) of the cache or one of its entries.
+
+        Args:
+            path (str): Directory of interest. Default: None (whole cache)
+
+        Return (int): Size in bytes.
+
+        """
+        total = 0
+        for root, _, files in os.walk(path or self.cache_dir):
+            for fn in files:
+                try:
+                    total += os.path.getsize(f'{root}/{fn}')
+                except FileNotFoundError:
+                    pass
+
+        return total
+
+    def evict(self):
+        """
+        Evict the least recently used entries until the cache is within its size limit.
+
+        Args:
+            None
+
+        Return (list): Evicted entries.
+
+        """
+        entries = [f'{self.cache_dir}/{name}' for name in os.listdir(self.cache_dir)]
+        entries = sorted((e for e in entries if os.path.isdir(e)), key=os.path.getmtime)
+        sizes = {e: self.size(e) for e in entries}
+        total = sum(sizes.values())
+
+        # The most recently used entry is always kept
+        evicted = []
+        for entry in entries[:-1]:
+            if total <= self.max_size_mb*1024**2:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= sizes[entry]
+            evicted.append(entry)
+
+        return evicted
+
+
+def scan_messages(grib_path, keys=GribIndexCache.MESSAGE_KEYS):
+    """
+    Scan the headers of a GRIB file's messages. The data sections are not decoded.
+
+    Args:
+        grib_path (str): Path of the GRIB file.
+
+        keys (tuple): GRIB header keys recorded per message. Default: GribIndexCache.MESSAGE_KEYS
+
+    Return (list): Dictionary per message holding its "offset", "length" & header keys.
+
+    """
+    messages = []
+    with open(grib_path, 'rb') as f:
+        while True:
+            gid = eccodes.codes_grib_new_from_file(f, headers_only=True)
+            if gid is None:
+                break
+            try:
+                msg = {'offset': eccodes.codes_get(gid, 'offset'),
+                       'length': eccodes.codes_get(gid, 'totalLength')}
+                for k in keys:
+                    try:
+                        msg[k] = eccodes.codes_get(gid, k)
+                    except eccodes.KeyValueNotFoundError:
+                        msg[k] = None
+                messages.append(msg)
+            finally:
+                eccodes.codes_release(gid)
+
+    return messages
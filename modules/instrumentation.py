@@ -0,0 +1,376 @@
+import io
+import json
+import time
+import pstats
+import cProfile
+import weakref
+import threading
+import tracemalloc
+import contextlib
+from collections.abc import MutableMapping
+
+# Stages of a conversion, timed as named spans.
+# - "download": Download of a cloud object.
+# - "open": Open the file & index its variables (e.g. cfgrib's GRIB index).
+# - "rename" & "merge": Refactor duplicated variable names & merge the hypercubes of the variables of interest.
+# - "decode": Read & decode the data into memory (e.g. cfgrib's GRIB message decode).
+# - "encode": Build the Zarr's chunking & compression encoding & chunk the data.
+# - "zarr-write": Write to Zarr. Includes reading lazily opened data, compressing & writing the chunks.
+# - "compress": Compress each chunk (summed across workers).
+# - "store-write": Write each compressed chunk & metadata object to the store (summed across workers).
+STAGES = ('download', 'open', 'rename', 'merge', 'decode', 'encode', 'zarr-write', 'compress', 'store-write')
+
+# Codec ID of the timed compressors (see TimedCodec), which only appear in the Zarr metadata read via a TimedStore
+TIMED_CODEC_ID = 'data_converter.timed'
+
+# TimedStores by ID, so each timed compressor records to the instrumentation of the TimedStore it was read from
+TIMED_STORES = weakref.WeakValueDictionary()
+
+
+class Instrumentation():
+    """
+
+    Lightweight instrumentation of a conversion w/ named spans (e.g. "open", "decode", "compress"), byte counters &
+    optional cProfile & tracemalloc capture. The results are emitted as JSON or as OpenMetrics-style text.
+
+    Spans of the same name accumulate their time & count. Spans & counters are thread-safe, so per-chunk spans
+    (e.g. "compress") are summed across the workers.
+
+    """
+    def __init__(self, enabled=False, cprofile=False, trace_memory=False):
+        """
+        Args:
+            enabled (bool): Record the spans & byte counters. Default: False (no overhead)
+
+            cprofile (bool): Capture a cProfile profile of the conversion (see start()). Default: False
+
+            trace_memory (bool): Capture the peak memory allocated by Python via tracemalloc. Default: False
+
+        """
+        self.enabled = enabled or cprofile or trace_memory
+        self.cprofile = cprofile
+        self.trace_memory = trace_memory
+        self.spans = {}
+        self.counters = {}
+        self.profile_stats = None
+        self.peak_traced_bytes = None
+        self.profiler = None
+        self.lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def span(self, name):
+        """
+        Time a named stage of the conversion.
+
+        Args:
+            name (str): Name of the stage (see STAGES).
+
+        Return (contextmanager): Context in which the stage runs.
+
+        """
+        if not self.enabled:
+            yield
+            return
+
+        start_t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter()-start_t)
+
+    def add_time(self, name, seconds):
+        """
+        Add the time of a stage to its span.
+
+        Args:
+            name (str): Name of the stage.
+
+            seconds (float): Time spent within the stage.
+
+        Return: None
+
+        """
+        with self.lock:
+            span = self.spans.setdefault(name, {"seconds": 0.0, "count": 0})
+            span["seconds"] += seconds
+            span["count"] += 1
+
+        return
+
+    def add_bytes(self, name, nbytes):
+        """
+        Add to a byte counter (e.g. the bytes decoded or written to the store).
+
+        Args:
+            name (str): Name of the counter.
+
+            nbytes (int): Number of bytes.
+
+        Return: None
+
+        """
+        if not self.enabled:
+            return
+
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + int(nbytes)
+
+        return
+
+    def start(self):
+        """
+        Start the cProfile & tracemalloc capture (if requested).
+
+        Args:
+            None
+
+        Return: None
+
+        """
+        if self.cprofile:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+        return
+
+    def stop(self, top=25):
+        """
+        Stop the cProfile & tracemalloc capture (if requested).
+
+        Args:
+            top (int): Number of functions (by cumulative time) kept from the cProfile profile. Default: 25
+
+        Return: None
+
+        """
+        if self.profiler is not None:
+            self.profiler.disable()
+            stream = io.StringIO()
+            pstats.Stats(self.profiler, stream=stream).sort_stats('cumulative').print_stats(top)
+            self.profile_stats = stream.getvalue()
+            self.profiler = None
+        if self.trace_memory and tracemalloc.is_tracing():
+            self.peak_traced_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        return
+
+    def to_dict(self):
+        """
+        Convert the instrumentation's results to a dictionary.
+
+        Args:
+            None
+
+        Return (dict): "spans" (seconds & count per stage), "counters" (bytes per counter), "peak_traced_bytes"
+        (tracemalloc only) & "profile" (cProfile only; the top functions by cumulative time as text).
+
+        """
+        with self.lock:
+            return {"spans": {name: dict(span) for name, span in self.spans.items()}, "counters": dict(self.counters),
+                    "peak_traced_bytes": self.peak_traced_bytes, "profile": self.profile_stats}
+
+    def to_openmetrics(self, prefix="data_converter"):
+        """
+        Convert the instrumentation's results to OpenMetrics-style text.
+
+        Args:
+            prefix (str): Prefix of the metric names. Default: "data_converter"
+
+        Return (str): Metrics as text, e.g. data_converter_span_seconds_total{span="decode"} 1.25
+
+        """
+        results = self.to_dict()
+        lines = [f"# TYPE {prefix}_span_seconds counter", f"# UNIT {prefix}_span_seconds seconds"]
+        lines += [f'{prefix}_span_seconds_total{{span="{name}"}} {span["seconds"]}' for name, span in results["spans"].items()]
+        lines += [f"# TYPE {prefix}_span counter"]
+        lines += [f'{prefix}_span_total{{span="{name}"}} {span["count"]}' for name, span in results["spans"].items()]
+        lines += [f"# TYPE {prefix}_bytes counter", f"# UNIT {prefix}_bytes bytes"]
+        lines += [f'{prefix}_bytes_total{{counter="{name}"}} {nbytes}' for name, nbytes in results["counters"].items()]
+        if results["peak_traced_bytes"] is not None:
+            lines += [f"# TYPE {prefix}_peak_traced_bytes gauge", f"# UNIT {prefix}_peak_traced_bytes bytes",
+                      f"{prefix}_peak_traced_bytes {results['peak_traced_bytes']}"]
+        lines += ["# EOF"]
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, metrics_path):
+        """
+        Write the instrumentation's results to a file.
+
+        Args:
+            metrics_path (str): Path of the metrics file. For a ".json" or ".jsonl" extension, a JSON line is appended
+                                per run. Otherwise (e.g. ".prom", ".txt"), the file is overwritten w/ OpenMetrics-style text
+                                (e.g. for a node exporter's textfile collector).
+
+        Return: None
+
+        """
+        if metrics_path.endswith(('.json', '.jsonl')):
+            with open(metrics_path, 'a') as f:
+                f.write(json.dumps(self.to_dict()) + "\n")
+        else:
+            with open(metrics_path, 'w') as f:
+                f.write(self.to_openmetrics())
+
+        return
+
+    def summary(self):
+        """
+        Summary of the spans & byte counters to print to prompted screen.
+
+        Args:
+            None
+
+        Return (str): One line per span (seconds & count) & per byte counter (MB).
+
+        """
+        results = self.to_dict()
+        lines = [f"{name:12s} {span['seconds']:10.3f} s ({span['count']}x)" for name, span in results["spans"].items()]
+        lines += [f"{name:12s} {nbytes/1024**2:10.1f} MB" for name, nbytes in results["counters"].items()]
+        if results["peak_traced_bytes"] is not None:
+            lines += [f"{'peak traced':12s} {results['peak_traced_bytes']/1024**2:10.1f} MB"]
+
+        return "\n".join(lines)
+
+
+class TimedCodec():
+    """
+
+    Wraps a numcodecs compressor to time its encode as the "compress" span & to count the bytes compressed.
+
+    A TimedStore serves the Zarr's metadata w/ each array's compressor wrapped, so only the arrays opened via
+    the TimedStore (i.e. those of the timed write) are timed. The Zarr's metadata is stored w/o the wrapper.
+
+    """
+    codec_id = TIMED_CODEC_ID
+
+    def __init__(self, codec, store_id=None):
+        """
+        Args:
+            codec (object): numcodecs compressor (e.g. Blosc, Zstd).
+
+            store_id (int): ID of the TimedStore, whose instrumentation the span & counters are recorded to.
+                            Default: None (not recorded)
+
+        """
+        self.codec = codec
+        self.store_id = store_id
+        store = TIMED_STORES.get(store_id)
+        self.instrumentation = store.instrumentation if store is not None else Instrumentation()
+
+    def encode(self, buf):
+        with self.instrumentation.span('compress'):
+            encoded = self.codec.encode(buf)
+        self.instrumentation.add_bytes('uncompressed', getattr(buf, 'nbytes', None) or len(buf))
+        self.instrumentation.add_bytes('compressed', len(encoded))
+
+        return encoded
+
+    def decode(self, buf, out=None):
+        return self.codec.decode(buf, out)
+
+    def get_config(self):
+        return {'id': self.codec_id, 'codec': self.codec.get_config(), 'store': self.store_id}
+
+    @classmethod
+    def from_config(cls, config):
+        from numcodecs.registry import get_codec
+
+        return cls(get_codec(config['codec']), config.get('store'))
+
+
+def timed_compressors(metadata, store_id):
+    """
+    Wrap the compressor of an array's metadata (or of each array of consolidated metadata) in a TimedCodec.
+
+    Args:
+        metadata (dict): Metadata of a Zarr array (".zarray") or the consolidated metadata (".zmetadata").
+
+        store_id (int): ID of the TimedStore (or None, to remove the wrapper instead).
+
+    Return (dict): Metadata w/ the compressors wrapped (or unwrapped).
+
+    """
+    for meta in [metadata] + [meta for key, meta in metadata.get('metadata', {}).items() if key.endswith('.zarray')]:
+        compressor = meta.get('compressor')
+        if compressor is None:
+            continue
+        if compressor['id'] == TIMED_CODEC_ID:
+            compressor = compressor['codec']
+        meta['compressor'] = compressor if store_id is None else {'id': TIMED_CODEC_ID, 'codec': compressor, 'store': store_id}
+
+    return metadata
+
+
+class TimedStore(MutableMapping):
+    """
+
+    Wraps a Zarr store to time each write of a chunk or metadata object as the "store-write" span & to count
+    the bytes written.
+
+    Zarr re-creates each array's compressor from its metadata, so the arrays' metadata is read w/ each
+    compressor wrapped in a TimedCodec, which times the compression of the chunks written via the store.
+    The metadata is written w/o the wrapper, so the Zarr is read as usual.
+
+    """
+    def __init__(self, store, instrumentation):
+        """
+        Args:
+            store (str or MutableMapping): Path of the Zarr store (or a Zarr store).
+
+            instrumentation (Instrumentation): Instrumentation to record the span & counters to.
+
+        """
+        import zarr
+        from numcodecs.registry import codec_registry, register_codec
+        if isinstance(store, str):
+            store = zarr.storage.DirectoryStore(store)
+        self.store = store
+        self.instrumentation = instrumentation
+
+        # The wrapper is registered under its own codec ID. The registered compressors are unchanged.
+        if TIMED_CODEC_ID not in codec_registry:
+            register_codec(TimedCodec)
+        TIMED_STORES[id(self)] = self
+
+    def __getitem__(self, key):
+        value = self.store[key]
+        if key.endswith(('.zarray', '.zmetadata')):
+            value = json_dumps(timed_compressors(json.loads(value), id(self)))
+
+        return value
+
+    def __setitem__(self, key, value):
+        if key.endswith(('.zarray', '.zmetadata')):
+            value = json_dumps(timed_compressors(json.loads(value), None))
+        with self.instrumentation.span('store-write'):
+            self.store[key] = value
+        self.instrumentation.add_bytes('store-write', getattr(value, 'nbytes', None) or len(value))
+
+    def __delitem__(self, key):
+        del self.store[key]
+
+    def __iter__(self):
+        return iter(self.store)
+
+    def __len__(self):
+        return len(self.store)
+
+    def __contains__(self, key):
+        return key in self.store
+
+
+def json_dumps(metadata):
+    """
+    Encode Zarr metadata as JSON, alike Zarr.
+
+    Args:
+        metadata (dict): Zarr metadata.
+
+    Return (bytes): JSON.
+
+    """
+    return json.dumps(metadata, indent=4, sort_keys=True, ensure_ascii=True, separators=(',', ': ')).encode('ascii')
@@ -1,5 +1,114 @@
+import itertools
+import threading
+from collections import OrderedDict
+import numpy as np
 import dask.array as da
-import zarr
+import xarray as xr
+from .zarr_metadata import open_zarr, open_group
+
+class ChunkCache():
+    """
+
+    In-process LRU cache of decompressed Zarr chunks w/ a byte budget.
+
+    Chunks are keyed by Zarr, variable & chunk index. Once the cached chunks exceed the byte budget,
+    the least recently used chunks are evicted first. A cache may be shared by several LoadZarrData
+    objects (e.g. one per Zarr within a service).
+
+    """
+    def __init__(self, max_mb=256):
+        """
+        Args:
+            max_mb (float): Byte budget (in MB) of the cached chunks. If 0, no chunks are cached. Default: 256
+
+        """
+        self.max_bytes = int(max_mb*1024**2)
+        self.chunks = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Get a decompressed chunk from the cache.
+
+        Args:
+            key (tuple): Zarr, variable & chunk index of the chunk.
+
+        Return (ndarray): Decompressed chunk (or None, if the chunk is not cached).
+
+        """
+        with self.lock:
+            chunk = self.chunks.get(key)
+            if chunk is None:
+                self.misses += 1
+                return None
+
+            # Mark chunk as recently used
+            self.chunks.move_to_end(key)
+            self.hits += 1
+
+            return chunk
+
+    def put(self, key, chunk):
+        """
+        Cache a decompressed chunk & evict the least recently used chunks beyond the byte budget.
+
+        Args:
+            key (tuple): Zarr, variable & chunk index of the chunk.
+
+            chunk (ndarray): Decompressed chunk.
+
+        Return: None
+
+        """
+        if chunk.nbytes > self.max_bytes:
+            return
+
+        with self.lock:
+            if key in self.chunks:
+                self.nbytes -= self.chunks.pop(key).nbytes
+            self.chunks[key] = chunk
+            self.nbytes += chunk.nbytes
+            while self.nbytes > self.max_bytes:
+                _, evicted = self.chunks.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+
+        return
+
+    def clear(self):
+        """
+        Evict every chunk from the cache & reset the hit/miss counters.
+
+        Args:
+            None
+
+        Return: None
+
+        """
+        with self.lock:
+            self.chunks.clear()
+            self.nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+        return
+
+    def info(self):
+        """
+        Statistics of the cache.
+
+        Args:
+            None
+
+        Return (dict): Number of "hits" & "misses", number of cached "chunks", cached "bytes" & "max_bytes".
+
+        """
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "chunks": len(self.chunks),
+                    "bytes": self.nbytes, "max_bytes": self.max_bytes}
+
 
 class LoadZarrData():
     """
@@ -7,32 +116,209 @@ class LoadZarrData():
     Loads Zarr.
 
     Args:
-        zarr_store (str): Name of the Zarr under the location of the 
-                          zarr files (default: "../zarr_data"). 
-                          
-        variable (str): Variable of interest within Zarr.
+        zarr_store (str): Name of the Zarr under the location of the
+                          zarr files (default: "../zarr_data").
+
+        variable (str): Variable of interest within Zarr. Default: None (only required for as_dask_array())
+
+        zarr_dir (str): Location of the zarr files. Default: "../zarr_data"
+
+        cache_mb (float): Byte budget (in MB) of the decompressed chunks cached in-process. Default: 256
+
+        chunk_cache (ChunkCache): Chunk cache to share w/ other LoadZarrData objects. Overrides cache_mb.
+                                  Default: None (a cache per object)
 
     """
-    def __init__(self, zarr_store, variable, zarr_dir="../zarr_data"):
+    def __init__(self, zarr_store, variable=None, zarr_dir="../zarr_data", cache_mb=256, chunk_cache=None):
         self.zarr_store = zarr_store
         self.variable = variable
         self.zarr_dir = zarr_dir
+        self.chunk_cache = chunk_cache if chunk_cache is not None else ChunkCache(cache_mb)
+
+        # The Zarr's metadata is opened upon the first read (see open())
+        self.zarr_group = None
+        self.data_xr = None
+
 
-        
     def as_dask_array(self):
         """
         Load Zarr as Dask Array.
-        
+
         Args:
             None
-            
-        Return (dask.array.Array): A parallel N dimensioned array comprised of many 
+
+        Return (dask.array.Array): A parallel N dimensioned array comprised of many
         numpy arrays arranged in a grid.
-        
+
         """
-        
+
         # Load zarr as a dask array
-        dask_array = da.from_zarr(f"{self.zarr_dir}/{self.zarr_store}.zarr", 
+        dask_array = da.from_zarr(f"{self.zarr_dir}/{self.zarr_store}.zarr",
                                   component=self.variable)
-        
-        return dask_array
\ No newline at end of file
+
+        return dask_array
+
+    def open(self):
+        """
+        Open the Zarr's metadata & coordinates once per object.
+
+        Args:
+            None
+
+        Return (Dataset): Zarr's lazy Xarray Dataset. The data variables are not read.
+
+        """
+        if self.data_xr is None:
+            self.zarr_group = open_group(f"{self.zarr_dir}/{self.zarr_store}.zarr")
+            self.data_xr = open_zarr(f"{self.zarr_dir}/{self.zarr_store}.zarr")
+
+        return self.data_xr
+
+    def sel2isel(self, sel, method=None):
+        """
+        Translate a label-based selection into an index-based selection.
+
+        Args:
+            sel (dict): Label-based selection per dimension (e.g. {"latitude": slice(55, 20)}). String
+                        labels are cast to the type of the dimension's coordinate.
+
+            method (str): Method for inexact matches of single labels (e.g. "nearest"). Default: None (exact)
+
+        Return (dict): Index-based selection per dimension.
+
+        """
+        data_xr = self.open()
+        isel = {}
+        for dim, labels in sel.items():
+            coord = data_xr[dim]
+            if coord.dtype.kind in 'iuf':
+                cast = lambda label: coord.dtype.type(label) if isinstance(label, str) else label
+                labels = slice(cast(labels.start), cast(labels.stop), labels.step) if isinstance(labels, slice) else cast(labels)
+
+            # Select the positions of the labels along the dimension
+            positions = xr.DataArray(np.arange(coord.size), coords={dim: coord.values}, dims=dim)
+            if isinstance(labels, slice):
+                positions = positions.sel({dim: labels})
+            else:
+                positions = positions.sel({dim: labels}, method=method)
+            isel[dim] = int(positions) if positions.ndim == 0 else positions.values
+
+        return isel
+
+    def read_chunk(self, variable, chunk_index):
+        """
+        Read a decompressed chunk of a variable, via the chunk cache.
+
+        Args:
+            variable (str): Variable of interest within Zarr.
+
+            chunk_index (tuple): Index of the chunk along each dimension.
+
+        Return (ndarray): Decompressed chunk.
+
+        """
+        key = (self.zarr_dir, self.zarr_store, variable, chunk_index)
+        chunk = self.chunk_cache.get(key)
+        if chunk is None:
+            array = self.zarr_group[variable]
+            chunk = array[tuple(slice(i*c, min((i+1)*c, n)) for i, c, n in zip(chunk_index, array.chunks, array.shape))]
+            self.chunk_cache.put(key, chunk)
+
+        return chunk
+
+    def read_region(self, variable, isel=None):
+        """
+        Read a region of a variable's raw (CF-encoded) data. Only the chunks overlapping the region are read &
+        decompressed -- or taken from the chunk cache.
+
+        Args:
+            variable (str): Variable of interest within Zarr.
+
+            isel (dict): Index-based selection per dimension. Options per dimension: an integer (the dimension
+                         is dropped), a slice or a list of indices. Default: None (entire variable)
+
+        Return (ndarray): Region of the variable's data.
+
+        """
+        self.open()
+        array = self.zarr_group[variable]
+        dims = array.attrs['_ARRAY_DIMENSIONS']
+        isel = isel or {}
+
+        # Positions to read along each dimension & the bounding range spanning them. Integer selections drop their dimension.
+        positions = [np.atleast_1d(np.arange(n)[isel.get(dim, slice(None))]) for dim, n in zip(dims, array.shape)]
+        squeeze = tuple(i for i, dim in enumerate(dims) if isinstance(isel.get(dim), (int, np.integer)))
+        if any(p.size == 0 for p in positions):
+            return np.empty(tuple(p.size for p in positions), dtype=array.dtype).squeeze(axis=squeeze)
+        starts = [int(p.min()) for p in positions]
+        stops = [int(p.max())+1 for p in positions]
+        bounding = np.empty(tuple(stop-start for start, stop in zip(starts, stops)), dtype=array.dtype)
+
+        # Assemble the bounding range from its chunks
+        chunk_ranges = [range(start//c, (stop-1)//c+1) for start, stop, c in zip(starts, stops, array.chunks)]
+        for chunk_index in itertools.product(*chunk_ranges):
+            chunk = self.read_chunk(variable, chunk_index)
+            src, dst = [], []
+            for i, c, start, stop in zip(chunk_index, array.chunks, starts, stops):
+                lo, hi = max(i*c, start), min((i+1)*c, stop)
+                src.append(slice(lo-i*c, hi-i*c))
+                dst.append(slice(lo-start, hi-start))
+            bounding[tuple(dst)] = chunk[tuple(src)]
+
+        # Select the positions of interest from the bounding range
+        region = bounding[np.ix_(*[p-start for p, start in zip(positions, starts)])]
+
+        return region.squeeze(axis=squeeze)
+
+    def load(self, variables=None, sel=None, isel=None, method=None):
+        """
+        Load several variables of the Zarr into memory, selected by label and/or index. Repeat reads of the
+        same regions are served from the in-process chunk cache.
+
+        Args:
+            variables (list): Variables of interest within Zarr. Default: None (the variable of the object)
+
+            sel (dict): Label-based selection per dimension (e.g. {"latitude": slice(55, 20)}). Default: None
+
+            isel (dict): Index-based selection per dimension (e.g. {"time": 0}). Applied to the dimensions
+                         w/o a label-based selection. Default: None
+
+            method (str): Method for inexact matches of single labels (e.g. "nearest"). Default: None (exact)
+
+        Return (Dataset): Xarray Dataset of the selected variables & their coordinates, decoded as per the
+        CF conventions (e.g. scale factor, fill value & time units).
+
+        """
+        data_xr = self.open()
+        variables = variables or [self.variable]
+        missing = [name for name in variables if name not in data_xr.variables]
+        if missing:
+            raise ValueError(f"Variable(s) not within the Zarr: {missing}. Options: {list(data_xr.data_vars)}")
+
+        # Combine the label- & index-based selections
+        isel = {**(isel or {}), **self.sel2isel(sel or {}, method)}
+        selected_xr = data_xr[variables].isel({dim: index for dim, index in isel.items() if dim in data_xr[variables].dims})
+
+        # Read each variable's region via the chunk cache & decode it as per the CF conventions
+        for name in variables:
+            array = self.zarr_group[name]
+            attrs = {k: v for k, v in array.attrs.items() if k != '_ARRAY_DIMENSIONS'}
+            if array.fill_value is not None and '_FillValue' not in attrs:
+                attrs['_FillValue'] = array.fill_value
+            raw = xr.Variable(selected_xr[name].dims, self.read_region(name, isel), attrs)
+            decoded = xr.conventions.decode_cf_variable(name, raw)
+            selected_xr[name] = selected_xr[name].copy(data=decoded.values)
+
+        return selected_xr
+
+    def cache_info(self):
+        """
+        Statistics of the chunk cache.
+
+        Args:
+            None
+
+        Return (dict): Number of "hits" & "misses", number of cached "chunks", cached "bytes" & "max_bytes".
+
+        """
+        return self.chunk_cache.info()
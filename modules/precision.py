@@ -0,0 +1,206 @@
+# Float data types to downcast to
+DOWNCAST_DTYPES = ('float32', 'float16')
+
+# Widths (in bits) of the unsigned integers to pack into via scale & offset
+PACK_BITS = (8, 16, 32)
+
+# Number of explicit mantissa bits per float data type
+MANTISSA_BITS = {'float16': 10, 'float32': 23, 'float64': 52}
+
+# CF encoding keys of the source file which are replaced by the precision options
+PRECISION_ENCODING_KEYS = ('dtype', 'scale_factor', 'add_offset', '_FillValue', 'missing_value')
+
+
+def parse_precision(items):
+    """
+    Parse the precision options per variable from the command line.
+
+    Args:
+        items (list): Options per variable in the format of <VARIABLE>=<OPTION>[,<OPTION>], where "*" stands for
+                      every float data variable w/o options of its own, e.g. ["*=bits:10", "t=pack:16", "gh=float32,bits:12"].
+                      Options:
+                      "float32" or "float16" - Downcast to a smaller float data type.
+                      "bits:<N>" - Round to N mantissa bits (bit-rounding). The trailing mantissa bits are set to zero,
+                                   so the compressor compresses them away.
+                      "pack:<N>" - Pack into N-bit unsigned integers (N: 8, 16 or 32) via a scale factor & offset
+                                   spanning the variable's range, alike GRIB's simple packing.
+
+    Return (dict): Options per variable name, e.g. {"*": {"keep_bits": 10}, "t": {"pack_bits": 16}}.
+
+    """
+    precision = {}
+    for item in items or []:
+        name, options = item.split('=', 1)
+        var_precision = {}
+        for option in options.split(','):
+            if option in DOWNCAST_DTYPES:
+                var_precision['dtype'] = option
+            elif option.startswith('bits:'):
+                var_precision['keep_bits'] = int(option[5:])
+            elif option.startswith('pack:') and int(option[5:]) in PACK_BITS:
+                var_precision['pack_bits'] = int(option[5:])
+            else:
+                raise ValueError(f"Unknown precision option of {name}: {option}. Options: {', '.join(DOWNCAST_DTYPES)}, bits:<N>, pack:<{'|'.join(map(str, PACK_BITS))}>")
+        if 'pack_bits' in var_precision and len(var_precision) > 1:
+            raise ValueError(f"The precision of {name} is either packed or downcast & bit-rounded, not both.")
+        precision[name] = var_precision
+
+    return precision
+
+
+def variable_precision(data_xr, name, precision):
+    """
+    Precision options of a variable.
+
+    Args:
+        data_xr (Dataset): Xarray Dataset.
+
+        name (str): Name of the variable.
+
+        precision (dict): Options per variable name (see parse_precision()).
+
+    Return (dict): Variable's options -- its own, else those of "*" for float data variables (or None).
+
+    """
+    if name in precision:
+        return precision[name]
+    if name in data_xr.data_vars and data_xr[name].dtype.kind == 'f':
+        return precision.get('*')
+
+    return None
+
+
+def precision_encoding(data_xr, encoding, precision):
+    """
+    Add the precision options of each variable to its Zarr encoding. The lossy step is applied to the
+    data prior to its compression, so the Zarr's readers decode the data as usual.
+
+    Args:
+        data_xr (Dataset): Xarray Dataset.
+
+        encoding (dict): Encoding per variable name (see build_encoding()). Updated in place.
+
+        precision (dict): Options per variable name (see parse_precision()).
+
+    Return (dict): Encoding per variable name.
+
+    """
+    for name, var in data_xr.variables.items():
+        var_precision = variable_precision(data_xr, name, precision)
+        if not var_precision:
+            continue
+        if var.dtype.kind != 'f':
+            raise ValueError(f"The precision of {name} cannot be reduced because its data type is {var.dtype}, not float.")
+
+        # Replace the source file's packing & fill value
+        var_encoding = {k: v for k, v in encoding.get(name, {}).items() if k not in PRECISION_ENCODING_KEYS}
+
+        # Pack into unsigned integers spanning the variable's range. The largest integer is the fill value.
+        if 'pack_bits' in var_precision:
+            n = var_precision['pack_bits']
+            vmin, vmax = float(var.min()), float(var.max())
+            scale = (vmax-vmin)/(2**n-2) if vmax > vmin else 1.0
+            var_encoding.update({'dtype': f'uint{n}', 'scale_factor': var.dtype.type(scale),
+                                 'add_offset': var.dtype.type(vmin), '_FillValue': 2**n-1})
+
+        # Downcast & round to the mantissa bits of interest
+        else:
+            dtype = var_precision.get('dtype', str(var.dtype))
+            if 'dtype' in var_precision:
+                var_encoding['dtype'] = dtype
+            if 'keep_bits' in var_precision:
+                keep_bits = var_precision['keep_bits']
+                if not 0 <= keep_bits <= MANTISSA_BITS.get(dtype, 0):
+                    raise ValueError(f"The mantissa bits of {name} must be between 0 & {MANTISSA_BITS.get(dtype, 0)} for {dtype}, not {keep_bits}.")
+
+                # Imported upon use, so the CLI's options are parsed w/o importing the codecs
+                import numcodecs
+                var_encoding['filters'] = [numcodecs.BitRound(keepbits=keep_bits)]
+        encoding[name] = var_encoding
+
+    return encoding
+
+
+def copy_bit_rounded(data_xr, encoding):
+    """
+    Copy the data of the variables bit-rounded by their filters (see precision_encoding()). numcodecs' BitRound
+    rounds the buffer it is given in place & Zarr hands it the data's own buffer (or, for chunked loaded data,
+    a view of it), so writing the data itself would bit-round it in memory. Lazily read data is read into a
+    new buffer per chunk & is not copied.
+
+    Args:
+        data_xr (Dataset): Xarray Dataset to write to Zarr.
+
+        encoding (dict): Encoding per variable name.
+
+    Return (Dataset): Xarray Dataset to write, w/ the bit-rounded variables' data copied.
+
+    """
+    copies = {}
+    for name, var in data_xr.variables.items():
+        if not encoding.get(name, {}).get('filters'):
+            continue
+        if var.chunks is not None:
+            copies[name] = var.copy(data=var.data.map_blocks(lambda block: block.copy(), dtype=var.dtype))
+        elif var._in_memory:
+            copies[name] = var.copy(deep=True)
+
+    data_xr = data_xr.assign_coords({name: var for name, var in copies.items() if name in data_xr.coords})
+
+    return data_xr.assign({name: var for name, var in copies.items() if name in data_xr.data_vars})
+
+
+def precision_report(data_xr, written_xr, precision, store_sizes):
+    """
+    Report the size reduction & the error of each variable whose precision was reduced.
+
+    Args:
+        data_xr (Dataset): Xarray Dataset written to Zarr (i.e. the decoded source data).
+
+        written_xr (Dataset): Xarray Dataset of the Zarr, as decoded by its readers.
+
+        precision (dict): Options per variable name (see parse_precision()).
+
+        store_sizes (dict): Size (in bytes) of each variable within the Zarr.
+
+    Return (list): Dictionary per variable holding its "name", "options", decoded size ("decoded_mb"), size
+    within the Zarr ("stored_mb"), their ratio ("reduction"), the largest absolute error ("max_abs_error") & the
+    largest absolute error relative to the variable's largest magnitude ("max_rel_error").
+
+    """
+    rows = []
+    for name, var in data_xr.variables.items():
+        var_precision = variable_precision(data_xr, name, precision)
+        if not var_precision or name not in written_xr.variables:
+            continue
+        source, written = var.astype('float64'), written_xr.variables[name].astype('float64')
+        max_abs_error = float(abs(written - source).max())
+        max_abs = float(abs(source).max())
+        stored_mb = store_sizes.get(name, 0)/1024**2
+        options = ','.join(f'pack:{v}' if k == 'pack_bits' else f'bits:{v}' if k == 'keep_bits' else v
+                           for k, v in var_precision.items())
+        rows.append({"name": name, "options": options, "decoded_mb": var.nbytes/1024**2, "stored_mb": stored_mb,
+                     "reduction": var.nbytes/1024**2/stored_mb if stored_mb else float('inf'), "max_abs_error": max_abs_error,
+                     "max_rel_error": max_abs_error/max_abs if max_abs else 0.0})
+
+    return rows
+
+
+def format_precision_report(rows):
+    """
+    Format the precision report as text to print to prompted screen.
+
+    Args:
+        rows (list): Dictionary per variable (see precision_report()).
+
+    Return (str): Report as text.
+
+    """
+    lines = [f"{'variable':16s} {'options':18s} {'decoded (MB)':>12s} {'stored (MB)':>12s} {'reduction':>9s} {'max abs error':>14s} {'max rel error':>14s}"]
+    for row in rows:
+        lines.append(f"{row['name']:16s} {row['options']:18s} {row['decoded_mb']:12.2f} {row['stored_mb']:12.2f} {row['reduction']:8.1f}x "
+                     f"{row['max_abs_error']:14.6g} {row['max_rel_error']:14.6g}")
+    decoded_mb, stored_mb = sum(row['decoded_mb'] for row in rows), sum(row['stored_mb'] for row in rows)
+    lines.append(f"{'total':16s} {'':18s} {decoded_mb:12.2f} {stored_mb:12.2f} {decoded_mb/stored_mb if stored_mb else float('inf'):8.1f}x")
+
+    return "\n".join(lines)
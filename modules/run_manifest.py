@@ -0,0 +1,144 @@
+import os
+import json
+import time
+
+
+def path_size(path):
+    """
+    Size of a file or directory (e.g. a Zarr store) on local disk.
+
+    Args:
+        path (str): Path of the file or directory.
+
+    Return (int): Size (in bytes). 0 if the path does not exist (e.g. a cloud object).
+
+    """
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+
+    size = 0
+    for root, _, files in os.walk(path):
+        for fn in files:
+            try:
+                size += os.path.getsize(f'{root}/{fn}')
+            except OSError:
+                pass
+
+    return size
+
+
+class ConversionResult():
+    """
+
+    Result of a single conversion (e.g. a netCDF file to Zarr, or a GRIB hypercube to Zarr).
+
+    """
+    def __init__(self, input_path, output_path, start_t, error=None, status=None):
+        """
+        Args:
+            input_path (str or list): Path of the converted file (or cloud object). A list for conversions of
+                                      multiple files (e.g. the tiles of a mosaic).
+
+            output_path (str): Path of the newly converted file (or Zarr store).
+
+            start_t (float): Start time of the conversion (seconds since the epoch).
+
+            error (Exception or str): Reason of the failure. Default: None (the conversion succeeded)
+
+            status (str): Status of the conversion. Options: "success", "cached" (the existing output of an
+                          identical conversion was reused, see ConversionCache), "failed". Default: None
+                          ("success" w/o an error, "failed" otherwise)
+
+        """
+        self.input_path = input_path
+        self.output_path = output_path
+        self.status = status or ("failed" if error is not None else "success")
+        self.error_type = type(error).__name__ if isinstance(error, Exception) else None
+        self.error = str(error) if error is not None else None
+        self.bytes_in = sum(path_size(path) for path in ([input_path] if isinstance(input_path, str) else input_path))
+        self.bytes_out = path_size(output_path) if self.status != "failed" else 0
+        self.started = start_t
+        self.seconds = time.time()-start_t
+
+    def to_dict(self):
+        """
+        Convert the result to a dictionary.
+
+        Args:
+            None
+
+        Return (dict): Result's "input_path", "output_path", "status", "error_type", "error", "bytes_in",
+        "bytes_out", "started" & "seconds".
+
+        """
+        return {"input_path": self.input_path, "output_path": self.output_path, "status": self.status,
+                "error_type": self.error_type, "error": self.error, "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out, "started": self.started, "seconds": self.seconds}
+
+
+class RunManifest():
+    """
+
+    Collects the results of a run's conversions & appends each to a JSON-lines run manifest, one record per
+    line. Schedulers may then retry only the failed conversions of a run.
+
+    """
+    def __init__(self, manifest_path=None):
+        """
+        Args:
+            manifest_path (str): Path of the JSON-lines run manifest. Records are appended to an existing
+                                 manifest. Default: None (the results are only held in memory)
+
+        """
+        self.manifest_path = manifest_path
+        self.results = []
+
+        # Create directory for storing the run manifest
+        if manifest_path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(manifest_path)))
+            except FileExistsError:
+                pass
+
+    def record(self, result):
+        """
+        Record the result of a conversion.
+
+        Args:
+            result (ConversionResult): Result of the conversion.
+
+        Return (ConversionResult): Result of the conversion.
+
+        """
+        self.results.append(result)
+
+        # Append the record w/ a single write, so concurrent writers do not interleave records
+        if self.manifest_path:
+            with open(self.manifest_path, 'a') as f:
+                f.write(json.dumps(result.to_dict()) + '\n')
+
+        return result
+
+    def failed(self):
+        """
+        Results of the failed conversions.
+
+        Args:
+            None
+
+        Return (list): Failed conversions' results.
+
+        """
+        return [result for result in self.results if result.status == "failed"]
+
+    def exit_code(self):
+        """
+        Exit code of the run.
+
+        Args:
+            None
+
+        Return (int): 1 if a conversion failed (or no conversion was run), 0 otherwise.
+
+        """
+        return 1 if self.failed() or not self.results else 0
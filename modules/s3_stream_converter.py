@@ -0,0 +1,215 @@
+import os
+import time
+import shutil
+import contextlib
+import s3fs
+import fsspec.caching
+import xarray as xr
+from .data_converter import DataConverter
+from .subset import subset_dataset
+
+class S3StreamConverter(DataConverter):
+    """
+
+    Converts netCDF & GRIB objects in S3 cloud storage straight to Zarr, w/o staging raw files on local disk.
+
+    netCDF4/HDF5 objects are opened lazily via ranged reads, so each chunk is fetched from cloud storage
+    only when the Zarr writer needs it -- the download & the conversion overlap. netCDF classic objects are
+    read into memory on open. GRIB objects are streamed into an in-memory file (Linux), since cfgrib
+    requires a file path.
+
+    """
+    def __init__(self, bucket_arn, obj_key, refactor_variables=None, zarr_data_dir="../zarr_data",
+                 endpoint_url=None, anon=False, block_size_mb=8, **kwargs):
+        """
+        Args:
+            bucket_arn (str): Cloud bucket's Amazon Resource Name (ARN).
+                              Options: 'noaa-ufs-regtests-pds', 'noaa-ufs-land-da-pds',
+                              'noaa-ufs-srw-pds'
+
+            obj_key (str): Key of the object in cloud storage.
+
+            refactor_variables (list): netCDF only. Variables in need of refactoring (see DataConverter).
+                                       Default: None
+
+            zarr_data_dir (str): Location of the zarr files. Default: "../zarr_data"
+
+            endpoint_url (str): URL of the storage endpoint (e.g. a local S3 stand-in such as moto).
+                                Default: None (AWS S3)
+
+            anon (bool): Access the bucket anonymously (e.g. public NOAA Open Data buckets). Default: False
+
+            block_size_mb (float): Size (in MB) of each ranged read. Default: 8
+
+            kwargs: Remaining keyword arguments to DataConverter (e.g. profile, compressor).
+
+        """
+        super().__init__(os.path.basename(obj_key), refactor_variables, raw_data_dir=None,
+                         zarr_data_dir=zarr_data_dir, **kwargs)
+        self.bucket_arn = bucket_arn
+        self.obj_key = obj_key
+        self.block_size = int(block_size_mb*1024**2)
+        self.fs = s3fs.S3FileSystem(anon=anon, client_kwargs={'endpoint_url': endpoint_url} if endpoint_url else {})
+
+    def open_object(self):
+        """
+        Open the cloud object as a file-like object read via ranged GETs.
+
+        Args:
+            None
+
+        Return (object): Read-only file-like object.
+
+        """
+
+        # The block cache keeps each block read (e.g. the HDF5 metadata read repeatedly on open). Older versions
+        # of fsspec (e.g. 2023.1.0) register it as "block" & versions w/o it read ahead instead.
+        cache_type = next(name for name in ('blockcache', 'block', 'readahead') if name in fsspec.caching.caches)
+
+        return self.fs.open(f'{self.bucket_arn}/{self.obj_key}', 'rb', block_size=self.block_size, cache_type=cache_type)
+
+    def convert_nc2xarray(self, coord_suffix="coord", dim_suffix="node", print_feats=False, lazy=True, mmap=False):
+        """
+        Converts a netCDF cloud object to Xarray. The object is always opened lazily.
+
+        Args:
+            coord_suffix (str): Suffix name for the refactored coordinate variable(s).
+                                Default: "coord"
+
+            dim_suffix (str):  Suffix name for the refactored dimension variable(s).
+                               Default: "node"
+
+            print_feats (bool): Print raw (unprocessed) data's details to prompted screen.
+
+            lazy (bool): Unused. Retained for compatibility w/ DataConverter.
+
+            mmap (bool): Unused. Memory mapping does not apply to cloud objects (see use_mmap()).
+
+        Return (object): netCDF cloud object's Xarray object.
+
+        """
+        start_t = time.time()
+        data_xr, opened_xr, f = None, None, None
+        try:
+            f = self.open_object()
+
+            # netCDF4 files are HDF5 files. Otherwise, the file is a netCDF classic file.
+            engine = 'h5netcdf' if f.read(4).startswith(b'\x89HDF') else 'scipy'
+            f.seek(0)
+
+            if self.refactor_variables:
+
+                # Open the object once & refactor the duplicated variable names lazily
+                if engine == 'h5netcdf':
+                    store = xr.backends.H5NetCDFStore.open(f)
+                else:
+                    store = xr.backends.ScipyDataStore(f)
+                opened_xr = self.open_refactored(store, coord_suffix, dim_suffix)
+
+            else:
+                opened_xr = xr.open_dataset(f, engine=engine, drop_variables=self.drop_variables, cache=False)
+
+            # Subset the variables & region of interest, so only their byte ranges are fetched. W/o a subset,
+            # the opened Dataset is returned as is, so it is copied to close it (rather than itself) below.
+            data_xr = subset_dataset(opened_xr, self.variables, self.isel, self.bbox)
+            if data_xr is opened_xr:
+                data_xr = opened_xr.copy(deep=False)
+
+            # Closing the Xarray Dataset closes the backend store & the cloud object
+            def close():
+                opened_xr.close()
+                f.close()
+            data_xr.set_close(close)
+
+            print("\nData Converted to Xarray ... Completed.")
+            delta_t = (time.time()-start_t)/60
+            print(f"Xarray Conversion Processing Time: {delta_t} min.")
+
+            if print_feats:
+                self.print_attributes(data_xr)
+
+        except Exception as e:
+            self.error = e
+            data_xr = None
+            if opened_xr is not None:
+                opened_xr.close()
+            if f is not None:
+                f.close()
+            error_mssg = f"\n* XARRAY NOTIFICATION:\n{e}\n\n* Note: Variables with the same name as its dimensions are disallowed by Xarray because they conflict with the coordinates used to label dimensions.\n*TO RESOLVE: Re-execute script with the following flag appended: -d <DISALLOWED_VAR_1 DISALLOWED_VAR_2 ... DISALLOWED_VAR_N>\n"
+            print(error_mssg)
+
+        return data_xr
+
+    @contextlib.contextmanager
+    def stage_grib(self):
+        """
+        Stream the GRIB cloud object into an in-memory file, addressable by path, for the duration of the context.
+
+        Args:
+            None
+
+        Return: None
+
+        """
+        fd = os.memfd_create(self.filename)
+        raw_data_dir, filename = self.raw_data_dir, self.filename
+        try:
+            with self.open_object() as src, open(fd, 'wb', closefd=False) as dst:
+                shutil.copyfileobj(src, dst, self.block_size)
+            self.raw_data_dir, self.filename = f'/proc/{os.getpid()}/fd', str(fd)
+            yield
+        finally:
+            self.raw_data_dir, self.filename = raw_data_dir, filename
+            os.close(fd)
+
+    def input_path(self):
+        """
+        Path of the cloud object, as recorded in the run manifest.
+
+        Args:
+            None
+
+        Return (str): S3 URL of the cloud object.
+
+        """
+        return f's3://{self.bucket_arn}/{self.obj_key}'
+
+    def use_mmap(self):
+        """
+        Check whether the file of interest may be memory-mapped (see DataConverter.use_mmap()).
+
+        Args:
+            None
+
+        Return (bool): False -- cloud objects are read via ranged GETs, not mapped from local disk. A notification is sent.
+
+        """
+        print(f"\n* Note: {self.obj_key} is a cloud object, so it will not be memory-mapped. Streaming as usual.")
+
+        return False
+
+    def grb_indexpath(self):
+        """
+        Location of the GRIB's cfgrib index.
+
+        Args:
+            None
+
+        Return (str): Empty string -- the in-memory GRIB file is indexed in memory only.
+
+        """
+        return ''
+
+    def convert_grb2xarray(self, grb_dict={}, print_feats=False):
+        """
+        Converts a GRIB cloud object to Xarray (see DataConverter.convert_grb2xarray()).
+        """
+        with self.stage_grib():
+            return super().convert_grb2xarray(grb_dict, print_feats)
+
+    def convert_grb2zarr_all(self, filename, layout="stores", print_feats=False):
+        """
+        Convert every hypercube of a GRIB cloud object to Zarr in a single run (see DataConverter.convert_grb2zarr_all()).
+        """
+        with self.stage_grib():
+            return super().convert_grb2zarr_all(filename, layout, print_feats)
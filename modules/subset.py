@@ -0,0 +1,164 @@
+import numpy as np
+
+# Coordinate variable names of the latitude & longitude (e.g. GRIB, FV3 history & FV3 restart files)
+LAT_NAMES = ('latitude', 'lat', 'geolat', 'grid_lat')
+LON_NAMES = ('longitude', 'lon', 'geolon', 'grid_lon')
+
+
+def parse_isel(items):
+    """
+    Parse index ranges from the command line.
+
+    Args:
+        items (list): Index range per dimension in the format of <DIM>=<START>:<STOP> (or <DIM>=<INDEX>),
+                      e.g. ["pfull=0:10", "time=0"]. Either bound may be omitted (e.g. "pfull=:10").
+
+    Return (dict): Index-based selection per dimension. Single indices are kept as ranges of length 1,
+    so the dimension is retained.
+
+    """
+    isel = {}
+    for item in items or []:
+        dim, index = item.split('=', 1)
+        if ':' in index:
+            start, stop = index.split(':', 1)
+            isel[dim] = slice(int(start) if start else None, int(stop) if stop else None)
+        else:
+            isel[dim] = slice(int(index), int(index)+1)
+
+    return isel
+
+
+def parse_sel(items):
+    """
+    Parse label ranges from the command line.
+
+    Args:
+        items (list): Label range per dimension in the format of <DIM>=<START>:<STOP> (or <DIM>=<LABEL>),
+                      e.g. ["latitude=55:20", "time=2021-03-23T06"]. Either bound may be omitted. Times are
+                      given w/o minutes & seconds (e.g. 2021-03-23T06), since ":" separates the bounds.
+
+    Return (dict): Label-based selection per dimension. The labels are kept as strings & cast to the
+    coordinate's type upon selection.
+
+    """
+    sel = {}
+    for item in items or []:
+        dim, label = item.split('=', 1)
+        if ':' in label:
+            start, stop = label.split(':', 1)
+            sel[dim] = slice(start or None, stop or None)
+        else:
+            sel[dim] = label
+
+    return sel
+
+
+def find_coord(data_xr, names):
+    """
+    Find the first variable of a dataset matching one of the candidate names.
+
+    Args:
+        data_xr (Dataset): Xarray Dataset.
+
+        names (tuple): Candidate variable names.
+
+    Return (str): Name of the variable (or None, if none of the names are within the dataset).
+
+    """
+    return next((name for name in names if name in data_xr.variables), None)
+
+
+def index_range(mask):
+    """
+    Index range spanning the True elements of a boolean mask.
+
+    Args:
+        mask (ndarray): 1-D boolean mask.
+
+    Return (slice): Index range from the first to the last True element.
+
+    """
+    indices = np.nonzero(mask)[0]
+
+    return slice(int(indices[0]), int(indices[-1])+1)
+
+
+def bbox_isel(data_xr, bbox):
+    """
+    Translate a latitude & longitude bounding box into index ranges, so only the
+    grid points within the bounding box are read.
+
+    Args:
+        data_xr (Dataset): Xarray Dataset w/ 1-D (e.g. GRIB) or 2-D (e.g. FV3 tiles) latitude & longitude.
+
+        bbox (tuple): Bounding box in the format of (lat_min, lat_max, lon_min, lon_max). Longitudes in
+                      [-180, 180] are wrapped to [0, 360] for 0-360 grids. A lon_min greater than lon_max
+                      crosses the antimeridian.
+
+    Return (dict): Index range per dimension spanning the bounding box. Only the latitude & longitude
+    are read to compute the index ranges.
+
+    """
+    lat_name, lon_name = find_coord(data_xr, LAT_NAMES), find_coord(data_xr, LON_NAMES)
+    if lat_name is None or lon_name is None:
+        raise ValueError(f"The data does not feature latitude & longitude variables. Options: {LAT_NAMES} & {LON_NAMES}")
+
+    lat_min, lat_max, lon_min, lon_max = bbox
+    lat, lon = data_xr[lat_name], data_xr[lon_name]
+
+    # Wrap the bounding box to the longitude convention of the grid
+    if float(lon.min()) >= 0:
+        lon_min, lon_max = lon_min % 360, lon_max % 360
+    lat_mask = ((lat >= lat_min) & (lat <= lat_max)).values
+    if lon_min <= lon_max:
+        lon_mask = ((lon >= lon_min) & (lon <= lon_max)).values
+    else:
+        lon_mask = ((lon >= lon_min) | (lon <= lon_max)).values
+
+    # 1-D latitude & longitude are selected separately
+    if lat.ndim == 1 and lon.ndim == 1 and lat.dims != lon.dims:
+        if not lat_mask.any() or not lon_mask.any():
+            raise ValueError(f"No grid points fall within the bounding box: {bbox}")
+        return {lat.dims[0]: index_range(lat_mask), lon.dims[0]: index_range(lon_mask)}
+
+    # 2-D latitude & longitude are selected by the rows & columns featuring a grid point within the bounding box
+    mask = lat_mask & lon_mask
+    if not mask.any():
+        raise ValueError(f"No grid points fall within the bounding box: {bbox}")
+
+    return {dim: index_range(mask.any(axis=tuple(ax for ax in range(mask.ndim) if ax != i)))
+            for i, dim in enumerate(lat.dims)}
+
+
+def subset_dataset(data_xr, variables=None, isel=None, bbox=None):
+    """
+    Subset a lazily opened dataset by variable & region, prior to reading its data.
+
+    Args:
+        data_xr (Dataset): Xarray Dataset.
+
+        variables (list): Data variables to keep. Default: None (all data variables)
+
+        isel (dict): Index-based selection per dimension. Default: None (entire domain)
+
+        bbox (tuple): Latitude & longitude bounding box (see bbox_isel()). Default: None (entire domain)
+
+    Return (Dataset): Subset Xarray Dataset. The coordinates of the kept variables, as well as the
+    latitude & longitude, are retained.
+
+    """
+    if isel:
+        data_xr = data_xr.isel(isel)
+
+    if bbox:
+        data_xr = data_xr.isel(bbox_isel(data_xr, bbox))
+
+    if variables:
+        missing = [name for name in variables if name not in data_xr.data_vars]
+        if missing:
+            raise ValueError(f"Variable(s) not within the data: {missing}. Options: {list(data_xr.data_vars)}")
+        lat_lon = [name for name in LAT_NAMES+LON_NAMES if name in data_xr.data_vars and name not in variables]
+        data_xr = data_xr[list(variables)+lat_lon]
+
+    return data_xr
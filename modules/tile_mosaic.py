@@ -0,0 +1,189 @@
+import re
+import time
+import xarray as xr
+from .zarr_encoding import chunk_dataset
+from .data_converter import DataConverter
+from .run_manifest import ConversionResult
+
+
+def tile_number(filename, default):
+    """
+    Extract the tile number of a cubed-sphere tile file (e.g. 6 for gfs_data.tile6.nc).
+
+    Args:
+        filename (str): Name of the tile file.
+
+        default (int): Tile number if the filename does not feature one.
+
+    Return (int): Tile number.
+
+    """
+    match = re.search(r'tile(\d+)', filename)
+
+    return int(match.group(1)) if match else default
+
+
+class TileMosaicConverter(DataConverter):
+    """
+
+    Combines the tile files of a cubed-sphere grid (e.g. gfs_data.tile1.nc - gfs_data.tile6.nc) into a single
+    Zarr w/ a "tile" dimension.
+
+    The tiles are opened lazily, one after the other, since the netCDF4/HDF5 libraries are not thread-safe. The
+    tiles' chunks are then read & written concurrently by the Zarr write, whose reads are serialized by Xarray's
+    HDF5 lock. Each variable is chunked one tile at a time, so each tile is independently readable, while a global
+    field is read from a single Zarr (e.g. a single Dask graph).
+
+    """
+    def __init__(self, filenames, refactor_variables=None, raw_data_dir="../raw_data", zarr_data_dir="../zarr_data", **kwargs):
+        """
+        Args:
+            filenames (list): Names of the tile files of interest located under ../raw_data.
+                              Include file extension (e.g. .nc, .nc4).
+
+            refactor_variables (list): Variables in need of refactoring, shared by all tiles (see DataConverter).
+                                       Default: None
+
+            raw_data_dir (str): Location of the raw (unprocessed) files. Default: "../raw_data"
+
+            zarr_data_dir (str): Location of the zarr files. Default: "../zarr_data"
+
+            kwargs: Remaining keyword arguments to DataConverter (e.g. profile, compressor, variables, isel). 
+                    A bounding box is not supported, since each tile would be cut to a different shape.
+
+        """
+        super().__init__(filenames[0], refactor_variables, raw_data_dir, zarr_data_dir, **kwargs)
+        self.filenames = sorted(filenames, key=lambda fn: tile_number(fn, 0))
+
+    def input_path(self):
+        """
+        Paths of the tile files, as recorded in the run manifest.
+
+        Args:
+            None
+
+        Return (list): Paths of the tile files.
+
+        """
+        return [f'{self.raw_data_dir}/{fn}' for fn in self.filenames]
+
+    def open_tile(self, filename):
+        """
+        Open a tile file lazily as Xarray.
+
+        Args:
+            filename (str): Name of the tile file.
+
+        Return (object): Tile's Xarray Dataset (or None, if the tile could not be opened).
+
+        """
+        tile_converter = DataConverter(filename, self.refactor_variables, self.raw_data_dir, self.zarr_data_dir,
+                                       variables=self.variables, drop_variables=self.drop_variables, isel=self.isel)
+
+        return tile_converter.convert_nc2xarray(lazy=True)
+
+    def convert_tiles2xarray(self, memory_budget_mb=1024, num_workers=1, print_feats=False):
+        """
+        Converts the tile files to a single Xarray w/ a "tile" dimension.
+
+        Args:
+            memory_budget_mb (float): Upper bound (in MB) on the memory used by the chunks in flight
+                                      when the mosaic is written. Default: 1024
+
+            num_workers (int): Number of chunks read & written concurrently when the mosaic is written.
+                               Default: 1
+
+            print_feats (bool): Print the mosaic's details to prompted screen.
+
+        Return (tuple): Mosaic's Xarray Dataset (or None, if a tile could not be opened) & the tiles'
+        Xarray Datasets (to close once the mosaic is written).
+
+        """
+        start_t = time.time()
+
+        # Open the tiles one after the other. Opening a tile only reads its metadata, so the
+        # parallelism is left to the Zarr write.
+        tiles = [self.open_tile(fn) for fn in self.filenames]
+
+        if any(tile is None for tile in tiles):
+            failed = [fn for fn, tile in zip(self.filenames, tiles) if tile is None]
+            self.error = f"The following tile(s) could not be opened: {failed}"
+            print(f"\nMosaic Not Converted to Xarray. REASON: The following tile(s) could not be opened: {failed}")
+            return None, [tile for tile in tiles if tile is not None]
+
+        # Ensure the tiles share the same grid & variables
+        mismatched = [fn for fn, tile in zip(self.filenames, tiles) if dict(tile.sizes) != dict(tiles[0].sizes)]
+        if mismatched:
+            self.error = f"The dimensions of the following tile(s) do not match {self.filenames[0]}: {mismatched}"
+            print(f"\nMosaic Not Converted to Xarray. REASON: The dimensions of the following tile(s) do not match {self.filenames[0]}: {mismatched}")
+            return None, tiles
+
+        # Chunk each tile as per the mosaic's chunks, so the concatenation remains lazy & each
+        # chunk is read from its tile file only when written.
+        encoding = self.zarr_encoding(tiles[0], True, memory_budget_mb, num_workers)
+        chunked_tiles = [chunk_dataset(tile, encoding) for tile in tiles]
+
+        # Stack the tiles along the "tile" dimension. Index coordinates (e.g. grid_xt) are taken from the first tile.
+        data_xr = xr.concat(chunked_tiles, dim='tile', data_vars='all', coords='all', compat='override',
+                            join='override', combine_attrs='override')
+        data_xr = data_xr.assign_coords(tile=[tile_number(fn, i+1) for i, fn in enumerate(self.filenames)])
+
+        print(f"\n{len(tiles)} Tile(s) Converted to Xarray ... Completed.")
+        delta_t = (time.time()-start_t)/60
+        print(f"Xarray Conversion Processing Time: {delta_t} min.")
+
+        if print_feats:
+            self.print_attributes(data_xr)
+
+        return data_xr, tiles
+
+    def convert_tiles2zarr(self, filename, memory_budget_mb=1024, num_workers=1):
+        """
+        Convert the tile files to a single Zarr w/ a "tile" dimension. Each chunk spans a single tile.
+
+        Args:
+            filename (str): Name to save Zarr as under the location
+                            of the zarr files (default: "../zarr_data").
+
+            memory_budget_mb (float): Upper bound (in MB) on the memory used by the chunks in flight. Default: 1024
+
+            num_workers (int): Number of chunks read & written concurrently. Default: 1
+
+        Return: If Xarray is not empty, then Zarr will be saved under the location
+        of the Zarr files (default: "../zarr_data") -- otherwise, Zarr will not be saved
+        because it is empty due to an empty Xarray.
+
+        """
+
+        # Convert the tiles to Xarray
+        run_t = time.time()
+        data_xr, tiles = self.convert_tiles2xarray(memory_budget_mb, num_workers)
+
+        # Convert Xarray to Zarr
+        start_t = time.time()
+        store = f'{self.zarr_data_dir}/{filename}.zarr'
+        try:
+            if data_xr is not None:
+                data_zarr = self.write_zarr(data_xr, store, True, memory_budget_mb, num_workers, split_dims=('tile',))
+                print("\nData Converted to Zarr ... Completed.")
+
+                # Calculate processing time.
+                delta_t2 = (time.time()-start_t)/60
+                print(f"Zarr Conversion Processing Time: {delta_t2} min.\n")
+
+                self.run_manifest.record(ConversionResult(self.input_path(), store, run_t))
+                return data_zarr
+
+            # If Xarray is empty, then conversion to Zarr will not occur & a notification will be sent
+            self.run_manifest.record(ConversionResult(self.input_path(), store, run_t, self.error or "Xarray is empty."))
+            print('\nConversion to Zarr will not occur because Xarray is empty.\n')
+
+        except Exception as e:
+            self.run_manifest.record(ConversionResult(self.input_path(), store, run_t, e))
+            print(f"\nData Not Converted to Zarr. REASON: {type(e).__name__}: {e}\n")
+
+        finally:
+            for tile in tiles:
+                tile.close()
+
+        return
@@ -1,63 +1,211 @@
 import os
-import xarray as xr
-from netCDF4 import Dataset
+import time
+from concurrent.futures import ProcessPoolExecutor
+from .zarr_encoding import TIME_DIMS, CF_ENCODING_KEYS
+from .run_manifest import ConversionResult, RunManifest
+from .zarr_metadata import open_zarr
 import warnings
 warnings.filterwarnings("ignore")
 
 class Zarr2NC():
     """
-    
-    Convert Zarr to netCDF. 
-    
+
+    Convert Zarr to netCDF.
+
+    The Zarr is opened directly (w/o combining multiple files) & each variable is written w/ the Zarr's
+    chunk shapes as its netCDF4 chunk shapes, compressed via zlib. The Zarr's chunks are read & decompressed
+    concurrently, & the netCDF may be split into one file per variable or per time step to write the
+    files concurrently.
+
     """
-    def __init__(self, zarr_data_dir="../zarr_data", nc_data_dir="../nc_data"):
+    def __init__(self, zarr_data_dir="../zarr_data", nc_data_dir="../nc_data", complevel=4, shuffle=True, manifest_path=None):
         """
         Args:
             zarr_data_dir (str):  Directory path of the Zarr.
 
             nc_data_dir (str): Directory path for the newly converted netCDF file.
-            
+
+            complevel (int): zlib compression level of the netCDF variables. If 0, the variables are not
+                             compressed. Default: 4
+
+            shuffle (bool): Apply the HDF5 byte shuffle filter prior to compression. Default: True
+
+            manifest_path (str): Path of the JSON-lines run manifest. A record is appended per netCDF file
+                                 (see DataConverter). Default: None
+
         """
-        
+
         # Create directory for storing newly converted netCDF files.
         self.nc_data_dir = nc_data_dir
         self.zarr_data_dir = zarr_data_dir
+        self.complevel = complevel
+        self.shuffle = shuffle
+        self.run_manifest = RunManifest(manifest_path)
         try:
             os.makedirs(self.nc_data_dir)
         except FileExistsError:
             pass
 
-    def convert_zarr2nc(self, zarr_store, combine_by="by_coords"):
+    def nc_encoding(self, data_xr):
+        """
+        Build the per-variable netCDF4 encoding of a Zarr's Xarray Dataset.
+
+        Args:
+            data_xr (Dataset): Xarray Dataset opened from Zarr.
+
+        Return (dict): Encoding per variable name to pass to Xarray's to_netcdf(). Each variable's netCDF4
+        chunk shape is its Zarr chunk shape. The CF encoding (e.g. packing, fill value & time units) is retained.
+
+        """
+        encoding = {}
+        for name, var in data_xr.variables.items():
+
+            # String & object variables keep Xarray's default encoding
+            if var.dtype.kind in 'OSU':
+                continue
+
+            var_encoding = {k: v for k, v in var.encoding.items() if k in CF_ENCODING_KEYS}
+            if var.ndim > 0 and 0 not in var.shape:
+                if 'chunks' in var.encoding:
+                    var_encoding['chunksizes'] = tuple(min(c, n) for c, n in zip(var.encoding['chunks'], var.shape))
+                if self.complevel:
+                    var_encoding.update({'zlib': True, 'complevel': self.complevel, 'shuffle': self.shuffle})
+            encoding[name] = var_encoding
+
+        return encoding
+
+    def write_nc(self, zarr_store, nc_filename, variables=None, isel=None, group=None, num_workers=1):
+        """
+        Write the Zarr (or a subset of it) to a netCDF file.
+
+        Args:
+            zarr_store (str): Name of the zarr (exclude extension).
+
+            nc_filename (str): Name of the netCDF file (include extension).
+
+            variables (list): Data variables to write. Default: None (all data variables)
+
+            isel (dict): Index-based selection per dimension. Default: None (entire Zarr)
+
+            group (str): Group within the Zarr to convert. Default: None (root of the Zarr)
+
+            num_workers (int): Number of Zarr chunks read & decompressed concurrently. Default: 1
+
+        Return (str): Path of the netCDF file.
+
+        """
+        data_xr = open_zarr(f'{self.zarr_data_dir}/{zarr_store}.zarr', group=group)
+        try:
+            if variables:
+                data_xr = data_xr[variables]
+            if isel:
+                data_xr = data_xr.isel(isel)
+
+            # Convert Xarray Dataset to netCDF. The chunks are read concurrently, while written
+            # to the netCDF file one at a time.
+            delayed_nc = data_xr.to_netcdf(f"{self.nc_data_dir}/{nc_filename}", encoding=self.nc_encoding(data_xr), compute=False)
+            delayed_nc.compute(scheduler='threads', num_workers=num_workers)
+        finally:
+            data_xr.close()
+
+        return f"{self.nc_data_dir}/{nc_filename}"
+
+    def split_parts(self, zarr_store, split_by, split_dim=None, group=None):
+        """
+        Split the Zarr into the netCDF files to write.
+
+        Args:
+            zarr_store (str): Name of the zarr (exclude extension).
+
+            split_by (str): Options: "variable" (one file per data variable) or "time" (one file per time step).
+
+            split_dim (str): Time only. Dimension to split along. Default: None (the Zarr's time dimension)
+
+            group (str): Group within the Zarr to convert. Default: None (root of the Zarr)
+
+        Return (list): netCDF filename, data variables & index-based selection per file.
+
+        """
+        data_xr = open_zarr(f'{self.zarr_data_dir}/{zarr_store}.zarr', group=group)
+        data_xr.close()
+
+        if split_by == "variable":
+            return [(f"{zarr_store}_{name}.nc", [name], None) for name in data_xr.data_vars]
+
+        if split_by == "time":
+            split_dim = split_dim or next((dim for dim in data_xr.dims if dim in TIME_DIMS), None)
+            if split_dim not in data_xr.dims:
+                raise ValueError(f"The Zarr does not feature a time dimension to split by. Dimensions: {list(data_xr.dims)}")
+            width = len(str(data_xr.sizes[split_dim]-1))
+            return [(f"{zarr_store}_{split_dim}{i:0{width}d}.nc", None, {split_dim: slice(i, i+1)})
+                    for i in range(data_xr.sizes[split_dim])]
+
+        raise ValueError(f"Unknown split: {split_by}. Options: variable, time")
+
+    def convert_zarr2nc(self, zarr_store, combine_by=None, split_by=None, split_dim=None, group=None, num_workers=1, max_workers=1):
         """
         Convert Zarr to netCDF.
-        
+
         Args:
             zarr_store (str): Name of the zarr (exclude extension).
-            
-            combine_by (str): Method for combining data within Zarr.
-                              Options: "nested" or "by_coords"
 
-        Return: None
+            combine_by (str): Unused. The Zarr is opened directly, rather than combined via open_mfdataset.
+                              Retained for compatibility.
+
+            split_by (str): Split the netCDF into one file per data variable ("variable") or per time step
+                            ("time"), named <zarr_store>_<VARIABLE>.nc or <zarr_store>_<TIME_DIM><INDEX>.nc.
+                            Default: None (a single netCDF file named <zarr_store>.nc)
+
+            split_dim (str): Time split only. Dimension to split along. Default: None (the Zarr's time dimension)
+
+            group (str): Group within the Zarr to convert. Default: None (root of the Zarr)
+
+            num_workers (int): Number of Zarr chunks read & decompressed concurrently per netCDF file. Default: 1
+
+            max_workers (int): Split only. Number of netCDF files written concurrently. Default: 1
+
+        Return (list): Paths of the netCDF files.
 
         References:
-        - https://xarray.pydata.org/en/v0.14.0/generated/xarray.open_mfdataset.html
-        
+        - https://docs.xarray.dev/en/stable/user-guide/io.html#writing-encoded-data
+
         """
-        
+        start_t = time.time()
+        zarr_path = f'{self.zarr_data_dir}/{zarr_store}.zarr'
+        nc_paths = []
+
+        # Convert the Zarr to a single netCDF file
+        if not split_by:
+            try:
+                nc_paths.append(self.write_nc(zarr_store, f"{zarr_store}.nc", group=group, num_workers=num_workers))
+                self.run_manifest.record(ConversionResult(zarr_path, nc_paths[-1], start_t))
+                print(f"\nThe newly converted netCDF has been saved under {nc_paths[-1]}")
+            except Exception as e:
+                self.run_manifest.record(ConversionResult(zarr_path, f"{self.nc_data_dir}/{zarr_store}.nc", start_t, e))
+                print(f"\nZarr Not Converted to netCDF. REASON: {type(e).__name__}: {e}\n")
+
+            return nc_paths
+
         try:
-            
-            # Load Zarr as Xarray Dataset.
-            xr_dataset = xr.open_mfdataset(f'{self.zarr_data_dir}/{zarr_store}.zarr',
-                                           combine=combine_by)
-
-            # Convert Xarray Dataset to netCDF.
-            xr_dataset.to_netcdf(f"{self.nc_data_dir}/{zarr_store}.nc")
-            print(f"\nThe newly converted netCDF has been saved under {self.nc_data_dir}/{zarr_store}.nc") 
-            
-        except Exception:
-            pass
+            parts = self.split_parts(zarr_store, split_by, split_dim, group)
+        except Exception as e:
+            self.run_manifest.record(ConversionResult(zarr_path, self.nc_data_dir, start_t, e))
+            print(f"\nZarr Not Converted to netCDF. REASON: {type(e).__name__}: {e}\n")
+            return nc_paths
 
-        return
-    
+        # Convert the Zarr to netCDF files concurrently. Each file is written by its own process, since
+        # the HDF5 library does not write concurrently within a single process. A failed file does not
+        # prevent the remaining files from being written.
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(self.write_nc, zarr_store, nc_filename, variables, isel, group, num_workers): nc_filename
+                       for nc_filename, variables, isel in parts}
+            for future, nc_filename in futures.items():
+                try:
+                    nc_paths.append(future.result())
+                    self.run_manifest.record(ConversionResult(zarr_path, nc_paths[-1], start_t))
+                    print(f"\nThe newly converted netCDF has been saved under {nc_paths[-1]}")
+                except Exception as e:
+                    self.run_manifest.record(ConversionResult(zarr_path, f"{self.nc_data_dir}/{nc_filename}", start_t, e))
+                    print(f"\n{nc_filename} Not Converted to netCDF. REASON: {type(e).__name__}: {e}\n")
 
-        
\ No newline at end of file
+        return nc_paths
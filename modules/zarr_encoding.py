@@ -0,0 +1,208 @@
+import math
+
+# Dimension names treated as the time axis of a variable
+TIME_DIMS = ('time', 'Time', 'step', 'valid_time', 'forecast_time')
+
+# Variable encoding keys (CF conventions) retained from the source file
+CF_ENCODING_KEYS = ('_FillValue', 'dtype', 'scale_factor', 'add_offset', 'units', 'calendar')
+
+# Named chunking & compression profiles.
+# - "auto": Chunks sized to the target chunk size. Zarr's default compressor.
+# - "time-series": Chunks spanning the full time axis for fast per-point time series reads.
+# - "spatial-map": Chunks spanning the full horizontal grid per time step & level for fast map reads.
+# - "archive-max-compression": Large chunks w/ the highest Zstd compression level for long term storage.
+PROFILES = {
+    "auto": {"chunking": "auto", "target_chunk_mb": 16, "compressor": None, "clevel": None},
+    "time-series": {"chunking": "time-series", "target_chunk_mb": 16, "compressor": "blosc-lz4", "clevel": 5},
+    "spatial-map": {"chunking": "spatial-map", "target_chunk_mb": 16, "compressor": "blosc-lz4", "clevel": 5},
+    "archive-max-compression": {"chunking": "auto", "target_chunk_mb": 64, "compressor": "blosc-zstd", "clevel": 9},
+}
+
+# Compressor options
+COMPRESSORS = ('blosc-zstd', 'blosc-lz4', 'blosc-lz4hc', 'blosc-zlib', 'zstd', 'lz4', 'none')
+
+# Dask schedulers compressing & writing the Zarr's chunks concurrently
+SCHEDULERS = ('threads', 'processes', 'distributed')
+
+
+def auto_chunks(shape, itemsize, target_bytes, keep_axes=()):
+    """
+    Compute a chunk shape whose uncompressed size does not exceed a target byte size.
+
+    Args:
+        shape (tuple): Shape of the variable.
+
+        itemsize (int): Number of bytes per element of the variable.
+
+        target_bytes (int): Upper bound on the uncompressed size of a single chunk.
+
+        keep_axes (tuple): Axes to keep whole for as long as the target can be met by
+                           splitting the remaining axes. Default: ()
+
+    Return (tuple): Chunk shape. The largest splittable axis is halved until
+    the chunk fits within the target byte size.
+
+    """
+    chunks = [max(int(n), 1) for n in shape]
+
+    while math.prod(chunks)*itemsize > target_bytes:
+
+        # Split the axes which are not kept whole first
+        candidates = [ax for ax, n in enumerate(chunks) if n > 1 and ax not in keep_axes]
+        if not candidates:
+            candidates = [ax for ax, n in enumerate(chunks) if n > 1]
+        if not candidates:
+            break
+
+        ax = max(candidates, key=lambda i: chunks[i])
+        chunks[ax] = math.ceil(chunks[ax]/2)
+
+    return tuple(chunks)
+
+
+def profile_chunks(var, chunking, target_bytes):
+    """
+    Compute the chunk shape of a variable per a profile's chunking strategy.
+
+    Args:
+        var (Variable): Xarray Variable.
+
+        chunking (str): Chunking strategy. Options: "auto", "time-series", "spatial-map"
+
+        target_bytes (int): Upper bound on the uncompressed size of a single chunk.
+
+    Return (tuple): Chunk shape.
+
+    """
+    itemsize = var.dtype.itemsize
+    horizontal_axes = tuple(range(max(var.ndim-2, 0), var.ndim))
+
+    if chunking == "time-series":
+
+        # Keep the time axis whole & split the remaining axes
+        time_axes = tuple(ax for ax, dim in enumerate(var.dims) if dim in TIME_DIMS)
+        if not time_axes and var.ndim >= 3:
+            time_axes = (0,)
+        return auto_chunks(var.shape, itemsize, target_bytes, time_axes)
+
+    if chunking == "spatial-map":
+
+        # One time step & level per chunk w/ the horizontal axes kept whole
+        shape = tuple(n if ax in horizontal_axes else 1 for ax, n in enumerate(var.shape))
+        return auto_chunks(shape, itemsize, target_bytes, horizontal_axes)
+
+    return auto_chunks(var.shape, itemsize, target_bytes, horizontal_axes)
+
+
+def get_compressor(compressor, clevel=None):
+    """
+    Create a numcodecs compressor.
+
+    Args:
+        compressor (str): Compressor name. Options: "blosc-zstd", "blosc-lz4", "blosc-lz4hc",
+                          "blosc-zlib", "zstd", "lz4", "none"
+
+        clevel (int): Compression level. For "lz4", the acceleration factor. Default: None (codec's default)
+
+    Return (object): numcodecs codec (or None for "none").
+
+    """
+    if compressor == 'none':
+        return None
+
+    # Imported upon use, so the CLI's options are listed w/o importing the codecs
+    import numcodecs
+
+    if compressor.startswith('blosc-'):
+        cname = compressor.split('-', 1)[1]
+        clevel = 5 if clevel is None else clevel
+
+        # Bit-shuffle suits the highest compression levels, byte-shuffle otherwise
+        shuffle = numcodecs.Blosc.BITSHUFFLE if clevel >= 7 else numcodecs.Blosc.SHUFFLE
+        return numcodecs.Blosc(cname=cname, clevel=clevel, shuffle=shuffle)
+
+    if compressor == 'zstd':
+        return numcodecs.Zstd(level=1 if clevel is None else clevel)
+
+    if compressor == 'lz4':
+        return numcodecs.LZ4(acceleration=1 if clevel is None else clevel)
+
+    raise ValueError(f"Unknown compressor: {compressor}. Options: {', '.join(COMPRESSORS)}")
+
+
+def build_encoding(data_xr, profile="auto", target_chunk_mb=None, compressor=None, clevel=None, split_dims=()):
+    """
+    Build the per-variable Zarr encoding (chunk shapes & compressor) of an Xarray Dataset.
+
+    Args:
+        data_xr (Dataset): Xarray Dataset.
+
+        profile (str): Chunking & compression profile. Options: "auto", "time-series",
+                       "spatial-map", "archive-max-compression". Default: "auto"
+
+        target_chunk_mb (float): Target uncompressed chunk size (in MB). Overrides the profile's
+                                 target chunk size. Default: None
+
+        compressor (str): Compressor name. Overrides the profile's compressor. Default: None
+
+        clevel (int): Compression level. Overrides the profile's compression level. Default: None
+
+        split_dims (tuple): Dimensions chunked one element at a time (e.g. the tile of a cubed-sphere mosaic),
+                            so each element is independently readable. The remaining axes are chunked as per
+                            a single element. Default: ()
+
+    Return (dict): Encoding per variable name to pass to Xarray's to_zarr().
+
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown profile: {profile}. Options: {', '.join(PROFILES)}")
+
+    settings = PROFILES[profile]
+    target_bytes = int((target_chunk_mb or settings["target_chunk_mb"])*1024**2)
+    clevel = settings["clevel"] if clevel is None else clevel
+
+    # A compression level w/o a compressor applies to Zarr's default compressor (Blosc w/ LZ4)
+    compressor = compressor or settings["compressor"] or ("blosc-lz4" if clevel is not None else None)
+
+    encoding = {}
+    for name, var in data_xr.variables.items():
+
+        # String & object variables keep Xarray's default encoding
+        if var.dtype.kind in 'OSU':
+            continue
+
+        # Retain the source file's CF encoding (e.g. packing, fill value & time units)
+        var_encoding = {k: v for k, v in var.encoding.items() if k in CF_ENCODING_KEYS}
+        split = [dim for dim in var.dims if dim in split_dims]
+        if split:
+            chunks = iter(profile_chunks(var.isel({dim: 0 for dim in split}), settings["chunking"], target_bytes))
+            var_encoding['chunks'] = tuple(1 if dim in split else next(chunks) for dim in var.dims)
+        elif var.ndim > 0:
+            var_encoding['chunks'] = profile_chunks(var, settings["chunking"], target_bytes)
+        if compressor:
+            var_encoding['compressor'] = get_compressor(compressor, clevel)
+        encoding[name] = var_encoding
+
+    return encoding
+
+
+def chunk_dataset(data_xr, encoding):
+    """
+    Chunk the variables of an Xarray Dataset as Dask arrays aligned to their Zarr chunks.
+
+    Args:
+        data_xr (Dataset): Xarray Dataset.
+
+        encoding (dict): Encoding per variable name (see build_encoding()).
+
+    Return (Dataset): Xarray Dataset w/ each variable chunked individually. Dimension
+    coordinates are held in memory by Xarray & remain unchunked.
+
+    """
+    chunked = {name: data_xr[name].variable.chunk(dict(zip(data_xr[name].dims, var_encoding['chunks'])))
+               for name, var_encoding in encoding.items()
+               if 'chunks' in var_encoding and name not in data_xr.indexes}
+    data_vars = {name: var for name, var in chunked.items() if name in data_xr.data_vars}
+    coords = {name: var for name, var in chunked.items() if name in data_xr.coords}
+
+    return data_xr.assign(data_vars).assign_coords(coords)
@@ -0,0 +1,71 @@
+import os
+import json
+import xarray as xr
+import zarr
+
+
+def is_consolidated(store):
+    """
+    Check whether a Zarr store carries consolidated metadata.
+
+    Args:
+        store (str): Path of the Zarr store.
+
+    Return (bool): True if the store's metadata is consolidated into a single .zmetadata object.
+
+    """
+    return os.path.exists(f'{store}/.zmetadata')
+
+
+def consolidate(store):
+    """
+    Consolidate the metadata of a Zarr store (incl. every group) in place, so the store is opened
+    w/ a single metadata read rather than one .zarray/.zattrs/.zgroup read per array & group.
+
+    Args:
+        store (str): Path of the Zarr store.
+
+    Return (int): Number of metadata objects consolidated.
+
+    """
+    zarr.consolidate_metadata(store)
+    with open(f'{store}/.zmetadata') as f:
+        return len(json.load(f)['metadata'])
+
+
+def open_zarr(store, group=None, **kwargs):
+    """
+    Open a Zarr store as Xarray via its consolidated metadata. Stores w/o consolidated metadata
+    (e.g. written prior to consolidation) are opened array by array.
+
+    Args:
+        store (str): Path of the Zarr store.
+
+        group (str): Group within the Zarr store to open. Default: None (root of the store)
+
+        kwargs: Remaining keyword arguments to Xarray's open_zarr().
+
+    Return (Dataset): Lazy Xarray Dataset.
+
+    """
+    consolidated = is_consolidated(store)
+    if not consolidated:
+        print(f"\n{store} does not carry consolidated metadata. To speed up opening the store, execute: python main_consolidate_zarr.py -z <zarr_store>")
+
+    return xr.open_zarr(store, group=group, consolidated=consolidated, **kwargs)
+
+
+def open_group(store):
+    """
+    Open a Zarr store as a read-only Zarr group via its consolidated metadata (if any).
+
+    Args:
+        store (str): Path of the Zarr store.
+
+    Return (zarr.Group): Read-only Zarr group.
+
+    """
+    if is_consolidated(store):
+        return zarr.open_consolidated(store, mode='r')
+
+    return zarr.open_group(store, mode='r')
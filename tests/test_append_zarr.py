@@ -0,0 +1,46 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+netCDF4 = pytest.importorskip("netCDF4")
+xr = pytest.importorskip("xarray")
+pytest.importorskip("zarr")
+pytest.importorskip("cfgrib")
+
+from modules.data_converter import DataConverter
+
+HOURS = [0, 3, 6]
+
+
+def write_sfcf(path, hour, n=4):
+    """
+    Write a small sfcf-like netCDF file, whose 2-D "grid_xt" & "grid_yt" share the names of its dimensions.
+    """
+    with netCDF4.Dataset(path, 'w') as nc:
+        nc.createDimension('time', None)
+        nc.createDimension('grid_yt', n)
+        nc.createDimension('grid_xt', n)
+        time = nc.createVariable('time', 'f8', ('time',))
+        time.units = 'hours since 2021-03-22 06:00:00'
+        time.calendar = 'JULIAN'
+        time[:] = [hour]
+        for name in ('grid_xt', 'grid_yt'):
+            nc.createVariable(name, 'f8', ('grid_yt', 'grid_xt'))[:] = np.arange(n*n).reshape(n, n)
+        nc.createVariable('tmp2m', 'f4', ('time', 'grid_yt', 'grid_xt'))[:] = np.full((1, n, n), 270+hour)
+
+
+def test_append_refactored_hours(tmp_path):
+    """
+    Refactored sfcf files (w/ undecoded times) are appended to the same Zarr hour by hour.
+    """
+    raw_data_dir, zarr_data_dir = tmp_path/"raw_data", tmp_path/"zarr_data"
+    raw_data_dir.mkdir()
+    for hour in HOURS:
+        write_sfcf(raw_data_dir/f"sfcf{hour:03d}.nc", hour)
+        dc_wrapper = DataConverter(f"sfcf{hour:03d}.nc", ['grid_xt', 'grid_yt'], str(raw_data_dir), str(zarr_data_dir))
+        dc_wrapper.convert_nc2zarr("sfcf", append_dim='time')
+        assert not dc_wrapper.run_manifest.failed()
+
+    with xr.open_zarr(zarr_data_dir/"sfcf.zarr", use_cftime=True) as zarr_xr:
+        hours = [(t-zarr_xr.time.values[0]).total_seconds()/3600 for t in zarr_xr.time.values]
+        assert hours == HOURS
+        np.testing.assert_array_equal(zarr_xr.tmp2m.values[:, 0, 0], [270+hour for hour in HOURS])
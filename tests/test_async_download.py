@@ -0,0 +1,64 @@
+import asyncio
+import pytest
+
+pytest.importorskip("boto3")
+pytest.importorskip("aiobotocore")
+
+from modules.async_download import AsyncDownloadData
+
+DATA = bytes(range(64))
+
+
+class FakeBody():
+    """
+    Streaming body of an object, read block by block.
+    """
+    def __init__(self, data):
+        self.data = data
+
+    async def read(self, n):
+        block, self.data = self.data[:n], self.data[n:]
+        return block
+
+    def close(self):
+        pass
+
+
+class FakeClient():
+    """
+    Client serving every key as the same object.
+    """
+    async def get_object(self, Bucket, Key):
+        return {'ContentLength': len(DATA), 'Body': FakeBody(DATA)}
+
+
+def download(raw_data_dir):
+    async def run_download():
+        async with AsyncDownloadData('bucket', str(raw_data_dir), client=FakeClient(), chunk_mb=4/1024**2, queue_blocks=1) as downloader:
+            return await asyncio.wait_for(downloader.download(['run/sfcf000.nc']), timeout=10)
+
+    return asyncio.run(run_download())
+
+
+def test_download(tmp_path):
+    """
+    The object is streamed to disk in blocks through the bounded queue.
+    """
+    [result] = download(tmp_path)
+
+    assert result["status"] == "success"
+    assert (tmp_path/"sfcf000.nc").read_bytes() == DATA
+    assert not (tmp_path/"sfcf000.nc.part").exists()
+
+
+def test_download_writer_fails_to_open(tmp_path):
+    """
+    A writer which cannot open its partial file fails the download, rather than leaving its stream waiting on the full queue.
+    """
+    (tmp_path/"sfcf000.nc.part").mkdir()
+
+    [result] = download(tmp_path)
+
+    assert result["status"] == "failed"
+    assert result["error"].startswith("IsADirectoryError")
+    assert (tmp_path/"sfcf000.nc.part").is_dir()
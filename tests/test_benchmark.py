@@ -0,0 +1,19 @@
+import pytest
+
+pytest.importorskip("numpy")
+xr = pytest.importorskip("xarray")
+pytest.importorskip("cfgrib")
+
+from modules.benchmark import make_grib
+
+
+def test_make_grib(tmp_path):
+    """
+    The synthetic GRIB file holds both an isobaricInhPa & a surface hypercube.
+    """
+    filename = make_grib(str(tmp_path), nlat=7, levels=2)
+
+    for type_of_level, names in (('isobaricInhPa', {'t', 'u', 'v', 'gh'}), ('surface', {'sp', 't', 'orog'})):
+        with xr.open_dataset(tmp_path/filename, engine='cfgrib', backend_kwargs={'filter_by_keys': {'typeOfLevel': type_of_level},
+                                                                                'indexpath': ''}) as grb_xr:
+            assert {grb_xr[name].attrs['GRIB_shortName'] for name in grb_xr.data_vars} == names
@@ -0,0 +1,13 @@
+import pytest
+from modules.data_converter_cli import SUBCOMMANDS, STARTUP_BUDGET_S, measure_startup
+
+
+@pytest.mark.parametrize("subcommand", SUBCOMMANDS)
+def test_startup_within_budget(subcommand):
+    """
+    Each subcommand's "--help" starts w/in the startup budget, w/o importing a heavy module (e.g. xarray).
+    """
+    startup = measure_startup(subcommand)
+
+    assert startup["heavy_modules"] == []
+    assert startup["wall_s"] <= STARTUP_BUDGET_S, f"{subcommand} starts in {startup['wall_s']:.3f} s (budget: {STARTUP_BUDGET_S} s)"
@@ -0,0 +1,74 @@
+import os
+import io
+import time
+import hashlib
+from modules.download_cache import DownloadCache, PART_GRACE_S
+
+DATA = bytes(range(256))*16
+
+
+class FakeBody():
+    """
+    Streaming body of an object, read block by block.
+    """
+    def __init__(self, data):
+        self.stream = io.BytesIO(data)
+
+    def iter_chunks(self, chunk_size):
+        return iter(lambda: self.stream.read(chunk_size), b'')
+
+
+class FakeClient():
+    """
+    boto3 client serving every key as the same single-part object, counting its GETs.
+    """
+    def __init__(self):
+        self.gets = 0
+
+    def head_object(self, Bucket, Key):
+        return {'ETag': f'"{hashlib.md5(DATA).hexdigest()}"', 'ContentLength': len(DATA)}
+
+    def get_object(self, Bucket, Key, Range, IfMatch):
+        self.gets += 1
+        return {'Body': FakeBody(DATA[int(Range[6:-1]):])}
+
+
+def test_fetch_copies(tmp_path):
+    """
+    Fetched objects are copies, so a write to the destination neither alters the cache nor is served as unchanged.
+    """
+    cache, client = DownloadCache(str(tmp_path/"cache")), FakeClient()
+    filename = str(tmp_path/"raw_data"/"sfcf000.nc")
+
+    assert cache.fetch(client, 'bucket', 'run/sfcf000.nc', filename) == "downloaded"
+    assert cache.fetch(client, 'bucket', 'run/sfcf000.nc', filename) == "unchanged"
+
+    with open(filename, 'r+b') as f:
+        f.write(b'\xff'*16)
+    assert cache.fetch(client, 'bucket', 'run/sfcf000.nc', filename) == "cached"
+    assert open(filename, 'rb').read() == DATA
+    assert client.gets == 1
+
+    # A cached object modified in place is downloaded again
+    with open(cache.entry_path('bucket', 'run/sfcf000.nc'), 'r+b') as f:
+        f.write(b'\xff'*16)
+    assert cache.fetch(client, 'bucket', 'run/sfcf000.nc', filename) == "downloaded"
+    assert open(filename, 'rb').read() == DATA
+
+
+def test_evict_orphaned_parts(tmp_path):
+    """
+    Partial downloads count toward the quota & are evicted, unless they may still be in progress.
+    """
+    cache = DownloadCache(str(tmp_path/"cache"), quota_gb=len(DATA)/1024**3)
+    old_part, new_part = cache.entry_path('bucket', 'run/old.nc') + '.part', cache.entry_path('bucket', 'run/new.nc') + '.part'
+    for part_path in (old_part, new_part):
+        with open(part_path, 'wb') as f:
+            f.write(DATA)
+        cache.write_metadata(part_path, {'etag': 'etag', 'size': 2*len(DATA)})
+    stale_t = time.time()-2*PART_GRACE_S
+    os.utime(old_part, (stale_t, stale_t))
+
+    assert cache.evict() == [old_part]
+    assert not os.path.exists(old_part) and not os.path.exists(f'{old_part}.json')
+    assert os.path.exists(new_part)
@@ -0,0 +1,34 @@
+import json
+import pytest
+
+np = pytest.importorskip("numpy")
+xr = pytest.importorskip("xarray")
+zarr = pytest.importorskip("zarr")
+numcodecs = pytest.importorskip("numcodecs")
+pytest.importorskip("cfgrib")
+
+from numcodecs.registry import codec_registry
+from modules.data_converter import DataConverter
+from modules.instrumentation import TIMED_CODEC_ID
+
+
+@pytest.mark.parametrize("compressor, codec_id", [(None, 'blosc'), ("zstd", 'zstd')])
+def test_timed_compression(tmp_path, compressor, codec_id):
+    """
+    The compression of a timed write is recorded w/o re-registering the compressors, & the Zarr is stored w/o the timed wrapper.
+    """
+    registered = dict(codec_registry)
+    data_xr = xr.Dataset({'t2m': (('y', 'x'), np.random.default_rng(0).random((64, 64)))})
+    store = str(tmp_path/"t2m.zarr")
+
+    dc_wrapper = DataConverter("t2m.nc", zarr_data_dir=str(tmp_path), metrics_path=str(tmp_path/"metrics.json"), compressor=compressor)
+    dc_wrapper.write_zarr(data_xr, store)
+
+    results = dc_wrapper.instrumentation.to_dict()
+    assert results["spans"]["compress"]["count"] >= 1
+    assert results["counters"]["compressed"] > 0
+    assert all(codec_registry[k] is cls for k, cls in registered.items())
+
+    assert json.load(open(f"{store}/t2m/.zarray"))["compressor"]["id"] == codec_id
+    assert TIMED_CODEC_ID not in open(f"{store}/.zmetadata").read()
+    np.testing.assert_array_equal(xr.open_zarr(store).t2m.values, data_xr.t2m.values)
@@ -0,0 +1,26 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+xr = pytest.importorskip("xarray")
+pytest.importorskip("zarr")
+pytest.importorskip("numcodecs")
+pytest.importorskip("cfgrib")
+
+from modules.data_converter import DataConverter
+from modules.precision import parse_precision
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_bit_rounding_keeps_source(tmp_path, stream):
+    """
+    Bit-rounding a loaded Dataset leaves its data as is & the report measures the rounding's error.
+    """
+    values = np.random.default_rng(0).random((8, 8)).astype('float32')
+    data_xr = xr.Dataset({'t2m': (('y', 'x'), values.copy())})
+
+    dc_wrapper = DataConverter("t2m.nc", zarr_data_dir=str(tmp_path), precision=parse_precision(["*=bits:4"]))
+    dc_wrapper.write_zarr(data_xr, str(tmp_path/"t2m.zarr"), stream=stream)
+
+    np.testing.assert_array_equal(data_xr.t2m.values, values)
+    rows = dc_wrapper.report_precision(data_xr, str(tmp_path/"t2m.zarr"))
+    assert rows[0]["max_abs_error"] > 0
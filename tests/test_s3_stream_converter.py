@@ -0,0 +1,29 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+xr = pytest.importorskip("xarray")
+pytest.importorskip("zarr")
+pytest.importorskip("h5netcdf")
+pytest.importorskip("s3fs")
+pytest.importorskip("moto")
+pytest.importorskip("cfgrib")
+
+from modules.benchmark import make_tile, make_classic, moto_bucket
+from modules.s3_stream_converter import S3StreamConverter
+
+
+@pytest.mark.parametrize("make_file", [make_tile, make_classic])
+def test_stream_from_moto_bucket(tmp_path, make_file):
+    """
+    netCDF4 & classic objects of a local S3 stand-in are streamed to Zarr via the file's cache type.
+    """
+    path = str(tmp_path/make_file(str(tmp_path), res=8, levels=2))
+    with moto_bucket(path) as (bucket_arn, obj_key, endpoint_url):
+        converter = S3StreamConverter(bucket_arn, obj_key, zarr_data_dir=str(tmp_path/"zarr_data"), endpoint_url=endpoint_url)
+        with converter.open_object() as f:
+            assert f.read(4) in (b'\x89HDF', b'CDF\x02')
+        converter.convert_nc2zarr("tile", stream=True)
+
+    assert not converter.run_manifest.failed()
+    with xr.open_dataset(path) as source_xr, xr.open_zarr(tmp_path/"zarr_data"/"tile.zarr") as zarr_xr:
+        xr.testing.assert_equal(source_xr.load(), zarr_xr.load())